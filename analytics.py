@@ -0,0 +1,179 @@
+"""Vectorized loyalty analytics for the Prime Network bot"""
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Any, Sequence, Tuple
+
+import numpy as np
+
+FIELDS = {
+    "streak": "streak",
+    "messages": "total_messages"
+}
+GROUPINGS = {
+    "origin": "origin_gateway_id",
+    "main": "main_server_id"
+}
+DEFAULT_PERCENTILES = (25, 50, 75, 90, 99)
+DEFAULT_TTL = 60.0  # Max seconds a build may miss per-message counter updates
+
+
+class Analytics:
+    """
+    Distribution queries over loyal users, backed by NumPy arrays
+
+    The arrays are built from the user store in a single pass and, like
+    every query result, cached until the version changes, the UTC day rolls
+    over ("active today" depends on the date) or the build is `ttl`
+    seconds old. The version should only move on changes that reshape the
+    columns (opt-ins, leaves, inactivity, streaks, first message of a day,
+    main server moves); plain message-count increments are picked up by
+    the TTL instead of invalidating on every message.
+    """
+
+    def __init__(self, data: Callable[[], Dict[str, Any]], version: Callable[[], int],
+                 ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            data: Returns the live DATA dict
+            version: Returns a counter bumped when loyal-user columns change
+            ttl: Seconds before a build is refreshed regardless of version
+        """
+        self._data = data
+        self._version = version
+        self._ttl = ttl
+        self._built_at = 0.0
+        self._key = None
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._results: Dict[Tuple, Any] = {}
+
+        # Metrics
+        self.builds = 0
+        self.hits = 0
+
+    # ==================== ARRAYS ====================
+
+    def _build(self) -> Dict[str, np.ndarray]:
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        key = (self._version(), today)
+        if key == self._key and time.monotonic() - self._built_at < self._ttl:
+            return self._arrays
+
+        loyal = [
+            user for user in self._data().get("global_users", {}).values()
+            if user.get("is_loyal", False)
+        ]
+        count = len(loyal)
+        columns = {
+            "streak": np.fromiter((u.get("streak", 0) for u in loyal), dtype=np.int64, count=count),
+            "total_messages": np.fromiter((u.get("total_messages", 0) for u in loyal), dtype=np.int64, count=count),
+            "inactive": np.fromiter((u.get("is_inactive", False) for u in loyal), dtype=bool, count=count),
+            "active_today": np.fromiter((u.get("last_activity") == today for u in loyal), dtype=bool, count=count),
+            "origin_gateway_id": np.fromiter((u.get("origin_gateway_id") or 0 for u in loyal), dtype=np.int64, count=count),
+            "main_server_id": np.fromiter((u.get("main_server_id") or 0 for u in loyal), dtype=np.int64, count=count)
+        }
+
+        self._key = key
+        self._built_at = time.monotonic()
+        self._arrays = columns
+        self._results.clear()
+        self.builds += 1
+        return columns
+
+    def _cached(self, key: Tuple, compute: Callable[[Dict[str, np.ndarray]], Any]) -> Any:
+        arrays = self._build()
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+        result = self._results[key] = compute(arrays)
+        return result
+
+    # ==================== QUERIES ====================
+
+    def summary(self) -> Dict[str, Any]:
+        """Loyal totals, active/inactive split and averages"""
+        def compute(a):
+            total = len(a["streak"])
+            inactive = int(a["inactive"].sum())
+            active_today = int(a["active_today"].sum())
+            return {
+                "total_loyal": total,
+                "active": total - inactive,
+                "inactive": inactive,
+                "active_today": active_today,
+                "active_ratio": (total - inactive) / total if total else 0.0,
+                "active_today_ratio": active_today / total if total else 0.0,
+                "average_messages": float(a["total_messages"].mean()) if total else 0.0,
+                "average_streak": float(a["streak"].mean()) if total else 0.0
+            }
+        return self._cached(("summary",), compute)
+
+    def percentiles(self, field: str, qs: Sequence[int] = DEFAULT_PERCENTILES) -> Dict[int, float]:
+        """Percentiles of a per-user field ("streak" or "messages")"""
+        column = FIELDS[field]
+
+        def compute(a):
+            values = a[column]
+            if not len(values):
+                return {q: 0.0 for q in qs}
+            return dict(zip(qs, (float(v) for v in np.percentile(values, qs))))
+        return self._cached(("percentiles", field, tuple(qs)), compute)
+
+    def histogram(self, field: str, bins: int = 10) -> List[Tuple[int, int, int]]:
+        """
+        Histogram of a per-user field
+
+        Returns:
+            List of (low, high, count) buckets with integer edges
+        """
+        column = FIELDS[field]
+
+        def compute(a):
+            values = a[column]
+            if not len(values):
+                return []
+            low, high = int(values.min()), int(values.max())
+            edges = np.unique(np.linspace(low, high + 1, min(bins, high - low + 1) + 1).astype(np.int64))
+            counts, _ = np.histogram(values, bins=edges)
+            return [(int(edges[i]), int(edges[i + 1]) - 1, int(counts[i])) for i in range(len(counts))]
+        return self._cached(("histogram", field, bins), compute)
+
+    def breakdown(self, by: str = "origin", limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Per-gateway member, activity and streak totals
+
+        Args:
+            by: "origin" (origin_gateway_id) or "main" (main_server_id)
+            limit: Max gateways returned, largest first
+        """
+        column = GROUPINGS[by]
+
+        def compute(a):
+            if not len(a[column]):
+                return []
+            ids, groups = np.unique(a[column], return_inverse=True)
+            members = np.bincount(groups)
+            active = np.bincount(groups, weights=~a["inactive"])
+            streaks = np.bincount(groups, weights=a["streak"])
+            messages = np.bincount(groups, weights=a["total_messages"])
+
+            order = np.argsort(-members, kind="stable")[:limit]
+            return [
+                {
+                    "guild_id": int(ids[i]) or None,
+                    "members": int(members[i]),
+                    "active": int(active[i]),
+                    "average_streak": float(streaks[i] / members[i]),
+                    "total_messages": int(messages[i])
+                }
+                for i in order
+            ]
+        return self._cached(("breakdown", by, limit), compute)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache metrics"""
+        return {
+            "users": len(self._arrays.get("streak", ())),
+            "builds": self.builds,
+            "hits": self.hits,
+            "version": self._key[0] if self._key else None
+        }
@@ -3,13 +3,30 @@ from threading import Thread
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands, TextChannel, VoiceChannel, Thread as DiscordThread
+import asyncio
+import hashlib
+import heapq
 import json
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, Union
+from datetime import datetime, timedelta, timezone, time as dt_time
+from typing import Optional, Dict, Any, Union, List, Callable
 from dotenv import load_dotenv
 load_dotenv()
 
+from usercache import UserCache
+from dashboard import DashboardScheduler
+from roles import RoleQueue
+from outbox import Outbox
+from confirm import ConfirmationRegistry
+from gate import run_nuke
+import stats as stats_service
+from timeseries import get_series, advance_all
+from analytics import Analytics
+from telemetry import ActivityHeatmap
+from sketches import ActiveUserSketches, count_guild, overtakes
+from cohorts import get_cohorts, seed_cohorts
+from streaks import record_day, ranking_streak, StreakRecomputer, MESSAGES
+from snapshot import StatsSnapshot, StatsMaterializer
 from format import (
     create_base_embed,
     create_success_embed,
@@ -17,7 +34,8 @@ from format import (
     create_info_embed,
     create_warning_embed,
     create_dashboard_embed,
-    create_leaderboard_embed
+    create_leaderboard_embed,
+    truncate_text
 )
 
 # ==================== CORE CONFIGURATION ====================
@@ -29,7 +47,19 @@ BOT_OWNER_ID = 895767962722660372
 HUB_INVITE = "https://discord.gg/F9PB47S3FJ"
 HUB_ANN_CHANNEL_ID = 1451697918493855797  # Prime Network announcements channel
 BRAND_COLOR = 0x8acaf5  # Special Prime Network blue - ONLY COLOR USED
-STREAK_MESSAGE_THRESHOLD = 100  # Messages needed to gain 1 streak day
+STREAK_MESSAGE_THRESHOLD = 100  # Default messages needed to gain 1 streak day
+GUILD_STREAK_THRESHOLD_MIN = 50  # Lowest per-guild streak threshold a gateway admin can set
+USER_CACHE_SIZE = 2048  # Max users kept in the resolver LRU
+USER_CACHE_TTL = 3600  # Seconds before a cached user is re-fetched
+DASHBOARD_CONCURRENCY = 5  # Max dashboards edited at once
+DASHBOARD_MAX_SIZE = 10  # Largest leaderboard a dashboard can show
+DASHBOARD_DEBOUNCE_SECONDS = 300  # Default min seconds between edits of one dashboard
+ORPHAN_GUILD_GRACE_HOURS = 24  # Hours before a removed guild's config is archived
+RECONCILE_GUILD_DELAY = 1.0  # Seconds between guilds during creed reconciliation
+OUTBOX_SIZE = 1000  # Max pending courtesy DMs before the oldest is dropped
+OUTBOX_CONCURRENCY = 2  # Courtesy DMs sent at once
+STATS_SNAPSHOT_INTERVAL = 60  # Seconds between materialized stats snapshots
+ANALYTICS_TTL = 60  # Max seconds analytics may lag plain message-count updates
 
 # Bot Configuration
 intents = discord.Intents.default()
@@ -64,12 +94,49 @@ bot = PawnBot(command_prefix=get_prefix, intents=intents)
 # Data Storage
 DATA_FILE = 'loyalty_data.json'
 DATA: Dict[str, Any] = {}
+DATA_VERSION = 0  # Bumped on every load/save; derived caches key off it
+ANALYTICS_VERSION = 0  # Bumped only when loyal-user analytics columns change
+
+# Stats service reads the live store and saves through save_data
+stats_service.bind(lambda: DATA, lambda: save_data())
+
+# Vectorized distribution queries, cached per ANALYTICS_VERSION (and ANALYTICS_TTL)
+ANALYTICS = Analytics(lambda: DATA, lambda: ANALYTICS_VERSION, ttl=ANALYTICS_TTL)
+
+# Rolling hour-of-week message counters per guild (persisted in stats.hourly_activity)
+HEATMAP = ActivityHeatmap()
+
+# HyperLogLog DAU/WAU/MAU sketches per guild and network (persisted in stats.active_sketches)
+ACTIVE_USERS = ActiveUserSketches()
+
+# Shared user resolver (gateway cache -> LRU -> HTTP)
+USER_CACHE = UserCache(max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# Hash of the last leaderboard embed written per guild (guild_id -> sha1)
+DASHBOARD_HASHES: Dict[int, str] = {}
+
+# Per-guild member counters (guild_id -> {"humans": n, "bots": n})
+MEMBER_COUNTS: Dict[int, Dict[str, int]] = {}
+
+# Creed message routing (creed_message_id -> guild_id)
+CREED_ROUTES: Dict[int, int] = {}
+
+# Loyal role grant/revoke queue
+ROLE_QUEUE = RoleQueue(bot)
+
+# Background outbox for welcome DMs and other courtesy messages
+OUTBOX = Outbox(maxsize=OUTBOX_SIZE, concurrency=OUTBOX_CONCURRENCY)
+
+# Open confirmation prompts (message ID / channel+author -> future)
+CONFIRMATIONS = ConfirmationRegistry()
 
 # ==================== DATA MANAGEMENT ====================
 
 def load_data():
     """Load network data from JSON file"""
-    global DATA
+    global DATA, DATA_VERSION
+    DATA_VERSION += 1
+    invalidate_analytics()
     if os.path.exists(DATA_FILE):
         with open(DATA_FILE, 'r') as f:
             DATA = json.load(f)
@@ -93,12 +160,40 @@ def load_data():
             }
         }
         save_data()
+    rebuild_creed_routes()
+    if "cohorts" not in DATA.setdefault("stats", {}):
+        seed_cohorts(DATA["stats"], DATA.get("global_users", {}).values())
+    HEATMAP.load(DATA.get("stats", {}).get("hourly_activity", {}))
+    ACTIVE_USERS.load(DATA.get("stats", {}).get("active_sketches", {}))
+
+def invalidate_analytics():
+    """Mark loyal-user analytics columns stale (loyalty, inactivity, streak or daily activity changed)"""
+    global ANALYTICS_VERSION
+    ANALYTICS_VERSION += 1
 
 def save_data():
     """Save network data to JSON file"""
+    global DATA_VERSION
+    DATA_VERSION += 1
+    HEATMAP.flush(DATA.setdefault("stats", {}).setdefault("hourly_activity", {}))
+    ACTIVE_USERS.flush(DATA.setdefault("stats", {}).setdefault("active_sketches", {}))
     with open(DATA_FILE, 'w') as f:
         json.dump(DATA, f, indent=4)
 
+def rebuild_creed_routes():
+    """Rebuild the creed message -> guild routing table from guild configs"""
+    CREED_ROUTES.clear()
+    for guild_id_str, guild_data in DATA.get("guilds", {}).items():
+        if guild_data.get("creed_message_id"):
+            CREED_ROUTES[guild_data["creed_message_id"]] = int(guild_id_str)
+
+def set_creed_route(guild_id: int, message_id: Optional[int]):
+    """Point a guild's creed route at a new message (None removes it)"""
+    for old_message_id in [mid for mid, gid in CREED_ROUTES.items() if gid == guild_id]:
+        del CREED_ROUTES[old_message_id]
+    if message_id:
+        CREED_ROUTES[message_id] = guild_id
+
 def get_guild_data(guild_id: int) -> Dict[str, Any]:
     """Get or create guild data structure"""
     guild_id_str = str(guild_id)
@@ -121,8 +216,8 @@ def get_guild_data(guild_id: int) -> Dict[str, Any]:
         save_data()
     return DATA["guilds"][guild_id_str]
 
-def get_user_data(user_id: int) -> Dict[str, Any]:
-    """Get or create user data structure"""
+def get_user_data(user_id: int, persist: bool = True) -> Dict[str, Any]:
+    """Get or create user data structure (persist=False defers the save to the caller)"""
     user_id_str = str(user_id)
     if user_id_str not in DATA["global_users"]:
         DATA["global_users"][user_id_str] = {
@@ -132,20 +227,128 @@ def get_user_data(user_id: int) -> Dict[str, Any]:
             "total_messages": 0,
             "messages_since_last_streak": 0,
             "last_activity": None,
+            "activity_bits": "0",
+            "activity_day": None,
+            "longest_streak": 0,
             "opt_in_date": None,
             "origin_gateway_id": None,
             "origin_gateway_name": None,
             "main_server_id": None,
             "main_server_name": None,
+            "guild_counts": {},
             "is_muted": False
         }
-        save_data()
+        if persist:
+            save_data()
     return DATA["global_users"][user_id_str]
 
+def record_daily_stat(stat: str, amount: int = 1):
+    """Increment today's counter in a daily stats series"""
+    get_series(DATA.setdefault("stats", {}), stat).add(amount)
+
+def cohorts():
+    """Weekly opt-in cohort table (persisted in stats.cohorts)"""
+    return get_cohorts(DATA.setdefault("stats", {}))
+
+def revoke_loyalty(user_data: Dict[str, Any], opt_out: bool = False):
+    """
+    Remove a user's loyalty status and record the leave (caller saves)
+    
+    opt_out marks a deliberate leave: creed reconciliation won't re-enroll
+    the user from an old ✅ reaction until they opt in again live.
+    """
+    if opt_out:
+        user_data["left_at"] = datetime.now(timezone.utc).isoformat()
+    invalidate_analytics()
+    if user_data.get("is_loyal"):
+        cohorts().left(user_data.get("opt_in_date"), not user_data.get("is_inactive", False))
+    user_data["is_loyal"] = False
+    user_data["is_inactive"] = False
+    user_data["streak"] = 0
+    user_data["messages_since_last_streak"] = 0
+    user_data["opt_in_date"] = None
+    user_data["main_server_id"] = None
+    user_data["main_server_name"] = None
+    record_daily_stat("daily_leaves")
+
+def grant_loyalty(user_data: Dict[str, Any], guild: discord.Guild):
+    """Mark a user loyal via a guild's creed and record the join (caller saves)"""
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    user_data.pop("left_at", None)
+    invalidate_analytics()
+    if user_data.get("is_loyal"):
+        # Re-opt-in moves them to this week's cohort
+        cohorts().left(user_data.get("opt_in_date"), not user_data.get("is_inactive", False))
+    cohorts().joined(today)
+    user_data["is_loyal"] = True
+    user_data["is_inactive"] = False
+    user_data["opt_in_date"] = today
+    user_data["last_activity"] = today
+    user_data["origin_gateway_id"] = guild.id
+    user_data["origin_gateway_name"] = guild.name
+    user_data["main_server_id"] = guild.id
+    user_data["main_server_name"] = guild.name
+    user_data["streak"] = 0
+    user_data["messages_since_last_streak"] = 0
+    record_daily_stat("daily_joins")
+
+def find_other_guild(user_id: int, exclude_id: int) -> Optional[discord.Guild]:
+    """Find another network guild the user is still a member of"""
+    for guild in bot.guilds:
+        if guild.id != exclude_id and guild.get_member(user_id):
+            return guild
+    return None
+
+def detach_user_from_guild(user_id: int, user_data: Dict[str, Any], guild_id: int,
+                           fallback: Callable[[], Optional[discord.Guild]]) -> bool:
+    """
+    Stop tracking a guild for a user who is no longer reachable there (caller saves)
+    
+    Drops the guild's activity counter and, if it was their main server,
+    moves them to their most active tracked guild they're still in, then
+    to `fallback()`. A loyal user with nowhere left has left the network.
+    
+    Returns:
+        bool: True if the main server or loyalty status changed
+    """
+    counts = user_data.get("guild_counts", {})
+    counts.pop(str(guild_id), None)
+    
+    if user_data.get("main_server_id") != guild_id:
+        return False
+    
+    tracked = (bot.get_guild(int(guild_id_str)) for guild_id_str in sorted(counts, key=counts.get, reverse=True))
+    other = next((guild for guild in tracked if guild and guild.get_member(user_id)), None)
+    other = other or fallback()
+    if other:
+        user_data["main_server_id"] = other.id
+        user_data["main_server_name"] = other.name
+    elif user_data.get("is_loyal"):
+        # Left every network guild - they've left the network
+        revoke_loyalty(user_data)
+        print(f"User {user_id} left the network (last guild: {guild_id})")
+    else:
+        user_data["main_server_id"] = None
+        user_data["main_server_name"] = None
+    invalidate_analytics()
+    return True
+
 def is_system_active() -> bool:
     """Check if loyalty system is active"""
     return DATA.get("network_config", {}).get("system_active", True)
 
+def get_streak_model() -> str:
+    """Streak model the leaderboard ranks by ("messages" or "days")"""
+    return DATA.get("network_config", {}).get("streak_model", MESSAGES)
+
+def get_streak_threshold(guild_id: Optional[int] = None) -> int:
+    """Messages per streak day: the guild's override, else the network setting"""
+    if guild_id is not None:
+        guild_threshold = DATA.get("guilds", {}).get(str(guild_id), {}).get("streak_threshold")
+        if guild_threshold:
+            return guild_threshold
+    return DATA.get("network_config", {}).get("streak_threshold", STREAK_MESSAGE_THRESHOLD)
+
 def is_trusted_user(user_id: int) -> bool:
     """Check if user is in trusted list"""
     return user_id in DATA.get("network_config", {}).get("trusted_users", [])
@@ -173,26 +376,111 @@ def update_user_activity(user_id: int, guild_id: int):
     user_data["total_messages"] += 1
     user_data["messages_since_last_streak"] = user_data.get("messages_since_last_streak", 0) + 1
     
+    # Daily activity bitmap (first message of the day extends the day streak)
+    new_day = record_day(user_data, today)
+    rank_changed = new_day and user_data.get("is_loyal", False) and get_streak_model() != MESSAGES
+    
+    # Analytics columns only change on a new day, a main server move or a rank change;
+    # plain message counts are picked up by the analytics TTL
+    columns_changed = new_day
+    
     # Mark as active if they were inactive
     if user_data.get("is_inactive", False):
         user_data["is_inactive"] = False
+        if user_data.get("is_loyal"):
+            cohorts().reactivated(user_data.get("opt_in_date"))
+        rank_changed = True
     
-    # Track main server (most active server)
+    # Track main server (most active server, via top-k guild counters)
     guild = bot.get_guild(guild_id)
     if guild:
         current_main = user_data.get("main_server_id")
-        if current_main != guild_id:
-            # Update main server to current location
+        counts = user_data.setdefault("guild_counts", {})
+        if not counts and current_main:
+            counts[str(current_main)] = 1  # Existing main server starts ahead
+        count_guild(counts, guild_id)
+        if overtakes(counts, guild_id, current_main):
+            # Another guild has genuinely overtaken the current main server
             user_data["main_server_id"] = guild_id
             user_data["main_server_name"] = guild.name
+            columns_changed = True
     
-    # Streak system: Gain 1 streak day per 100 messages
+    # Streak system: Gain 1 streak day per threshold messages (set by the main server)
     if user_data.get("is_loyal", False):
-        if user_data["messages_since_last_streak"] >= STREAK_MESSAGE_THRESHOLD:
+        if user_data["messages_since_last_streak"] >= get_streak_threshold(user_data.get("main_server_id")):
             user_data["streak"] = user_data.get("streak", 0) + 1
             user_data["messages_since_last_streak"] = 0
+            rank_changed = True
+    
+    if user_data.get("is_loyal", False) and (columns_changed or rank_changed):
+        invalidate_analytics()
     
     save_data()
+    
+    if rank_changed:
+        notify_ranking_change(user_id, user_data)
+
+def get_top_loyal_members(limit: int = 10) -> List[Dict[str, Any]]:
+    """Get the top active loyal members network-wide by (streak, messages) under the streak model"""
+    model = get_streak_model()
+    candidates = (
+        (int(user_id_str), ranking_streak(user_data, model), user_data)
+        for user_id_str, user_data in DATA.get("global_users", {}).items()
+        if user_data.get("is_loyal") and not user_data.get("is_inactive", False)
+    )
+    top = heapq.nlargest(
+        limit,
+        candidates,
+        key=lambda item: (item[1], item[2].get("total_messages", 0))
+    )
+    return [
+        {
+            "user_id": uid,
+            "messages": user_data.get("total_messages", 0),
+            "streak": streak,
+            "fallback_name": user_data.get("main_server_name", f"User {uid}")
+        }
+        for uid, streak, user_data in top
+    ]
+
+def build_leaderboard_members(guild: discord.Guild, top: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
+    """Attach guild-local display names to a network ranking"""
+    members = []
+    for entry in top[:limit]:
+        member = guild.get_member(entry["user_id"])
+        members.append({
+            "user_id": entry["user_id"],
+            "messages": entry["messages"],
+            "streak": entry["streak"],
+            "display_name": member.display_name if member else entry["fallback_name"]
+        })
+    return members
+
+async def resolve_user(user_id: int) -> Optional[discord.abc.User]:
+    """Resolve a user ID via gateway cache, then LRU, then fetch_user"""
+    return await USER_CACHE.resolve(bot, user_id)
+
+def seed_member_counts(guild: discord.Guild) -> Dict[str, int]:
+    """Count a guild's humans and bots once from the member cache"""
+    bots = sum(1 for member in guild.members if member.bot)
+    total = guild.member_count or len(guild.members)
+    MEMBER_COUNTS[guild.id] = {"humans": max(total - bots, 0), "bots": bots}
+    return MEMBER_COUNTS[guild.id]
+
+def adjust_member_counts(member: discord.Member, delta: int):
+    """Apply a join (+1) or leave (-1) to the guild's counters"""
+    counts = MEMBER_COUNTS.get(member.guild.id)
+    if counts is None:
+        return
+    key = "bots" if member.bot else "humans"
+    counts[key] = max(counts[key] + delta, 0)
+
+def get_member_counts(guild: discord.Guild) -> Dict[str, int]:
+    """Get a guild's human/bot counters in O(1), seeding on first use"""
+    counts = MEMBER_COUNTS.get(guild.id)
+    if counts is None:
+        counts = seed_member_counts(guild)
+    return counts
 
 def check_user_in_hub(user_id: int) -> bool:
     """Check if user is in the main hub server"""
@@ -201,11 +489,87 @@ def check_user_in_hub(user_id: int) -> bool:
         return False
     return hub.get_member(user_id) is not None
 
+# ==================== ORPHANED GUILD CLEANUP ====================
+
+_archive_tasks: Dict[int, asyncio.Task] = {}
+
+def archive_guild_config(guild_id: int) -> bool:
+    """Move a guild's config out of the live guilds table (caller saves)"""
+    guild_data = DATA.get("guilds", {}).pop(str(guild_id), None)
+    if guild_data is None:
+        return False
+    set_creed_route(guild_id, None)
+    guild_data["archived_at"] = datetime.now(timezone.utc).isoformat()
+    DATA.setdefault("archived_guilds", {})[str(guild_id)] = guild_data
+    return True
+
+def restore_guild_config(guild_id: int) -> bool:
+    """Bring back a guild's config if the bot rejoins it"""
+    task = _archive_tasks.pop(guild_id, None)
+    if task:
+        task.cancel()
+    
+    guild_id_str = str(guild_id)
+    guild_data = DATA.get("guilds", {}).get(guild_id_str)
+    if guild_data is None:
+        guild_data = DATA.get("archived_guilds", {}).pop(guild_id_str, None)
+        if guild_data is None:
+            return False
+        guild_data.pop("archived_at", None)
+        DATA["guilds"][guild_id_str] = guild_data
+        set_creed_route(guild_id, guild_data.get("creed_message_id"))
+    guild_data.pop("removed_at", None)
+    save_data()
+    return True
+
+def schedule_guild_archive(guild_id: int, delay: float):
+    """Archive a removed guild's config after a grace period"""
+    async def archive_later():
+        await asyncio.sleep(delay)
+        _archive_tasks.pop(guild_id, None)
+        if bot.get_guild(guild_id) is None and archive_guild_config(guild_id):
+            save_data()
+            print(f"Archived config for removed guild {guild_id}")
+    
+    previous = _archive_tasks.pop(guild_id, None)
+    if previous:
+        previous.cancel()
+    _archive_tasks[guild_id] = asyncio.create_task(archive_later())
+
+def sweep_orphaned_guilds():
+    """Schedule cleanup for configs of guilds the bot is no longer in"""
+    now = datetime.now(timezone.utc)
+    grace = ORPHAN_GUILD_GRACE_HOURS * 3600
+    changed = False
+    
+    for guild_id_str, guild_data in list(DATA.get("guilds", {}).items()):
+        guild_id = int(guild_id_str)
+        if bot.get_guild(guild_id) is not None:
+            if guild_data.pop("removed_at", None):
+                changed = True
+            continue
+        
+        if "removed_at" not in guild_data:
+            guild_data["removed_at"] = now.isoformat()
+            changed = True
+        
+        elapsed = (now - datetime.fromisoformat(guild_data["removed_at"])).total_seconds()
+        if elapsed >= grace:
+            archive_guild_config(guild_id)
+            changed = True
+        elif guild_id not in _archive_tasks:
+            schedule_guild_archive(guild_id, grace - elapsed)
+    
+    if changed:
+        save_data()
+
 # ==================== BOT EVENTS ====================
 
 @bot.event
 async def on_member_join(member):
-    """Handle member joining - check blacklist"""
+    """Handle member joining - update counters, check blacklist, grant loyal role"""
+    adjust_member_counts(member, 1)
+    
     if member.bot:
         return
     
@@ -218,6 +582,76 @@ async def on_member_join(member):
             print(f"Auto-banned blacklisted user {member.id} from {member.guild.name}")
         except:
             print(f"Failed to auto-ban {member.id} from {member.guild.name}")
+        return
+    
+    # Auto-grant loyal role to loyal members joining another gateway
+    user_data = DATA.get("global_users", {}).get(user_id_str)
+    guild_data = DATA.get("guilds", {}).get(str(member.guild.id))
+    if user_data and user_data.get("is_loyal") and guild_data and guild_data.get("loyal_role_id"):
+        ROLE_QUEUE.grant(member.guild.id, member.id, guild_data["loyal_role_id"])
+
+@bot.event
+async def on_member_remove(member):
+    """Handle member leaving - update counters and loyalty location"""
+    adjust_member_counts(member, -1)
+    
+    if member.bot:
+        return
+    
+    user_data = DATA.get("global_users", {}).get(str(member.id))
+    if not user_data or not user_data.get("is_loyal"):
+        return
+    
+    if detach_user_from_guild(member.id, user_data, member.guild.id,
+                              lambda: find_other_guild(member.id, member.guild.id)):
+        save_data()
+        notify_ranking_change(member.id, user_data)
+
+@bot.event
+async def on_guild_remove(guild):
+    """Handle bot leaving or being removed from a guild"""
+    MEMBER_COUNTS.pop(guild.id, None)
+    DASHBOARD_HASHES.pop(guild.id, None)
+    DASHBOARD_SCHEDULER.forget(guild.id)
+    HEATMAP.forget(guild.id)
+    ACTIVE_USERS.forget(guild.id)
+    
+    # Detach every user tracked in this guild, the same way as a member leaving
+    guild_key = str(guild.id)
+    affected = {
+        int(user_id_str): user_data for user_id_str, user_data in DATA.get("global_users", {}).items()
+        if user_data.get("main_server_id") == guild.id or guild_key in user_data.get("guild_counts", {})
+    }
+    
+    # One pass over remaining members finds a fallback guild for everyone
+    fallbacks: Dict[int, discord.Guild] = {}
+    if any(user_data.get("main_server_id") == guild.id for user_data in affected.values()):
+        for other in bot.guilds:
+            if other.id == guild.id:
+                continue
+            for member in other.members:
+                if member.id in affected:
+                    fallbacks.setdefault(member.id, other)
+    
+    moved = [
+        (user_id, user_data) for user_id, user_data in affected.items()
+        if detach_user_from_guild(user_id, user_data, guild.id, lambda user_id=user_id: fallbacks.get(user_id))
+    ]
+    
+    guild_data = DATA.get("guilds", {}).get(str(guild.id))
+    if guild_data is not None:
+        guild_data["removed_at"] = datetime.now(timezone.utc).isoformat()
+        schedule_guild_archive(guild.id, ORPHAN_GUILD_GRACE_HOURS * 3600)
+    
+    save_data()
+    for user_id, user_data in moved:
+        notify_ranking_change(user_id, user_data)
+    print(f'Removed from guild: {guild.name} ({guild.id})')
+
+@bot.event
+async def on_guild_available(guild):
+    """Seed member counters when a guild becomes available"""
+    seed_member_counts(guild)
 
 @bot.event
 async def on_ready():
@@ -234,6 +668,12 @@ async def on_ready():
     except Exception as e:
         print(f'Failed to sync commands: {e}')
     
+    sweep_orphaned_guilds()
+    ROLE_QUEUE.start()
+    OUTBOX.start()
+    asyncio.create_task(startup_reconcile())
+    asyncio.create_task(resume_nuke_jobs())
+    
     # Start background tasks (guard against double-start on reconnect)
     if not update_presence.is_running():
         update_presence.start()
@@ -241,13 +681,19 @@ async def on_ready():
         update_dashboard.start()
     if not check_inactive_users.is_running():
         check_inactive_users.start()
+    if not record_daily_stats.is_running():
+        record_daily_stats.start()
+    if not materialize_stats.is_running():
+        materialize_stats.start()
 
 @bot.event
 async def on_guild_join(guild):
     """Handle bot joining a new guild"""
+    restore_guild_config(guild.id)
     guild_data = get_guild_data(guild.id)
     guild_data["name"] = guild.name
     save_data()
+    seed_member_counts(guild)
     print(f'Joined guild: {guild.name} ({guild.id})')
 
 @bot.event
@@ -256,6 +702,9 @@ async def on_message(message):
     if message.author.bot:
         return
     
+    # Typed confirmations (e.g. NUKE)
+    CONFIRMATIONS.dispatch_message(message.channel.id, message.author.id, message.content)
+    
     # Bot mention responses
     if bot.user and bot.user.mentioned_in(message) and len(message.mentions) == 1:
         content_lower = message.content.lower().strip()
@@ -287,9 +736,10 @@ async def on_message(message):
             if not message.guild:
                 return
             
-            total_members = message.guild.member_count or 0
-            bot_count = sum(1 for member in message.guild.members if member.bot)
-            human_count = total_members - bot_count
+            counts = get_member_counts(message.guild)
+            bot_count = counts["bots"]
+            human_count = counts["humans"]
+            total_members = human_count + bot_count
             
             if 'member' in content_lower or 'human' in content_lower:
                 embed = discord.Embed(
@@ -343,84 +793,295 @@ async def on_message(message):
     
     # Track user activity
     if message.guild:
+        HEATMAP.record(message.guild.id)
+        ACTIVE_USERS.record(message.guild.id, message.author.id)
         update_user_activity(message.author.id, message.guild.id)
     
     await bot.process_commands(message)
 
+async def send_welcome_dm(member: discord.Member, guild: discord.Guild):
+    """Send the creed opt-in welcome DM"""
+    in_hub = check_user_in_hub(member.id)
+    hub_text = "\n✅ You're already in the main hub!" if in_hub else f"\n📨 Watch for invites to join **{MAIN_HUB_NAME}** (main hub)"
+    
+    embed = discord.Embed(
+        title="✅ Welcome to Prime Network!",
+        description=f"You've joined the loyalty program in **{guild.name}**.\n\n"
+                   f"**What's Next:**\n"
+                   f"• Stay active to build your streak (1 day per {get_streak_threshold(guild.id)} messages)\n"
+                   f"• Your loyalty status is tracked network-wide\n"
+                   f"• You'll receive network announcements{hub_text}\n\n"
+                   f"**Powered by Pawn Bot**",
+        color=BRAND_COLOR
+    )
+    if guild.icon:
+        embed.set_footer(text=f"{guild.name} • Prime Network", icon_url=guild.icon.url)
+    else:
+        embed.set_footer(text="Prime Network")
+    await member.send(embed=embed)
+
 @bot.event
 async def on_raw_reaction_add(payload):
-    """Handle creed message reactions for loyalty opt-in"""
-    if not bot.user or payload.user_id == bot.user.id:
+    """Handle confirmation prompts and creed message reactions for loyalty opt-in"""
+    if CONFIRMATIONS.dispatch_reaction(payload.message_id, payload.user_id, str(payload.emoji)):
+        return
+    
+    # Reject non-creed reactions with one dict lookup before any other work
+    guild_id = CREED_ROUTES.get(payload.message_id)
+    if guild_id is None or guild_id != payload.guild_id:
         return
     
-    if not payload.guild_id:
+    if not bot.user or payload.user_id == bot.user.id:
         return
     
-    guild = bot.get_guild(payload.guild_id)
+    guild = bot.get_guild(guild_id)
     if not guild:
         return
     
-    guild_data = get_guild_data(guild.id)
+    guild_data = DATA["guilds"].get(str(guild_id))
+    if not guild_data:
+        return
     
-    # Check if reaction is on creed message
-    if guild_data.get("creed_message_id") == payload.message_id and str(payload.emoji) == "✅":
+    if str(payload.emoji) == "✅":
         member = guild.get_member(payload.user_id)
         if not member:
             return
         
-        user_data = get_user_data(payload.user_id)
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        
-        # Mark as loyal
-        user_data["is_loyal"] = True
-        user_data["is_inactive"] = False
-        user_data["opt_in_date"] = today
-        user_data["last_activity"] = today
-        user_data["origin_gateway_id"] = guild.id
-        user_data["origin_gateway_name"] = guild.name
-        user_data["main_server_id"] = guild.id
-        user_data["main_server_name"] = guild.name
-        user_data["streak"] = 0
-        user_data["messages_since_last_streak"] = 0
-        
-        # Update stats
-        if today not in DATA["stats"]["daily_joins"]:
-            DATA["stats"]["daily_joins"][today] = 0
-        DATA["stats"]["daily_joins"][today] += 1
+        user_data = get_user_data(payload.user_id, persist=False)
+        grant_loyalty(user_data, guild)
         
         save_data()
+        notify_ranking_change(payload.user_id, user_data)
         
         # Assign loyalty role
         if guild_data.get("loyal_role_id"):
-            role = guild.get_role(guild_data["loyal_role_id"])
-            if role:
-                try:
-                    await member.add_roles(role)
-                except:
-                    pass
+            ROLE_QUEUE.grant(guild.id, member.id, guild_data["loyal_role_id"])
         
-        # Send welcome DM
-        try:
-            in_hub = check_user_in_hub(member.id)
-            hub_text = "\n✅ You're already in the main hub!" if in_hub else f"\n📨 Watch for invites to join **{MAIN_HUB_NAME}** (main hub)"
+        # Welcome DM goes through the outbox so the handler returns immediately
+        OUTBOX.post(lambda: send_welcome_dm(member, guild), label=f"welcome {member.id}")
+
+# ==================== CREED RECONCILIATION ====================
+
+_reconcile_lock: Optional[asyncio.Lock] = None
+
+async def reconcile_creed_optins(guild_ids: Optional[List[int]] = None) -> Dict[str, int]:
+    """
+    Recover creed opt-ins missed while the bot was offline
+    
+    Pages through each creed message's ✅ reactors, diffs them against
+    loyal users and applies the missing opt-ins in one batch with a
+    single save. Guilds are processed one at a time with a short pause
+    so the reaction-listing routes stay under Discord's rate limits.
+    
+    Args:
+        guild_ids: Guilds to reconcile (defaults to every guild with a creed)
+    
+    Returns:
+        Dict with guilds checked, guilds failed, and opt-ins recovered
+    """
+    global _reconcile_lock
+    if _reconcile_lock is None:
+        _reconcile_lock = asyncio.Lock()
+    
+    async with _reconcile_lock:
+        result = {"guilds": 0, "failed": 0, "recovered": 0}
+        # Loyal users and users who opted out are both skipped
+        skip_ids = {
+            int(user_id_str) for user_id_str, user_data in DATA.get("global_users", {}).items()
+            if user_data.get("is_loyal") or user_data.get("left_at")
+        }
+        
+        for guild_id_str, guild_data in list(DATA.get("guilds", {}).items()):
+            guild_id = int(guild_id_str)
+            if guild_ids is not None and guild_id not in guild_ids:
+                continue
             
-            embed = discord.Embed(
-                title="✅ Welcome to Prime Network!",
-                description=f"You've joined the loyalty program in **{guild.name}**.\n\n"
-                           f"**What's Next:**\n"
-                           f"• Stay active to build your streak (1 day per 100 messages)\n"
-                           f"• Your loyalty status is tracked network-wide\n"
-                           f"• You'll receive network announcements{hub_text}\n\n"
-                           f"**Powered by Pawn Bot**",
-                color=BRAND_COLOR
-            )
-            if guild.icon:
-                embed.set_footer(text=f"{guild.name} • Prime Network", icon_url=guild.icon.url)
-            else:
-                embed.set_footer(text="Prime Network")
-            await member.send(embed=embed)
-        except:
+            message_id = guild_data.get("creed_message_id")
+            channel_id = guild_data.get("creed_channel_id")
+            guild = bot.get_guild(guild_id)
+            if not message_id or not channel_id or not guild:
+                continue
+            
+            channel = guild.get_channel(channel_id)
+            if not channel:
+                continue
+            
+            result["guilds"] += 1
+            try:
+                message = await channel.fetch_message(message_id)
+                reaction = next((r for r in message.reactions if str(r.emoji) == "✅"), None)
+                if reaction:
+                    async for user in reaction.users(limit=None):
+                        if user.bot or user.id in skip_ids:
+                            continue
+                        member = guild.get_member(user.id)
+                        if not member:
+                            continue
+                        
+                        user_data = get_user_data(user.id, persist=False)
+                        grant_loyalty(user_data, guild)
+                        notify_ranking_change(user.id, user_data)
+                        skip_ids.add(user.id)
+                        result["recovered"] += 1
+                        
+                        if guild_data.get("loyal_role_id"):
+                            ROLE_QUEUE.grant(guild.id, member.id, guild_data["loyal_role_id"])
+            except discord.HTTPException as e:
+                result["failed"] += 1
+                print(f"Creed reconciliation failed for {guild.name}: {e}")
+            
+            await asyncio.sleep(RECONCILE_GUILD_DELAY)
+        
+        if result["recovered"]:
+            save_data()
+        
+        print(f"Creed reconciliation: {result['recovered']} opt-ins recovered across {result['guilds']} guilds")
+        return result
+
+async def withdraw_creed_reactions(user_id: int) -> int:
+    """
+    Best-effort removal of a user's ✅ from every creed message
+    
+    Lets an opted-out user re-join later by reacting again. Guilds where
+    the bot can't manage messages are skipped; left_at still keeps
+    reconciliation from re-enrolling them.
+    
+    Returns:
+        int: Reactions removed
+    """
+    removed = 0
+    for guild_id_str, guild_data in list(DATA.get("guilds", {}).items()):
+        guild = bot.get_guild(int(guild_id_str))
+        message_id = guild_data.get("creed_message_id")
+        channel = guild.get_channel(guild_data.get("creed_channel_id") or 0) if guild else None
+        if not message_id or not channel:
+            continue
+        
+        try:
+            await channel.get_partial_message(message_id).remove_reaction("✅", discord.Object(id=user_id))
+            removed += 1
+        except discord.HTTPException:
             pass
+    return removed
+
+# ==================== LOYAL ROLE SYNC ====================
+
+def revoke_loyal_roles(user_id: int):
+    """Queue loyal role removal in every guild with a configured role"""
+    for guild_id_str, guild_data in DATA.get("guilds", {}).items():
+        if guild_data.get("loyal_role_id"):
+            ROLE_QUEUE.revoke(int(guild_id_str), user_id, guild_data["loyal_role_id"])
+
+def sync_loyal_roles(guild_ids: Optional[List[int]] = None) -> Dict[str, int]:
+    """
+    Diff loyal role holders against loyal users present in each guild
+    
+    Only the delta is queued; the role queue paces the API calls.
+    
+    Args:
+        guild_ids: Guilds to sync (defaults to every guild with a loyal role)
+    
+    Returns:
+        Dict with guilds synced and grants/revokes queued
+    """
+    result = {"guilds": 0, "grants": 0, "revokes": 0}
+    loyal_ids = {
+        int(user_id_str) for user_id_str, user_data in DATA.get("global_users", {}).items()
+        if user_data.get("is_loyal")
+    }
+    
+    for guild_id_str, guild_data in DATA.get("guilds", {}).items():
+        guild_id = int(guild_id_str)
+        if guild_ids is not None and guild_id not in guild_ids:
+            continue
+        
+        role_id = guild_data.get("loyal_role_id")
+        guild = bot.get_guild(guild_id)
+        role = guild.get_role(role_id) if guild and role_id else None
+        if not role:
+            continue
+        
+        holders = {member.id for member in role.members}
+        should_hold = {user_id for user_id in loyal_ids if guild.get_member(user_id)}
+        
+        for user_id in should_hold - holders:
+            ROLE_QUEUE.grant(guild_id, user_id, role_id)
+            result["grants"] += 1
+        for user_id in holders - should_hold:
+            ROLE_QUEUE.revoke(guild_id, user_id, role_id)
+            result["revokes"] += 1
+        result["guilds"] += 1
+    
+    return result
+
+async def startup_reconcile():
+    """Recover missed opt-ins, then bring loyal roles in line"""
+    await reconcile_creed_optins()
+    result = sync_loyal_roles()
+    print(f"Loyal role sync: {result['grants']} grants, {result['revokes']} revokes queued")
+
+# ==================== SERVER NUKE ====================
+
+_nuke_tasks: Dict[int, asyncio.Task] = {}
+
+async def announce_nuke(channel: discord.TextChannel):
+    """Post the hub invite into a nuked server's remaining channel"""
+    nuke_embed = discord.Embed(
+        title="🚨 Server Nuked",
+        description=f"This server has been reset.\n\n"
+                   f"**Join the Prime Network hub:**\n{HUB_INVITE}",
+        color=BRAND_COLOR
+    )
+    nuke_embed.set_footer(text="Prime Network")
+    await channel.send(embed=nuke_embed)
+
+async def nuke_guild(guild: discord.Guild, progress=None) -> Optional[Dict[str, Any]]:
+    """
+    Run or resume the guild's checkpointed nuke job
+    
+    Returns:
+        The finished job, or None if one is already running
+    """
+    running = _nuke_tasks.get(guild.id)
+    if running and not running.done():
+        return None
+    _nuke_tasks[guild.id] = asyncio.current_task()
+    
+    guild_data = get_guild_data(guild.id)
+    try:
+        job = await run_nuke(guild, guild_data["nuke_job"], save_data, announce_nuke, progress)
+    finally:
+        _nuke_tasks.pop(guild.id, None)
+    
+    guild_data.pop("nuke_job", None)
+    save_data()
+    print(f"Nuked {guild.name}: {job['deleted']} deleted, {len(job['failed'])} failed")
+    
+    # The invoking channel is gone by now - report to the admin directly
+    author = guild.get_member(job["author_id"])
+    if author:
+        failed = ", ".join(job["failed"])
+        report = create_success_embed(
+            title="Server Nuked",
+            description=f"**{guild.name}** has been reset.\n\n"
+                       f"✅ Deleted {job['deleted']} channels/roles\n"
+                       f"❌ Failed to delete {len(job['failed'])}"
+                       + (f"\n\n**Failed:** {truncate_text(failed, 1500)}" if failed else ""),
+            guild=guild
+        )
+        OUTBOX.post(lambda: author.send(embed=report), label=f"nuke report {guild.id}")
+    return job
+
+async def resume_nuke_jobs():
+    """Resume nuke jobs interrupted by a restart"""
+    for guild_id_str, guild_data in list(DATA.get("guilds", {}).items()):
+        guild = bot.get_guild(int(guild_id_str))
+        if guild and guild_data.get("nuke_job"):
+            print(f"Resuming nuke of {guild.name}")
+            try:
+                await nuke_guild(guild)
+            except Exception as e:
+                print(f"Nuke resume failed for {guild.name}: {e}")
 
 # ==================== BACKGROUND TASKS ====================
 
@@ -434,67 +1095,173 @@ async def update_presence():
     )
     await bot.change_presence(activity=activity)
 
+def embed_hash(embed: discord.Embed) -> str:
+    """Stable hash of an embed's rendered content"""
+    return hashlib.sha1(json.dumps(embed.to_dict(), sort_keys=True).encode()).hexdigest()
+
+async def refresh_dashboard(guild: discord.Guild, guild_data: Dict[str, Any],
+                            top: List[Dict[str, Any]], force: bool = False) -> bool:
+    """
+    Render and write one guild's leaderboard dashboard
+    
+    Edits go through a partial message so no fetch is needed first, and
+    the edit is skipped when the embed is unchanged since the last write.
+    
+    Returns:
+        bool: True if the dashboard message was edited or re-posted
+    """
+    dashboard_channel_id = guild_data.get("dashboard_channel_id")
+    dashboard_msg_id = guild_data.get("dashboard_msg_id")
+    
+    if not dashboard_channel_id:
+        return False
+    
+    channel = guild.get_channel(dashboard_channel_id)
+    if not channel or not isinstance(channel, (TextChannel, VoiceChannel, DiscordThread)):
+        return False
+    
+    size = guild_data.get("dashboard_size", DASHBOARD_MAX_SIZE)
+    embed = create_leaderboard_embed(
+        title=f"Top {size} Loyal Members",
+        members=build_leaderboard_members(guild, top, size),
+        guild=guild
+    )
+    
+    digest = embed_hash(embed)
+    if not force and DASHBOARD_HASHES.get(guild.id) == digest:
+        return False
+    
+    try:
+        if dashboard_msg_id:
+            try:
+                await channel.get_partial_message(dashboard_msg_id).edit(embed=embed)
+            except discord.NotFound:
+                dashboard_msg_id = None
+        
+        if not dashboard_msg_id:
+            msg = await channel.send(embed=embed)
+            guild_data["dashboard_msg_id"] = msg.id
+            save_data()
+    except discord.HTTPException as e:
+        print(f"Failed to update dashboard in {guild.name}: {e}")
+        return False
+    
+    DASHBOARD_HASHES[guild.id] = digest
+    return True
+
+def get_dashboard_interval() -> float:
+    """Minimum seconds between edits of one guild's dashboard"""
+    return DATA.get("network_config", {}).get("dashboard_interval", DASHBOARD_DEBOUNCE_SECONDS)
+
+def get_dashboard_targets() -> Dict[int, int]:
+    """Map guild ID to visible leaderboard size for guilds with a dashboard"""
+    return {
+        int(guild_id_str): guild_data.get("dashboard_size", DASHBOARD_MAX_SIZE)
+        for guild_id_str, guild_data in DATA.get("guilds", {}).items()
+        if guild_data.get("dashboard_channel_id")
+    }
+
+_dashboard_semaphore: Optional[asyncio.Semaphore] = None
+
+async def edit_dashboard(guild_id: int) -> bool:
+    """Write one guild's dashboard from the scheduler's cached ranking"""
+    global _dashboard_semaphore
+    guild = bot.get_guild(guild_id)
+    guild_data = DATA.get("guilds", {}).get(str(guild_id))
+    if not guild or not guild_data:
+        return False
+    if _dashboard_semaphore is None:
+        _dashboard_semaphore = asyncio.Semaphore(DASHBOARD_CONCURRENCY)
+    async with _dashboard_semaphore:
+        return await refresh_dashboard(guild, guild_data, DASHBOARD_SCHEDULER.get_top())
+
+DASHBOARD_SCHEDULER = DashboardScheduler(
+    rank=lambda: get_top_loyal_members(DASHBOARD_MAX_SIZE),
+    targets=get_dashboard_targets,
+    edit=edit_dashboard,
+    interval=get_dashboard_interval
+)
+
+def notify_ranking_change(user_id: int, user_data: Dict[str, Any]):
+    """Tell the dashboard scheduler a user's streak or loyalty status changed"""
+    if user_data.get("is_loyal") and not user_data.get("is_inactive", False):
+        key = (ranking_streak(user_data, get_streak_model()), user_data.get("total_messages", 0))
+    else:
+        key = None
+    DASHBOARD_SCHEDULER.ranking_changed(user_id, key)
+
+# Serialized streak rebuilds; thresholds are read when each pass starts
+STREAK_RECOMPUTER = StreakRecomputer(
+    lambda: DATA.get("global_users", {}),
+    lambda user_data: get_streak_threshold(user_data.get("main_server_id"))
+)
+
+async def recompute_streaks(guild_id: Optional[int] = None) -> int:
+    """
+    Rebuild streaks after a threshold change and invalidate rankings
+    
+    guild_id limits the rebuild to users whose main server is that guild;
+    None rebuilds the whole network. Returns the number of users whose
+    streak changed.
+    """
+    changed = await STREAK_RECOMPUTER.request(guild_id)
+    
+    invalidate_analytics()
+    save_data()
+    DASHBOARD_SCHEDULER.refresh_all()
+    STATS_SNAPSHOT.refresh()
+    return changed
+
+@tasks.loop(time=dt_time(hour=23, minute=55, tzinfo=timezone.utc))
+async def record_daily_stats():
+    """Record the day's activity snapshot and evict raw points past retention"""
+    advance_all(DATA.setdefault("stats", {}))
+    cohorts().snapshot()
+    stats_service.record_activity_snapshot()
+
+def compute_stats_snapshot() -> StatsSnapshot:
+    """Compute network stats for the materialized snapshot"""
+    summary = ANALYTICS.summary()
+    trends = stats_service.get_network_trends(7)["trends"]
+    history = stats_service.get_activity_history(30)
+    
+    return StatsSnapshot(
+        computed_at=datetime.now(timezone.utc),
+        guilds=len(DATA.get("guilds", {})),
+        connected_guilds=len(bot.guilds),
+        total_users=len(DATA.get("global_users", {})),
+        loyal_members=summary["total_loyal"],
+        active_loyal=summary["active"],
+        blacklisted=len(DATA.get("global_blacklist", [])),
+        trusted_users=len(DATA.get("network_config", {}).get("trusted_users", [])),
+        active_today=summary["active_today"],
+        activity_percentage=summary["active_today_ratio"] * 100,
+        average_messages=summary["average_messages"],
+        average_streak=summary["average_streak"],
+        network_dau=ACTIVE_USERS.active(1),
+        system_active=is_system_active(),
+        trends=tuple((point["date"], point["joins"], point["leaves"]) for point in trends),
+        activity_history=tuple(zip(history["dates"], history["loyal_members"]))
+    )
+
+# Latest stats snapshot, read lock-free by sudo commands and /health
+STATS_SNAPSHOT = StatsMaterializer(compute_stats_snapshot)
+
+@tasks.loop(seconds=STATS_SNAPSHOT_INTERVAL)
+async def materialize_stats():
+    """Publish a fresh stats snapshot"""
+    STATS_SNAPSHOT.refresh()
+
 @tasks.loop(hours=4)
 async def update_dashboard():
-    """Update leaderboard dashboards in all guilds"""
-    for guild_id_str, guild_data in DATA.get("guilds", {}).items():
-        guild_id = int(guild_id_str)
-        guild = bot.get_guild(guild_id)
-        if not guild:
-            continue
-        
-        dashboard_channel_id = guild_data.get("dashboard_channel_id")
-        dashboard_msg_id = guild_data.get("dashboard_msg_id")
-        
-        if not dashboard_channel_id:
-            continue
-        
-        channel = guild.get_channel(dashboard_channel_id)
-        if not channel or not isinstance(channel, (TextChannel, VoiceChannel, DiscordThread)):
-            continue
-        
-        # Get top 10 loyal members by streak
-        loyal_members = []
-        for user_id_str, user_data in DATA.get("global_users", {}).items():
-            if user_data.get("is_loyal") and not user_data.get("is_inactive", False):
-                uid = int(user_id_str)
-                member = guild.get_member(uid)
-                loyal_members.append({
-                    "user_id": uid,
-                    "messages": user_data.get("total_messages", 0),
-                    "streak": user_data.get("streak", 0),
-                    "display_name": member.display_name if member else user_data.get("main_server_name", f"User {uid}")
-                })
-        
-        loyal_members.sort(key=lambda x: (x["streak"], x["messages"]), reverse=True)
-        top_10 = loyal_members[:10]
-        
-        embed = create_leaderboard_embed(
-            title="Top 10 Loyal Members",
-            members=top_10,
-            guild=guild
-        )
-        
-        try:
-            if dashboard_msg_id:
-                try:
-                    msg = await channel.fetch_message(dashboard_msg_id)
-                    await msg.edit(embed=embed)
-                except:
-                    msg = await channel.send(embed=embed)
-                    guild_data["dashboard_msg_id"] = msg.id
-                    save_data()
-            else:
-                msg = await channel.send(embed=embed)
-                guild_data["dashboard_msg_id"] = msg.id
-                save_data()
-        except:
-            pass
+    """Safety-net pass: rerank and queue every dashboard (unchanged ones are skipped)"""
+    DASHBOARD_SCHEDULER.refresh_all()
 
 @tasks.loop(hours=24)
 async def check_inactive_users():
     """Check for inactive users and mark them"""
     current_time = datetime.now(timezone.utc)
+    newly_inactive = []
     
     for user_id_str, user_data in DATA.get("global_users", {}).items():
         if not user_data.get("is_loyal", False):
@@ -513,11 +1280,18 @@ async def check_inactive_users():
             if days_inactive >= 7:
                 if not user_data.get("is_inactive", False):
                     user_data["is_inactive"] = True
+                    cohorts().deactivated(user_data.get("opt_in_date"))
+                    newly_inactive.append(int(user_id_str))
                     print(f"Marked user {user_id_str} as inactive ({days_inactive} days)")
         except Exception as e:
             print(f"Error checking inactivity for {user_id_str}: {e}")
     
+    if newly_inactive:
+        invalidate_analytics()
     save_data()
+    
+    for user_id in newly_inactive:
+        DASHBOARD_SCHEDULER.ranking_changed(user_id)
 
 # ==================== COMMAND ERROR HANDLER ====================
 
@@ -581,14 +1355,20 @@ def home():
 
 @app.route('/health')
 def health():
+    # Runs on the Flask thread: only read the published snapshot, never DATA
+    snapshot = STATS_SNAPSHOT.current
+    if snapshot is None:
+        return {"status": "starting", "bot": "Pawn", "network": "Prime Network"}
     return {
         "status": "healthy",
         "bot": "Pawn",
         "network": "Prime Network",
-        "guilds": len(bot.guilds),
-        "loyal_members": get_loyal_member_count(),
-        "active_loyal_members": get_active_loyal_count(),
-        "system_active": is_system_active()
+        "guilds": snapshot.connected_guilds,
+        "loyal_members": snapshot.loyal_members,
+        "active_loyal_members": snapshot.active_loyal,
+        "system_active": snapshot.system_active,
+        "snapshot_at": snapshot.computed_at.isoformat(),
+        "snapshot_age_seconds": round(snapshot.age(), 1)
     }
 
 def run():
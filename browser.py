@@ -0,0 +1,128 @@
+"""Paginated, lazily filtered schema browser for the Prime Network bot"""
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from export import Predicate, parse_filter
+
+PAGE_SIZE = 5  # Entries per page
+PAGE_CHARS = 1900  # Serialized characters per page (embed description budget)
+
+
+class SchemaBrowser:
+    """
+    Cursor over one table of DATA
+
+    Only the table's keys are captured when the session starts. Matches
+    for the prefix/field filter are found lazily as pages are requested,
+    and only the entries on the current page are ever serialized.
+    """
+
+    def __init__(self, data: Callable[[], Dict[str, Any]], table: str,
+                 prefix: Optional[str] = None, expression: Optional[str] = None,
+                 page_size: int = PAGE_SIZE):
+        """
+        Raises:
+            ValueError: If the filter expression is malformed
+        """
+        self._data = data
+        self.table = table
+        self.prefix = prefix
+        self.expression = expression
+        self.page_size = page_size
+        self._predicate: Predicate = parse_filter(expression)
+
+        source = self._source()
+        self._keys: List[str] = list(source) if isinstance(source, dict) else [str(i) for i in range(len(source))]
+        self._scanned = 0  # Keys examined so far
+        self._matches: List[str] = []  # Matching keys found so far
+        self.page = 0
+
+    def _source(self):
+        return self._data().get(self.table, {})
+
+    def _value(self, key: str) -> Any:
+        source = self._source()
+        if isinstance(source, dict):
+            return source.get(key)
+        index = int(key)
+        return source[index] if index < len(source) else None
+
+    def _matches_filter(self, key: str) -> bool:
+        if self.prefix and not key.startswith(self.prefix):
+            return False
+        value = self._value(key)
+        if value is None:
+            return False  # Deleted since the session started
+        record = {"key": key, **value} if isinstance(value, dict) else {"key": key, "value": value}
+        return self._predicate(record)
+
+    def _scan_until(self, count: int, key: Optional[str] = None):
+        """Extend the match list to `count` entries (or until `key` is found)"""
+        while self._scanned < len(self._keys) and len(self._matches) < count:
+            candidate = self._keys[self._scanned]
+            self._scanned += 1
+            if self._matches_filter(candidate):
+                self._matches.append(candidate)
+                if candidate == key:
+                    return
+
+    # ==================== NAVIGATION ====================
+
+    @property
+    def complete(self) -> bool:
+        """True once every key has been examined (total pages known)"""
+        return self._scanned >= len(self._keys)
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        if not self.complete:
+            return None
+        return max(1, -(-len(self._matches) // self.page_size))
+
+    def page_keys(self, page: int) -> List[str]:
+        self._scan_until((page + 1) * self.page_size)
+        return self._matches[page * self.page_size:(page + 1) * self.page_size]
+
+    def go(self, page: int) -> bool:
+        """Move to a page if it has entries; returns False if out of range"""
+        if page < 0 or (page > 0 and not self.page_keys(page)):
+            return False
+        self.page = page
+        return True
+
+    def next(self) -> bool:
+        return self.go(self.page + 1)
+
+    def previous(self) -> bool:
+        return self.go(self.page - 1)
+
+    def jump(self, key: str) -> bool:
+        """Move to the page containing a key; returns False if it doesn't match"""
+        if key not in self._matches:
+            self._scan_until(len(self._keys), key)
+        if key not in self._matches:
+            return False
+        self.page = self._matches.index(key) // self.page_size
+        return True
+
+    # ==================== RENDERING ====================
+
+    def render(self) -> str:
+        """Serialize just the current page's entries"""
+        keys = self.page_keys(self.page)
+        if not keys:
+            return "No matching entries."
+
+        budget = PAGE_CHARS // len(keys)
+        parts = []
+        for key in keys:
+            text = json.dumps({key: self._value(key)}, indent=2)
+            if len(text) > budget:
+                text = text[:budget - 16] + "\n... (truncated)"
+            parts.append(text)
+        return "\n".join(parts)
+
+    def position(self) -> str:
+        """Human-readable page indicator"""
+        total = self.total_pages
+        return f"Page {self.page + 1}/{total}" if total else f"Page {self.page + 1}/?"
@@ -13,9 +13,18 @@ from bot import (
     save_data, 
     get_guild_data, 
     get_user_data,
+    build_leaderboard_members,
+    embed_hash,
+    notify_ranking_change,
+    revoke_loyalty,
+    set_creed_route,
+    reconcile_creed_optins,
+    revoke_loyal_roles,
+    sync_loyal_roles,
+    withdraw_creed_reactions,
     BRAND_COLOR,
     MAIN_HUB_ID,
-    STREAK_MESSAGE_THRESHOLD
+    get_streak_threshold
 )
 
 from format import (
@@ -60,6 +69,10 @@ class Loyalty(commands.Cog):
                 "name": "Set Loyalty Role",
                 "syntax": f"{ctx.prefix}l role <@role>"
             },
+            {
+                "name": "Recover Opt-ins",
+                "syntax": f"{ctx.prefix}l reconcile"
+            },
             {
                 "name": "View User Stats",
                 "syntax": f"{ctx.prefix}l user stats <@user>"
@@ -112,7 +125,7 @@ class Loyalty(commands.Cog):
         
         embed.add_field(
             name="How It Works",
-            value=f"• Gain 1 streak day per {STREAK_MESSAGE_THRESHOLD} messages\n• Stay active to maintain status\n• 7+ days inactive = marked inactive",
+            value=f"• Gain 1 streak day per {get_streak_threshold(ctx.guild.id)} messages\n• Stay active to maintain status\n• 7+ days inactive = marked inactive",
             inline=False
         )
         
@@ -130,6 +143,7 @@ class Loyalty(commands.Cog):
             guild_data["creed_message_id"] = creed_msg.id
             guild_data["creed_channel_id"] = channel.id
             save_data()
+            set_creed_route(ctx.guild.id, creed_msg.id)
             
             # Confirm to admin
             confirm_embed = create_success_embed(
@@ -180,21 +194,8 @@ class Loyalty(commands.Cog):
         
         guild_data = get_guild_data(ctx.guild.id)
         
-        # Get top loyal members by streak (active only)
-        loyal_members = []
-        for user_id_str, user_data in bot_module.DATA.get("global_users", {}).items():
-            if user_data.get("is_loyal") and not user_data.get("is_inactive", False):
-                uid = int(user_id_str)
-                member = ctx.guild.get_member(uid)
-                loyal_members.append({
-                    "user_id": uid,
-                    "messages": user_data.get("total_messages", 0),
-                    "streak": user_data.get("streak", 0),
-                    "display_name": member.display_name if member else user_data.get("main_server_name", f"User {uid}")
-                })
-        
-        loyal_members.sort(key=lambda x: (x["streak"], x["messages"]), reverse=True)
-        top_members = loyal_members[:count]
+        # Top loyal members from the shared ranking (no network scan)
+        top_members = build_leaderboard_members(ctx.guild, bot_module.DASHBOARD_SCHEDULER.get_top(), count)
         
         # Create leaderboard embed
         embed = create_leaderboard_embed(
@@ -209,13 +210,16 @@ class Loyalty(commands.Cog):
             # Save dashboard location
             guild_data["dashboard_msg_id"] = dashboard_msg.id
             guild_data["dashboard_channel_id"] = channel.id
+            guild_data["dashboard_size"] = count
             save_data()
+            bot_module.DASHBOARD_SCHEDULER.forget(ctx.guild.id)
+            bot_module.DASHBOARD_HASHES[ctx.guild.id] = embed_hash(embed)
             
             # Confirm
             confirm_embed = create_success_embed(
                 title="Leaderboard Created",
                 description=f"Leaderboard dashboard created in {channel.mention}\n"
-                           f"Auto-updates every 4 hours\n\n"
+                           f"Auto-updates when the top {count} changes\n\n"
                            f"[Jump to leaderboard]({dashboard_msg.jump_url})",
                 guild=ctx.guild
             )
@@ -266,54 +270,24 @@ class Loyalty(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Get top 10 active loyal members
-        loyal_members = []
-        for user_id_str, user_data in bot_module.DATA.get("global_users", {}).items():
-            if user_data.get("is_loyal") and not user_data.get("is_inactive", False):
-                uid = int(user_id_str)
-                member = ctx.guild.get_member(uid)
-                loyal_members.append({
-                    "user_id": uid,
-                    "messages": user_data.get("total_messages", 0),
-                    "streak": user_data.get("streak", 0),
-                    "display_name": member.display_name if member else user_data.get("main_server_name", f"User {uid}")
-                })
-        
-        loyal_members.sort(key=lambda x: (x["streak"], x["messages"]), reverse=True)
-        top_10 = loyal_members[:10]
+        # Forget the last written hash so the edit isn't skipped as unchanged
+        # (this is also what re-posts a deleted dashboard message)
+        bot_module.DASHBOARD_HASHES.pop(ctx.guild.id, None)
         
-        embed = create_leaderboard_embed(
-            title="Top 10 Loyal Members",
-            members=top_10,
+        # Queue a debounced edit from the cached ranking
+        delay = bot_module.DASHBOARD_SCHEDULER.schedule(ctx.guild.id)
+        
+        if delay > 0:
+            when = f"Next update in **{int(delay)}s** (dashboards update at most once every {int(bot_module.get_dashboard_interval())}s)"
+        else:
+            when = "Updating now"
+        
+        confirm_embed = create_success_embed(
+            title="Leaderboard Refresh Queued",
+            description=f"Dashboard in {channel.mention} will be refreshed.\n{when}",
             guild=ctx.guild
         )
-        
-        try:
-            msg = await channel.fetch_message(dashboard_msg_id)
-            await msg.edit(embed=embed)
-            
-            confirm_embed = create_success_embed(
-                title="Leaderboard Refreshed",
-                description=f"Dashboard updated in {channel.mention}\n\n"
-                           f"[Jump to leaderboard]({msg.jump_url})",
-                guild=ctx.guild
-            )
-            await ctx.send(embed=confirm_embed)
-            
-        except discord.NotFound:
-            embed = create_error_embed(
-                title="Message Not Found",
-                description=f"Dashboard message no longer exists.\nUse `{ctx.prefix}l leaderboard` to create a new one.",
-                guild=ctx.guild
-            )
-            await ctx.send(embed=embed)
-        except discord.Forbidden:
-            embed = create_error_embed(
-                title="Permission Error",
-                description="I don't have permission to edit messages in that channel.",
-                guild=ctx.guild
-            )
-            await ctx.send(embed=embed)
+        await ctx.send(embed=confirm_embed)
     
     # ==================== ROLE COMMAND ====================
     
@@ -332,14 +306,59 @@ class Loyalty(commands.Cog):
         guild_data["loyal_role_id"] = role.id
         save_data()
         
+        # Back-fill the role for loyal members already in this server
+        result = sync_loyal_roles([ctx.guild.id])
+        
         embed = create_success_embed(
             title="Loyalty Role Set",
             description=f"Loyalty role set to {role.mention}\n\n"
-                       f"Users who react to the creed message will receive this role automatically.",
+                       f"Users who react to the creed message will receive this role automatically.\n"
+                       f"Queued **{result['grants']}** grants and **{result['revokes']}** removals to sync existing members.",
             guild=ctx.guild
         )
         await ctx.send(embed=embed)
     
+    # ==================== RECONCILE COMMAND ====================
+    
+    @loyalty.command(name='reconcile', aliases=['sync'])
+    @commands.has_permissions(administrator=True)
+    async def reconcile(self, ctx):
+        """
+        Recover creed opt-ins that were missed while the bot was offline
+        
+        Usage: $ l reconcile
+        """
+        if not ctx.guild:
+            return
+        
+        guild_data = get_guild_data(ctx.guild.id)
+        if not guild_data.get("creed_message_id"):
+            embed = create_error_embed(
+                title="No Creed",
+                description=f"No creed message configured.\nUse `{ctx.prefix}l creed` first.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        async with ctx.typing():
+            result = await reconcile_creed_optins([ctx.guild.id])
+            sync_loyal_roles([ctx.guild.id])
+        
+        if result["failed"]:
+            embed = create_error_embed(
+                title="Reconciliation Failed",
+                description="Couldn't read the creed message. Check that it still exists and I can see the channel.",
+                guild=ctx.guild
+            )
+        else:
+            embed = create_success_embed(
+                title="Opt-ins Reconciled",
+                description=f"Recovered **{result['recovered']}** missed opt-ins from the creed message.",
+                guild=ctx.guild
+            )
+        await ctx.send(embed=embed)
+    
     # ==================== USER SUBGROUP ====================
     
     @loyalty.group(name='user', invoke_without_command=True)
@@ -409,7 +428,8 @@ class Loyalty(commands.Cog):
         embed = create_user_stats_embed(
             user=target,
             user_data=user_data,
-            guild=ctx.guild
+            guild=ctx.guild,
+            streak_threshold=get_streak_threshold(user_data.get("main_server_id"))
         )
         
         await ctx.send(embed=embed)
@@ -437,34 +457,14 @@ class Loyalty(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Remove loyalty status
-        user_data["is_loyal"] = False
-        user_data["is_inactive"] = False
-        user_data["streak"] = 0
-        user_data["messages_since_last_streak"] = 0
-        user_data["opt_in_date"] = None
-        user_data["main_server_id"] = None
-        user_data["main_server_name"] = None
-        
-        # Update stats (safe access in case stats structure is missing)
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        if "stats" not in bot_module.DATA:
-            bot_module.DATA["stats"] = {"daily_joins": {}, "daily_leaves": {}, "activity_snapshots": {}}
-        if "daily_leaves" not in bot_module.DATA["stats"]:
-            bot_module.DATA["stats"]["daily_leaves"] = {}
-        bot_module.DATA["stats"]["daily_leaves"][today] = bot_module.DATA["stats"]["daily_leaves"].get(today, 0) + 1
+        # Remove loyalty status and record the leave (reconcile won't re-enroll them)
+        revoke_loyalty(user_data, opt_out=True)
         
         save_data()
+        notify_ranking_change(ctx.author.id, user_data)
         
-        # Remove role from current guild
-        guild_data = get_guild_data(ctx.guild.id)
-        if guild_data.get("loyal_role_id"):
-            role = ctx.guild.get_role(guild_data["loyal_role_id"])
-            if role and role in ctx.author.roles:
-                try:
-                    await ctx.author.remove_roles(role)
-                except:
-                    pass
+        # Remove loyal role across the network
+        revoke_loyal_roles(ctx.author.id)
         
         embed = create_success_embed(
             title="Left Network",
@@ -474,6 +474,9 @@ class Loyalty(commands.Cog):
             guild=ctx.guild
         )
         await ctx.send(embed=embed)
+        
+        # Clear their old ✅ so reacting again opts them back in
+        await withdraw_creed_reactions(ctx.author.id)
 
 # ==================== COG SETUP ====================
 
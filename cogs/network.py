@@ -14,6 +14,7 @@ from bot import (
     save_data,
     get_guild_data,
     get_user_data,
+    resolve_user,
     check_user_in_hub,
     BRAND_COLOR,
     MAIN_HUB_ID,
@@ -288,66 +289,63 @@ class Network(commands.Cog):
         await confirm_msg.add_reaction("✅")
         await confirm_msg.add_reaction("❌")
         
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == confirm_msg.id
+        choice = await bot_module.CONFIRMATIONS.wait_reaction(confirm_msg.id, ctx.author.id)
         
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            
-            if str(reaction.emoji) == "❌":
-                embed = create_error_embed(
-                    title="Broadcast Cancelled",
-                    description="Broadcast has been cancelled.",
-                    guild=ctx.guild
-                )
-                await confirm_msg.edit(embed=embed)
-                return
-            
-            # Send broadcast
-            sent = 0
-            failed = 0
-            
-            status_embed = create_info_embed(
-                title="Sending Broadcast",
-                description=f"Sending to {len(loyal_members)} members...",
-                guild=ctx.guild
-            )
-            await confirm_msg.edit(embed=status_embed)
-            
-            for member in loyal_members:
-                try:
-                    dm_embed = discord.Embed(
-                        title=f"📢 Message from {ctx.guild.name}",
-                        description=message,
-                        color=BRAND_COLOR
-                    )
-                    if ctx.guild.icon:
-                        dm_embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
-                    else:
-                        dm_embed.set_footer(text="Prime Network")
-                    
-                    await member.send(embed=dm_embed)
-                    sent += 1
-                except:
-                    failed += 1
-                
-                await asyncio.sleep(1)  # 1 second delay
-            
-            # Final result
-            result_embed = create_success_embed(
-                title="Broadcast Complete",
-                description=f"✅ Sent to {sent} members\n❌ Failed to send to {failed} members",
-                guild=ctx.guild
-            )
-            await confirm_msg.edit(embed=result_embed)
-            
-        except asyncio.TimeoutError:
+        if choice is None:
             embed = create_error_embed(
                 title="Broadcast Timeout",
                 description="Confirmation timed out. Broadcast cancelled.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
+            return
+        
+        if choice == "❌":
+            embed = create_error_embed(
+                title="Broadcast Cancelled",
+                description="Broadcast has been cancelled.",
+                guild=ctx.guild
+            )
+            await confirm_msg.edit(embed=embed)
+            return
+        
+        # Send broadcast
+        sent = 0
+        failed = 0
+        
+        status_embed = create_info_embed(
+            title="Sending Broadcast",
+            description=f"Sending to {len(loyal_members)} members...",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=status_embed)
+        
+        for member in loyal_members:
+            try:
+                dm_embed = discord.Embed(
+                    title=f"📢 Message from {ctx.guild.name}",
+                    description=message,
+                    color=BRAND_COLOR
+                )
+                if ctx.guild.icon:
+                    dm_embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+                else:
+                    dm_embed.set_footer(text="Prime Network")
+                
+                await member.send(embed=dm_embed)
+                sent += 1
+            except:
+                failed += 1
+            
+            await asyncio.sleep(1)  # 1 second delay
+        
+        # Final result
+        result_embed = create_success_embed(
+            title="Broadcast Complete",
+            description=f"✅ Sent to {sent} members\n❌ Failed to send to {failed} members",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=result_embed)
     
     # ==================== GLOBAL BROADCAST ====================
     
@@ -393,65 +391,64 @@ class Network(commands.Cog):
         await confirm_msg.add_reaction("✅")
         await confirm_msg.add_reaction("❌")
         
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == confirm_msg.id
+        choice = await bot_module.CONFIRMATIONS.wait_reaction(confirm_msg.id, ctx.author.id)
         
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            
-            if str(reaction.emoji) == "❌":
-                embed = create_error_embed(
-                    title="Broadcast Cancelled",
-                    description="Global broadcast has been cancelled.",
-                    guild=ctx.guild
-                )
-                await confirm_msg.edit(embed=embed)
-                return
-            
-            # Send global broadcast
-            sent = 0
-            failed = 0
-            
-            status_embed = create_info_embed(
-                title="Sending Global Broadcast",
-                description=f"Sending to {len(loyal_user_ids)} network members...",
-                guild=ctx.guild
-            )
-            await confirm_msg.edit(embed=status_embed)
-            
-            for user_id in loyal_user_ids:
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                    if user:
-                        dm_embed = discord.Embed(
-                            title="📢 Prime Network Announcement",
-                            description=message,
-                            color=BRAND_COLOR
-                        )
-                        dm_embed.set_footer(text="Prime Network")
-                        
-                        await user.send(embed=dm_embed)
-                        sent += 1
-                except:
-                    failed += 1
-                
-                await asyncio.sleep(1)  # 1 second delay
-            
-            # Final result
-            result_embed = create_success_embed(
-                title="Global Broadcast Complete",
-                description=f"✅ Sent to {sent} members\n❌ Failed to send to {failed} members",
-                guild=ctx.guild
-            )
-            await confirm_msg.edit(embed=result_embed)
-            
-        except asyncio.TimeoutError:
+        if choice is None:
             embed = create_error_embed(
                 title="Broadcast Timeout",
                 description="Confirmation timed out. Broadcast cancelled.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
+            return
+        
+        if choice == "❌":
+            embed = create_error_embed(
+                title="Broadcast Cancelled",
+                description="Global broadcast has been cancelled.",
+                guild=ctx.guild
+            )
+            await confirm_msg.edit(embed=embed)
+            return
+        
+        # Send global broadcast
+        sent = 0
+        failed = 0
+        
+        status_embed = create_info_embed(
+            title="Sending Global Broadcast",
+            description=f"Sending to {len(loyal_user_ids)} network members...",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=status_embed)
+        
+        for user_id in loyal_user_ids:
+            try:
+                user = await resolve_user(user_id)
+                if not user:
+                    failed += 1
+                else:
+                    dm_embed = discord.Embed(
+                        title="📢 Prime Network Announcement",
+                        description=message,
+                        color=BRAND_COLOR
+                    )
+                    dm_embed.set_footer(text="Prime Network")
+                    
+                    await user.send(embed=dm_embed)
+                    sent += 1
+            except:
+                failed += 1
+            
+            await asyncio.sleep(1)  # 1 second delay
+        
+        # Final result
+        result_embed = create_success_embed(
+            title="Global Broadcast Complete",
+            description=f"✅ Sent to {sent} members\n❌ Failed to send to {failed} members",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=result_embed)
     
     # ==================== INVITE COMMAND ====================
     
@@ -570,11 +567,11 @@ class Network(commands.Cog):
         selected = random.sample(loyal_user_ids, count)
         
         members_text = ""
-        for user_id in selected:
-            try:
-                user = await self.bot.fetch_user(user_id)
+        users = await asyncio.gather(*(resolve_user(user_id) for user_id in selected))
+        for user_id, user in zip(selected, users):
+            if user:
                 members_text += f"• {user.mention} (`{user.id}`)\n"
-            except:
+            else:
                 members_text += f"• User ID: `{user_id}`\n"
         
         embed = create_info_embed(
@@ -605,10 +602,7 @@ class Network(commands.Cog):
         if isinstance(user, str):
             # Try as ID
             if user.isdigit():
-                try:
-                    target_user = await self.bot.fetch_user(int(user))
-                except:
-                    pass
+                target_user = await resolve_user(int(user))
             
             # Try as name if ID failed
             if not target_user:
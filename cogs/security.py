@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import bot as bot_module
 from bot import (
     save_data,
+    resolve_user,
     is_trusted_user,
     is_owner,
     BRAND_COLOR,
@@ -162,11 +163,8 @@ class Security(commands.Cog):
                 failed_count += 1
         
         # Fetch user info
-        try:
-            user = await self.bot.fetch_user(user_id_int)
-            user_name = f"{user.name} ({user.id})"
-        except:
-            user_name = f"User ID: {user_id}"
+        user = await resolve_user(user_id_int)
+        user_name = f"{user.name} ({user.id})" if user else f"User ID: {user_id}"
         
         embed = create_success_embed(
             title="User Banned",
@@ -251,11 +249,8 @@ class Security(commands.Cog):
                 failed_count += 1
         
         # Fetch user info
-        try:
-            user = await self.bot.fetch_user(user_id_int)
-            user_name = f"{user.name} ({user.id})"
-        except:
-            user_name = f"User ID: {user_id}"
+        user = await resolve_user(user_id_int)
+        user_name = f"{user.name} ({user.id})" if user else f"User ID: {user_id}"
         
         embed = create_success_embed(
             title="User Timed Out",
@@ -309,41 +304,38 @@ class Security(commands.Cog):
         await confirm_msg.add_reaction("✅")
         await confirm_msg.add_reaction("❌")
         
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == confirm_msg.id
+        choice = await bot_module.CONFIRMATIONS.wait_reaction(confirm_msg.id, ctx.author.id)
         
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            
-            if str(reaction.emoji) == "❌":
-                embed = create_error_embed(
-                    title="Action Cancelled",
-                    description="System stop cancelled.",
-                    guild=ctx.guild
-                )
-                await confirm_msg.edit(embed=embed)
-                return
-            
-            # Stop system
-            bot_module.DATA["network_config"]["system_active"] = False
-            save_data()
-            
-            embed = create_success_embed(
-                title="System Stopped",
-                description=f"The loyalty system has been disabled by {ctx.author.mention}\n\n"
-                           f"All commands are now blocked until system is restarted.\n"
-                           f"Use `{ctx.prefix}sec start` to re-enable.",
+        if choice is None:
+            embed = create_error_embed(
+                title="Confirmation Timeout",
+                description="System stop cancelled due to timeout.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
-            
-        except:
+            return
+        
+        if choice == "❌":
             embed = create_error_embed(
-                title="Confirmation Timeout",
-                description="System stop cancelled due to timeout.",
+                title="Action Cancelled",
+                description="System stop cancelled.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
+            return
+        
+        # Stop system
+        bot_module.DATA["network_config"]["system_active"] = False
+        save_data()
+        
+        embed = create_success_embed(
+            title="System Stopped",
+            description=f"The loyalty system has been disabled by {ctx.author.mention}\n\n"
+                       f"All commands are now blocked until system is restarted.\n"
+                       f"Use `{ctx.prefix}sec start` to re-enable.",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=embed)
     
     # ==================== START SYSTEM ====================
     
@@ -403,11 +395,11 @@ class Security(commands.Cog):
         
         users_text = ""
         for user_id in trusted_users:
-            try:
-                user = await self.bot.fetch_user(user_id)
+            user = await resolve_user(user_id)
+            if user:
                 owner_tag = " **(Owner)**" if user_id == BOT_OWNER_ID else ""
                 users_text += f"• {user.mention} - `{user.id}`{owner_tag}\n"
-            except:
+            else:
                 users_text += f"• User ID: `{user_id}`\n"
         
         if not users_text:
@@ -465,21 +457,18 @@ class Security(commands.Cog):
         )
         await ctx.send(embed=embed)
         
-        # Send DM to user
-        try:
-            dm_embed = discord.Embed(
-                title="🔐 Trusted Admin Access Granted",
-                description=f"You've been granted trusted admin access in **Prime Network** by {ctx.author.mention}.\n\n"
-                           f"You can now use all module commands except sudo.",
-                color=BRAND_COLOR
-            )
-            if ctx.guild and ctx.guild.icon:
-                dm_embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
-            else:
-                dm_embed.set_footer(text="Prime Network")
-            await user.send(embed=dm_embed)
-        except:
-            pass
+        # Courtesy DM to user via the outbox
+        dm_embed = discord.Embed(
+            title="🔐 Trusted Admin Access Granted",
+            description=f"You've been granted trusted admin access in **Prime Network** by {ctx.author.mention}.\n\n"
+                       f"You can now use all module commands except sudo.",
+            color=BRAND_COLOR
+        )
+        if ctx.guild and ctx.guild.icon:
+            dm_embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            dm_embed.set_footer(text="Prime Network")
+        bot_module.OUTBOX.post(lambda: user.send(embed=dm_embed), label=f"trusted {user.id}")
 
 # ==================== COG SETUP ====================
 
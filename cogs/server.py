@@ -11,13 +11,20 @@ import bot as bot_module
 from bot import (
     save_data,
     get_guild_data,
+    set_creed_route,
+    nuke_guild,
+    get_streak_threshold,
+    recompute_streaks,
     is_trusted_user,
     is_owner,
     BRAND_COLOR,
+    GUILD_STREAK_THRESHOLD_MIN,
     MAIN_HUB_ID,
     HUB_INVITE
 )
 
+from gate import lock_guild, unlock_guild, plan_nuke
+
 from format import (
     create_base_embed,
     create_success_embed,
@@ -58,10 +65,18 @@ class Server(commands.Cog):
                 "name": "Lock Server",
                 "syntax": f"{ctx.prefix}s gate lock"
             },
+            {
+                "name": "Unlock Server",
+                "syntax": f"{ctx.prefix}s gate unlock"
+            },
             {
                 "name": "Nuke Server",
                 "syntax": f"{ctx.prefix}s gate nuke"
             },
+            {
+                "name": "Streak Threshold",
+                "syntax": f"{ctx.prefix}s streak <messages|default>"
+            },
             {
                 "name": "View Config",
                 "syntax": f"{ctx.prefix}s config"
@@ -75,7 +90,8 @@ class Server(commands.Cog):
                        "**Features:**\n"
                        "• Rename server\n"
                        "• Leave network (removes all data)\n"
-                       "• Gate controls (lock/nuke)\n"
+                       "• Gate controls (lock/unlock/nuke)\n"
+                       "• Streak threshold for members based here\n"
                        "• View server configuration\n\n"
                        "**Required:** Server Admin or Trusted",
             commands=commands_list,
@@ -177,49 +193,47 @@ class Server(commands.Cog):
         await confirm_msg.add_reaction("✅")
         await confirm_msg.add_reaction("❌")
         
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == confirm_msg.id
+        choice = await bot_module.CONFIRMATIONS.wait_reaction(confirm_msg.id, ctx.author.id)
         
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            
-            if str(reaction.emoji) == "❌":
-                embed = create_error_embed(
-                    title="Action Cancelled",
-                    description="Server removal cancelled.",
-                    guild=ctx.guild
-                )
-                await confirm_msg.edit(embed=embed)
-                return
-            
-            # Remove guild data
-            guild_id_str = str(ctx.guild.id)
-            if guild_id_str in bot_module.DATA.get("guilds", {}):
-                del bot_module.DATA["guilds"][guild_id_str]
-                save_data()
-            
-            embed = create_success_embed(
-                title="Left Network",
-                description=f"**{ctx.guild.name}** has been removed from Prime Network.\n\n"
-                           f"All server data has been deleted.\n"
-                           f"Bot is now leaving the server...",
+        if choice is None:
+            embed = create_error_embed(
+                title="Confirmation Timeout",
+                description="Server removal cancelled due to timeout.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
-            
-            # Leave the server
-            try:
-                await ctx.guild.leave()
-            except Exception as e:
-                print(f"Failed to leave guild {ctx.guild.id}: {e}")
-            
-        except:
+            return
+        
+        if choice == "❌":
             embed = create_error_embed(
-                title="Confirmation Timeout",
-                description="Server removal cancelled due to timeout.",
+                title="Action Cancelled",
+                description="Server removal cancelled.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
+            return
+        
+        # Remove guild data
+        guild_id_str = str(ctx.guild.id)
+        if guild_id_str in bot_module.DATA.get("guilds", {}):
+            del bot_module.DATA["guilds"][guild_id_str]
+            save_data()
+        set_creed_route(ctx.guild.id, None)
+        
+        embed = create_success_embed(
+            title="Left Network",
+            description=f"**{ctx.guild.name}** has been removed from Prime Network.\n\n"
+                       f"All server data has been deleted.\n"
+                       f"Bot is now leaving the server...",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=embed)
+        
+        # Leave the server
+        try:
+            await ctx.guild.leave()
+        except Exception as e:
+            print(f"Failed to leave guild {ctx.guild.id}: {e}")
     
     # ==================== GATE SUBGROUP ====================
     
@@ -232,6 +246,10 @@ class Server(commands.Cog):
                 "name": "Lock Server",
                 "syntax": f"{ctx.prefix}s gate lock"
             },
+            {
+                "name": "Unlock Server",
+                "syntax": f"{ctx.prefix}s gate unlock"
+            },
             {
                 "name": "Nuke Server",
                 "syntax": f"{ctx.prefix}s gate nuke"
@@ -267,7 +285,8 @@ class Server(commands.Cog):
                        "**This will:**\n"
                        "• Disable @everyone send messages in ALL channels\n"
                        "• Server becomes read-only for regular members\n"
-                       "• Admins and bots can still send messages\n\n"
+                       "• Admins and bots can still send messages\n"
+                       "• Current permissions are saved for `gate unlock`\n\n"
                        "React with ✅ to confirm or ❌ to cancel.",
             guild=ctx.guild
         )
@@ -275,54 +294,114 @@ class Server(commands.Cog):
         await confirm_msg.add_reaction("✅")
         await confirm_msg.add_reaction("❌")
         
-        def check(reaction, user):
-            return user == ctx.author and str(reaction.emoji) in ["✅", "❌"] and reaction.message.id == confirm_msg.id
+        choice = await bot_module.CONFIRMATIONS.wait_reaction(confirm_msg.id, ctx.author.id)
         
-        try:
-            reaction, user = await self.bot.wait_for('reaction_add', timeout=30.0, check=check)
-            
-            if str(reaction.emoji) == "❌":
-                embed = create_error_embed(
-                    title="Action Cancelled",
-                    description="Server lock cancelled.",
-                    guild=ctx.guild
-                )
-                await confirm_msg.edit(embed=embed)
-                return
-            
-            # Lock all channels
-            locked_count = 0
-            failed_count = 0
-            
-            for channel in ctx.guild.channels:
-                if isinstance(channel, (discord.TextChannel, discord.VoiceChannel)):
-                    try:
-                        await channel.set_permissions(
-                            ctx.guild.default_role,
-                            send_messages=False,
-                            reason=f"Server locked by {ctx.author}"
-                        )
-                        locked_count += 1
-                    except:
-                        failed_count += 1
-            
-            embed = create_success_embed(
-                title="Server Locked",
-                description=f"**{ctx.guild.name}** is now in read-only mode.\n\n"
-                           f"✅ Locked {locked_count} channels\n"
-                           f"❌ Failed to lock {failed_count} channels\n\n"
-                           f"Regular members cannot send messages.",
+        if choice is None:
+            embed = create_error_embed(
+                title="Confirmation Timeout",
+                description="Server lock cancelled due to timeout.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
-            
-        except:
+            return
+        
+        if choice == "❌":
             embed = create_error_embed(
-                title="Confirmation Timeout",
-                description="Server lock cancelled due to timeout.",
+                title="Action Cancelled",
+                description="Server lock cancelled.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
+            return
+        
+        # Lock all channels (prior overwrites are snapshotted to disk first)
+        guild_data = get_guild_data(ctx.guild.id)
+        
+        async def report(done, failed, total):
+            status_embed = create_info_embed(
+                title="🔒 Locking Server...",
+                description=f"Progress: **{done + failed}/{total}** channels\n"
+                           f"✅ {done} locked\n"
+                           f"❌ {failed} failed",
+                guild=ctx.guild
+            )
+            await confirm_msg.edit(embed=status_embed)
+        
+        result = await lock_guild(
+            ctx.guild,
+            guild_data,
+            save_data,
+            reason=f"Server locked by {ctx.author}",
+            progress=report
+        )
+        
+        embed = create_success_embed(
+            title="Server Locked",
+            description=f"**{ctx.guild.name}** is now in read-only mode.\n\n"
+                       f"✅ Locked {len(result['done'])} channels\n"
+                       f"❌ Failed to lock {len(result['failed'])} channels\n\n"
+                       f"Regular members cannot send messages.\n"
+                       f"Use `{ctx.prefix}s gate unlock` to restore the previous permissions.",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=embed)
+    
+    # ==================== UNLOCK COMMAND ====================
+    
+    @gate.command(name='unlock')
+    @commands.has_permissions(administrator=True)
+    async def gate_unlock(self, ctx):
+        """
+        Restore @everyone permissions saved by the last gate lock
+        
+        Usage: $ s gate unlock
+        """
+        if not ctx.guild:
+            return
+        
+        guild_data = get_guild_data(ctx.guild.id)
+        if not guild_data.get("gate_snapshot"):
+            embed = create_error_embed(
+                title="Not Locked",
+                description=f"No lock snapshot found for this server.\nUse `{ctx.prefix}s gate lock` first.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        status_msg = await ctx.send(embed=create_info_embed(
+            title="🔓 Unlocking Server...",
+            description="Restoring channel permissions...",
+            guild=ctx.guild
+        ))
+        
+        async def report(done, failed, total):
+            status_embed = create_info_embed(
+                title="🔓 Unlocking Server...",
+                description=f"Progress: **{done + failed}/{total}** channels\n"
+                           f"✅ {done} restored\n"
+                           f"❌ {failed} failed",
+                guild=ctx.guild
+            )
+            await status_msg.edit(embed=status_embed)
+        
+        result = await unlock_guild(
+            ctx.guild,
+            guild_data,
+            save_data,
+            reason=f"Server unlocked by {ctx.author}",
+            progress=report
+        )
+        
+        embed = create_success_embed(
+            title="Server Unlocked",
+            description=f"**{ctx.guild.name}** permissions restored.\n\n"
+                       f"✅ Restored {len(result['done'])} channels\n"
+                       f"❌ Failed to restore {len(result['failed'])} channels"
+                       + (f"\n\nRun `{ctx.prefix}s gate unlock` again to retry failed channels." if result["failed"] else ""),
+            guild=ctx.guild
+        )
+        await status_msg.edit(embed=embed)
     
     # ==================== NUKE COMMAND ====================
     
@@ -362,68 +441,109 @@ class Server(commands.Cog):
         )
         confirm_msg = await ctx.send(embed=confirm_embed)
         
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel and m.content == "NUKE"
+        confirmed = await bot_module.CONFIRMATIONS.wait_message(ctx.channel.id, ctx.author.id, "NUKE")
         
-        try:
-            await self.bot.wait_for('message', timeout=30.0, check=check)
-            
-            # Execute nuke
-            status_embed = create_info_embed(
-                title="🚨 Nuking Server...",
-                description="Deleting all channels and roles...",
+        if not confirmed:
+            embed = create_error_embed(
+                title="Nuke Cancelled",
+                description="Server nuke cancelled (timeout or invalid confirmation).",
                 guild=ctx.guild
             )
-            await confirm_msg.edit(embed=status_embed)
-            
-            # Delete all channels
-            for channel in ctx.guild.channels:
-                try:
-                    await channel.delete(reason=f"Server nuked by {ctx.author}")
-                except:
-                    pass
-            
-            # Delete all roles (except @everyone and managed roles)
-            for role in ctx.guild.roles:
-                if role != ctx.guild.default_role and not role.managed:
-                    try:
-                        await role.delete(reason=f"Server nuked by {ctx.author}")
-                    except:
-                        pass
-            
-            # Create new read-only channel
-            overwrites = {
-                ctx.guild.default_role: discord.PermissionOverwrite(
-                    send_messages=False,
-                    read_messages=True
-                )
-            }
-            
-            new_channel = await ctx.guild.create_text_channel(
-                name="hub-invite",
-                overwrites=overwrites,
-                reason=f"Server nuked by {ctx.author}"
+            await confirm_msg.edit(embed=embed)
+            return
+        
+        # Plan the whole job up front and checkpoint it so a restart resumes it
+        guild_data = get_guild_data(ctx.guild.id)
+        if not guild_data.get("nuke_job"):
+            guild_data["nuke_job"] = plan_nuke(
+                ctx.guild,
+                ctx.author.id,
+                reason=f"Server nuked by {ctx.author}",
+                command_channel_id=ctx.channel.id
             )
-            
-            # Post hub invite
-            nuke_embed = discord.Embed(
-                title="🚨 Server Nuked",
-                description=f"This server has been reset.\n\n"
-                           f"**Join the Prime Network hub:**\n{HUB_INVITE}",
-                color=BRAND_COLOR
+            save_data()
+        
+        status_embed = create_info_embed(
+            title="🚨 Nuking Server...",
+            description="Deleting all channels and roles...",
+            guild=ctx.guild
+        )
+        await confirm_msg.edit(embed=status_embed)
+        
+        async def report(done, failed, total):
+            status_embed = create_info_embed(
+                title="🚨 Nuking Server...",
+                description=f"Progress: **{done + failed}/{total}** channels and roles\n"
+                           f"✅ {done} deleted\n"
+                           f"❌ {failed} failed\n\n"
+                           f"A summary will be sent to you by DM.",
+                guild=ctx.guild
             )
-            nuke_embed.set_footer(text="Prime Network")
-            
-            await new_channel.send(embed=nuke_embed)
-            
-        except:
+            try:
+                await confirm_msg.edit(embed=status_embed)
+            except discord.HTTPException:
+                pass  # This channel is deleted last
+        
+        job = await nuke_guild(ctx.guild, progress=report)
+        if job is None:
             embed = create_error_embed(
-                title="Nuke Cancelled",
-                description="Server nuke cancelled (timeout or invalid confirmation).",
+                title="Nuke In Progress",
+                description="A nuke of this server is already running.",
                 guild=ctx.guild
             )
             await confirm_msg.edit(embed=embed)
     
+    # ==================== STREAK COMMAND ====================
+    
+    @server.command(name='streak', aliases=['threshold'])
+    @commands.has_permissions(administrator=True)
+    async def streak(self, ctx, messages: str):
+        """
+        Set messages per streak day for members whose main server is this one
+        
+        Usage: $ s streak 150
+        Usage: $ s streak default
+        """
+        if not ctx.guild:
+            return
+        
+        if messages.lower() == "default":
+            threshold = None
+        elif messages.isdigit() and GUILD_STREAK_THRESHOLD_MIN <= int(messages) <= 10000:
+            threshold = int(messages)
+        else:
+            embed = create_error_embed(
+                title="Invalid Threshold",
+                description=f"Use a number of messages between {GUILD_STREAK_THRESHOLD_MIN} and 10000, or `default`.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        guild_data = get_guild_data(ctx.guild.id)
+        previous = get_streak_threshold(ctx.guild.id)
+        if threshold is None:
+            guild_data.pop("streak_threshold", None)
+        else:
+            guild_data["streak_threshold"] = threshold
+        
+        # Only members based here are rebuilt, and only if their threshold changed
+        if get_streak_threshold(ctx.guild.id) != previous:
+            changed = await recompute_streaks(ctx.guild.id)
+        else:
+            save_data()
+            changed = 0
+        
+        embed = create_success_embed(
+            title="Streak Threshold Updated",
+            description=f"Members based in this server now gain **1 streak day per "
+                       f"{get_streak_threshold(ctx.guild.id)} messages**"
+                       f"{' (network default)' if threshold is None else ''}.\n\n"
+                       f"**Streaks Rebuilt:** {changed:,} changed",
+            guild=ctx.guild
+        )
+        await ctx.send(embed=embed)
+    
     # ==================== CONFIG COMMAND ====================
     
     @server.command(name='config', aliases=['settings', 'info'])
@@ -439,7 +559,8 @@ class Server(commands.Cog):
         guild_data = get_guild_data(ctx.guild.id)
         embed = create_guild_config_embed(
             guild=ctx.guild,
-            guild_data=guild_data
+            guild_data=guild_data,
+            streak_threshold=get_streak_threshold(ctx.guild.id)
         )
         await ctx.send(embed=embed)
 
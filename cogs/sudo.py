@@ -1,10 +1,9 @@
 import discord
 from discord.ext import commands
 from typing import Optional, Literal
-import json
+import io
 import sys
 import os
-from datetime import datetime, timedelta, timezone
 
 # Add parent directory to path to import from bot.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import bot as bot_module
 from bot import (
     save_data,
+    resolve_user,
     get_loyal_member_count,
     get_active_loyal_count,
     is_owner,
@@ -19,13 +19,19 @@ from bot import (
     BOT_OWNER_ID
 )
 
+from graph import render_trends, render_line, render_histogram, cache_info
+from telemetry import WEEKDAYS
+from export import export_table, parse_filter
+from browser import SchemaBrowser
+
 from format import (
     create_base_embed,
     create_success_embed,
     create_error_embed,
     create_info_embed,
     create_module_help_embed,
-    create_network_stats_embed
+    create_network_stats_embed,
+    truncate_text
 )
 
 def is_owner_check():
@@ -69,11 +75,15 @@ class Sudo(commands.Cog):
             },
             {
                 "name": "View Database Table",
-                "syntax": f"{ctx.prefix}su schema view <table>"
+                "syntax": f"{ctx.prefix}su schema view <table> [key=<id>] [prefix=<p>] [filter]"
             },
             {
                 "name": "Check Schema Health",
                 "syntax": f"{ctx.prefix}su schema health"
+            },
+            {
+                "name": "Export Data",
+                "syntax": f"{ctx.prefix}su schema export <users|guilds|stats> [jsonl|csv] [attach|local] [filter]"
             }
         ]
         
@@ -105,11 +115,11 @@ class Sudo(commands.Cog):
         
         users_text = ""
         for user_id in trusted_users:
-            try:
-                user = await self.bot.fetch_user(user_id)
+            user = await resolve_user(user_id)
+            if user:
                 owner_tag = " **(Owner)**" if user_id == BOT_OWNER_ID else ""
                 users_text += f"• {user.mention} - `{user.id}`{owner_tag}\n"
-            except:
+            else:
                 users_text += f"• User ID: `{user_id}`\n"
         
         if not users_text:
@@ -185,11 +195,8 @@ class Sudo(commands.Cog):
         save_data()
         
         # Fetch user info
-        try:
-            user = await self.bot.fetch_user(user_id_int)
-            user_name = f"{user.name} ({user.id})"
-        except:
-            user_name = f"User ID: {user_id}"
+        user = await resolve_user(user_id_int)
+        user_name = f"{user.name} ({user.id})" if user else f"User ID: {user_id}"
         
         embed = create_success_embed(
             title="Trusted Removed",
@@ -207,11 +214,15 @@ class Sudo(commands.Cog):
         commands_list = [
             {
                 "name": "View Table",
-                "syntax": f"{ctx.prefix}su schema view <table>"
+                "syntax": f"{ctx.prefix}su schema view <table> [key=<id>] [prefix=<p>] [filter]"
             },
             {
                 "name": "Check Health",
                 "syntax": f"{ctx.prefix}su schema health"
+            },
+            {
+                "name": "Export Data",
+                "syntax": f"{ctx.prefix}su schema export <users|guilds|stats> [jsonl|csv] [attach|local] [filter]"
             }
         ]
         
@@ -219,7 +230,7 @@ class Sudo(commands.Cog):
             module_name="Sudo - Schema",
             module_icon="💾",
             description="Database inspection tools\n\n**Available tables:**\n"
-                       "`network_config`, `global_blacklist`, `global_users`, `guilds`, `stats`",
+                       "`network_config`, `global_blacklist`, `global_users`, `guilds`, `stats`, `archived_guilds`",
             commands=commands_list,
             guild=ctx.guild
         )
@@ -227,13 +238,13 @@ class Sudo(commands.Cog):
     
     @schema.command(name='view')
     @is_owner_check()
-    async def schema_view(self, ctx, table: str):
+    async def schema_view(self, ctx, table: str, *, options: Optional[str] = None):
         """
-        Inspect raw JSON table (truncated to 1950 chars)
+        Browse a table page by page (react to page, optionally jump/filter)
         
-        Usage: $ su schema view network_config
+        Usage: $ su schema view global_users [key=<id>] [prefix=<p>] [filter]
         """
-        valid_tables = ["network_config", "global_blacklist", "global_users", "guilds", "stats"]
+        valid_tables = ["network_config", "global_blacklist", "global_users", "guilds", "stats", "archived_guilds"]
         
         if table not in valid_tables:
             embed = create_error_embed(
@@ -244,20 +255,78 @@ class Sudo(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Get table data
-        table_data = bot_module.DATA.get(table, {})
-        json_str = json.dumps(table_data, indent=2)
+        # Leading key=/prefix= options, the rest is a field filter
+        jump_key = prefix = None
+        words = (options or "").split()
+        while words and words[0].startswith(("key=", "prefix=")):
+            name, _, value = words.pop(0).partition("=")
+            if name == "key":
+                jump_key = value
+            else:
+                prefix = value
+        expression = " ".join(words) or None
         
-        # Truncate if too long
-        if len(json_str) > 1950:
-            json_str = json_str[:1950] + "\n... (truncated)"
+        try:
+            browser = SchemaBrowser(lambda: bot_module.DATA, table, prefix=prefix, expression=expression)
+        except ValueError as e:
+            embed = create_error_embed(
+                title="Invalid Filter",
+                description=f"{e}\n\nExample: `is_loyal and streak >= 10`",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
         
-        embed = create_info_embed(
-            title=f"📊 Database Table: {table}",
-            description=f"```json\n{json_str}\n```",
-            guild=ctx.guild
-        )
-        await ctx.send(embed=embed)
+        if jump_key and not browser.jump(jump_key):
+            embed = create_error_embed(
+                title="Key Not Found",
+                description=f"`{jump_key}` is not in `{table}` (or doesn't match the filter).",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        def page_embed():
+            filters = " • ".join(part for part in (
+                f"prefix `{prefix}`" if prefix else "",
+                f"filter `{truncate_text(expression, 100)}`" if expression else ""
+            ) if part)
+            embed = create_info_embed(
+                title=f"📊 Database Table: {table}",
+                description=f"```json\n{browser.render()}\n```",
+                guild=ctx.guild
+            )
+            embed.add_field(name=browser.position(), value=filters or "No filter", inline=False)
+            return embed
+        
+        message = await ctx.send(embed=page_embed())
+        controls = ("⏮️", "◀️", "▶️", "⏹️")
+        for emoji in controls:
+            await message.add_reaction(emoji)
+        
+        # The browser is this session's cursor; it lives until the prompt times out
+        while True:
+            choice = await bot_module.CONFIRMATIONS.wait_reaction(message.id, ctx.author.id, choices=controls, timeout=120.0)
+            if choice is None or choice == "⏹️":
+                break
+            
+            moved = {
+                "⏮️": lambda: browser.go(0),
+                "◀️": browser.previous,
+                "▶️": browser.next
+            }[choice]()
+            
+            try:
+                await message.remove_reaction(choice, ctx.author)
+            except discord.HTTPException:
+                pass  # Needs Manage Messages (and never works in DMs)
+            if moved:
+                await message.edit(embed=page_embed())
+        
+        try:
+            await message.clear_reactions()
+        except discord.HTTPException:
+            pass
     
     @schema.command(name='health')
     @is_owner_check()
@@ -304,6 +373,70 @@ class Sudo(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    @schema.command(name='export', aliases=['dump'])
+    @is_owner_check()
+    async def schema_export(
+        self,
+        ctx,
+        table: Literal['users', 'guilds', 'stats'],
+        fmt: Optional[Literal['jsonl', 'csv']] = 'jsonl',
+        destination: Optional[Literal['attach', 'local']] = 'attach',
+        *,
+        expression: Optional[str] = None
+    ):
+        """
+        Stream a table to a gzip-compressed JSONL/CSV file, optionally filtered
+        
+        Usage: $ su schema export users csv is_loyal and streak >= 10
+        """
+        fmt = fmt or 'jsonl'
+        destination = destination or 'attach'
+        
+        try:
+            parse_filter(expression)
+        except ValueError as e:
+            embed = create_error_embed(
+                title="Invalid Filter",
+                description=f"{e}\n\nExample: `is_loyal and streak >= 10 and not (main_server_name ~ \"test\")`",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        status_msg = await ctx.send(embed=create_info_embed(
+            title="📦 Exporting...",
+            description=f"Streaming `{table}` to {fmt.upper()}...",
+            guild=ctx.guild
+        ))
+        
+        result = await export_table(bot_module.DATA, table, fmt, expression)
+        
+        summary = (f"**Rows:** {result['rows']:,}\n"
+                   f"**Size:** {result['bytes'] / 1024:,.1f} KB (gzip)\n"
+                   + (f"**Filter:** `{truncate_text(expression, 200)}`\n" if expression else ""))
+        
+        limit = ctx.guild.filesize_limit if ctx.guild else 8 * 1024 * 1024
+        if destination == 'attach' and result['bytes'] <= limit:
+            embed = create_success_embed(
+                title="Export Complete",
+                description=summary,
+                guild=ctx.guild
+            )
+            try:
+                await ctx.send(embed=embed, file=discord.File(result['path']))
+            finally:
+                os.remove(result['path'])
+        else:
+            note = "" if destination == 'local' else "\n*Too large to attach; kept on disk.*"
+            embed = create_success_embed(
+                title="Export Complete",
+                description=summary + f"**Path:** `{os.path.abspath(result['path'])}`" + note,
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+        
+        await status_msg.delete()
+    
     # ==================== STATS SUBGROUP ====================
     
     @sudo.group(name='stats', invoke_without_command=True)
@@ -322,6 +455,30 @@ class Sudo(commands.Cog):
             {
                 "name": "Network Trends",
                 "syntax": f"{ctx.prefix}su stats network"
+            },
+            {
+                "name": "Distribution",
+                "syntax": f"{ctx.prefix}su stats dist <streak|messages>"
+            },
+            {
+                "name": "Gateway Breakdown",
+                "syntax": f"{ctx.prefix}su stats gateways <origin|main>"
+            },
+            {
+                "name": "Activity Ratios",
+                "syntax": f"{ctx.prefix}su stats ratios"
+            },
+            {
+                "name": "Hourly Heatmap",
+                "syntax": f"{ctx.prefix}su stats heatmap [guild_id]"
+            },
+            {
+                "name": "Active Users",
+                "syntax": f"{ctx.prefix}su stats active [guild_id]"
+            },
+            {
+                "name": "Cohort Retention",
+                "syntax": f"{ctx.prefix}su stats cohorts [cohorts] [weeks]"
             }
         ]
         
@@ -342,21 +499,17 @@ class Sudo(commands.Cog):
         
         Usage: $ su stats overview
         """
-        total_guilds = len(bot_module.DATA.get("guilds", {}))
-        total_users = len(bot_module.DATA.get("global_users", {}))
-        loyal_count = get_loyal_member_count()
-        active_loyal = get_active_loyal_count()
-        blacklisted = len(bot_module.DATA.get("global_blacklist", []))
-        trusted_count = len(bot_module.DATA.get("network_config", {}).get("trusted_users", []))
+        snapshot = bot_module.STATS_SNAPSHOT.get()
         
         embed = create_network_stats_embed(
-            total_guilds=total_guilds,
-            total_users=total_users,
-            loyal_count=loyal_count,
-            active_loyal=active_loyal,
-            blacklisted=blacklisted,
-            trusted_count=trusted_count,
-            guild=ctx.guild
+            total_guilds=snapshot.guilds,
+            total_users=snapshot.total_users,
+            loyal_count=snapshot.loyal_members,
+            active_loyal=snapshot.active_loyal,
+            blacklisted=snapshot.blacklisted,
+            trusted_count=snapshot.trusted_users,
+            guild=ctx.guild,
+            updated_at=snapshot.computed_at
         )
         await ctx.send(embed=embed)
     
@@ -368,73 +521,291 @@ class Sudo(commands.Cog):
         
         Usage: $ su stats activity
         """
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        
-        # Count active today
-        active_today = 0
-        total_messages = 0
-        total_streak = 0
-        loyal_count = 0
-        
-        for user_data in bot_module.DATA.get("global_users", {}).values():
-            if user_data.get("is_loyal"):
-                loyal_count += 1
-                total_messages += user_data.get("total_messages", 0)
-                total_streak += user_data.get("streak", 0)
-                
-                if user_data.get("last_activity") == today:
-                    active_today += 1
-        
-        activity_percentage = (active_today / loyal_count * 100) if loyal_count > 0 else 0
-        avg_messages = (total_messages / loyal_count) if loyal_count > 0 else 0
-        avg_streak = (total_streak / loyal_count) if loyal_count > 0 else 0
+        snapshot = bot_module.STATS_SNAPSHOT.get()
         
         embed = discord.Embed(
             title="📊 Activity Statistics",
-            description=f"**Active Today:** {active_today} members\n"
-                       f"**Activity Rate:** {activity_percentage:.1f}%\n"
-                       f"**Avg Messages:** {avg_messages:.1f} per member\n"
-                       f"**Avg Streak:** {avg_streak:.1f} days",
+            description=f"**Active Today:** {snapshot.active_today} loyal members\n"
+                       f"**Activity Rate:** {snapshot.activity_percentage:.1f}%\n"
+                       f"**Avg Messages:** {snapshot.average_messages:.1f} per member\n"
+                       f"**Avg Streak:** {snapshot.average_streak:.1f} days\n"
+                       f"**Network DAU (all users, est.):** {snapshot.network_dau:,}\n"
+                       f"*Updated <t:{int(snapshot.computed_at.timestamp())}:R>*",
             color=BRAND_COLOR
         )
         
+        # Loyal member snapshots over the last 30 days
+        png = render_line(
+            [date[5:] for date, _ in snapshot.activity_history],
+            [count for _, count in snapshot.activity_history]
+        )
+        embed.set_image(url="attachment://activity.png")
+        
         if ctx.guild and ctx.guild.icon:
             embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
         else:
             embed.set_footer(text="Prime Network")
         
-        await ctx.send(embed=embed)
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(png), filename="activity.png"))
     
     @stats.command(name='network')
     @is_owner_check()
     async def stats_network(self, ctx):
         """
-        7-day join/leave trends with ASCII visualization
+        7-day join/leave trends as a bar chart
         
         Usage: $ su stats network
         """
-        daily_joins = bot_module.DATA.get("stats", {}).get("daily_joins", {})
-        daily_leaves = bot_module.DATA.get("stats", {}).get("daily_leaves", {})
-        
-        # Get last 7 days
-        trends_text = "**Last 7 Days:**\n```"
-        for i in range(6, -1, -1):
-            date = (datetime.now(timezone.utc) - timedelta(days=i)).strftime("%Y-%m-%d")
-            joins = daily_joins.get(date, 0)
-            leaves = daily_leaves.get(date, 0)
-            net = joins - leaves
-            
-            # Simple ASCII bar
-            bar_joins = "+" * min(joins, 20)
-            bar_leaves = "-" * min(leaves, 20)
-            
-            trends_text += f"{date}: +{joins:2d} -{leaves:2d} (net: {net:+3d})\n"
+        snapshot = bot_module.STATS_SNAPSHOT.get()
+        dates, joins, leaves = (list(column) for column in zip(*snapshot.trends))
+        total_joins, total_leaves = sum(joins), sum(leaves)
         
-        trends_text += "```"
+        png = render_trends(dates, joins, leaves)
         
         embed = discord.Embed(
             title="📈 Network Trends",
-            description=trends_text,
+            description=f"**Last 7 Days:** +{total_joins} joins, -{total_leaves} leaves "
+                       f"(net {total_joins - total_leaves:+d})\n"
+                       f"Light bars are joins, dark bars are leaves.\n"
+                       f"*Updated <t:{int(snapshot.computed_at.timestamp())}:R>*",
+            color=BRAND_COLOR
+        )
+        embed.set_image(url="attachment://trends.png")
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(png), filename="trends.png"))
+    
+    @stats.command(name='dist', aliases=['distribution', 'percentiles'])
+    @is_owner_check()
+    async def stats_distribution(self, ctx, field: Literal['streak', 'messages'] = 'streak'):
+        """
+        Percentiles and histogram of loyal members' streaks or message counts
+        
+        Usage: $ su stats dist <streak|messages>
+        """
+        analytics = bot_module.ANALYTICS
+        percentiles = analytics.percentiles(field)
+        buckets = analytics.histogram(field)
+        
+        percentile_text = "\n".join(f"**p{q}:** {value:,.0f}" for q, value in percentiles.items())
+        
+        label = "Streak (days)" if field == "streak" else "Messages"
+        embed = discord.Embed(
+            title=f"📊 {label} Distribution",
+            description=f"Across **{analytics.summary()['total_loyal']}** loyal members",
+            color=BRAND_COLOR
+        )
+        embed.add_field(name="Percentiles", value=percentile_text, inline=False)
+        
+        files = []
+        if buckets:
+            bucket_text = ", ".join(f"{low}-{high}: {count}" for low, high, count in buckets)
+            embed.add_field(name="Buckets", value=truncate_text(bucket_text), inline=False)
+            png = render_histogram(buckets)
+            embed.set_image(url="attachment://distribution.png")
+            files.append(discord.File(io.BytesIO(png), filename="distribution.png"))
+        else:
+            embed.add_field(name="Histogram", value="No loyal members yet.", inline=False)
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed, files=files)
+    
+    @stats.command(name='gateways', aliases=['breakdown'])
+    @is_owner_check()
+    async def stats_gateways(self, ctx, by: Literal['origin', 'main'] = 'origin'):
+        """
+        Per-gateway loyal members, activity and average streak
+        
+        Usage: $ su stats gateways <origin|main>
+        """
+        rows = bot_module.ANALYTICS.breakdown(by, limit=10)
+        
+        lines = []
+        for row in rows:
+            guild_data = bot_module.DATA.get("guilds", {}).get(str(row["guild_id"]), {})
+            name = guild_data.get("name") or (f"`{row['guild_id']}`" if row["guild_id"] else "*Unknown*")
+            lines.append(
+                f"**{name}** — {row['members']} members, {row['active']} active, "
+                f"avg streak {row['average_streak']:.1f}, {row['total_messages']:,} msgs"
+            )
+        
+        grouping = "origin gateway" if by == "origin" else "main server"
+        embed = discord.Embed(
+            title=f"🌐 Loyal Members by {grouping.title()}",
+            description="\n".join(lines) if lines else "No loyal members yet.",
+            color=BRAND_COLOR
+        )
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed)
+    
+    @stats.command(name='ratios', aliases=['ratio'])
+    @is_owner_check()
+    async def stats_ratios(self, ctx):
+        """
+        Active vs inactive loyal members
+        
+        Usage: $ su stats ratios
+        """
+        summary = bot_module.ANALYTICS.summary()
+        
+        embed = discord.Embed(
+            title="⚖️ Activity Ratios",
+            description=f"**Loyal Members:** {summary['total_loyal']}\n"
+                       f"**Active:** {summary['active']} ({summary['active_ratio'] * 100:.1f}%)\n"
+                       f"**Inactive:** {summary['inactive']} ({(1 - summary['active_ratio']) * 100 if summary['total_loyal'] else 0:.1f}%)\n"
+                       f"**Active Today:** {summary['active_today']} ({summary['active_today_ratio'] * 100:.1f}%)",
+            color=BRAND_COLOR
+        )
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed)
+    
+    @stats.command(name='heatmap', aliases=['hours'])
+    @is_owner_check()
+    async def stats_heatmap(self, ctx, guild_id: Optional[int] = None):
+        """
+        Messages per hour of the week (UTC) over the last 7 days
+        
+        Usage: $ su stats heatmap [guild_id]
+        """
+        grid = bot_module.HEATMAP.grid(guild_id)
+        flat = [count for row in grid for count in row]
+        total = sum(flat)
+        
+        if guild_id is not None:
+            guild_data = bot_module.DATA.get("guilds", {}).get(str(guild_id), {})
+            scope = guild_data.get("name") or f"`{guild_id}`"
+        else:
+            scope = "Network-wide"
+        
+        if not total:
+            embed = create_info_embed(
+                title="🗓️ Activity Heatmap",
+                description=f"**{scope}:** no messages recorded in the last 7 days.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        # Shade each hour relative to the busiest one
+        shades = " ░▒▓█"
+        peak = max(flat)
+        lines = ["    0     6     12    18    "]
+        for day, row in zip(WEEKDAYS, grid):
+            lines.append(f"{day} " + "".join(shades[min(4, -(-count * 4 // peak))] for count in row))
+        
+        busiest = flat.index(peak)
+        
+        # Quietest 3-hour window, wrapping around the end of the week
+        window = 3
+        quietest = min(range(len(flat)), key=lambda start: sum(flat[(start + i) % len(flat)] for i in range(window)))
+        
+        def slot_label(slot):
+            return f"{WEEKDAYS[slot // 24 % 7]} {slot % 24:02d}:00"
+        
+        embed = discord.Embed(
+            title="🗓️ Activity Heatmap",
+            description=f"**{scope}** • {total:,} messages in the last 7 days (UTC)\n"
+                       "```\n" + "\n".join(lines) + "\n```",
+            color=BRAND_COLOR
+        )
+        embed.add_field(name="Busiest Hour", value=f"{slot_label(busiest)} ({peak:,} msgs)", inline=True)
+        embed.add_field(
+            name="Quietest 3h Window",
+            value=f"{slot_label(quietest)} – {slot_label(quietest + window)}",
+            inline=True
+        )
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed)
+    
+    @stats.command(name='active', aliases=['dau', 'mau'])
+    @is_owner_check()
+    async def stats_active(self, ctx, guild_id: Optional[int] = None):
+        """
+        Estimated daily, weekly and monthly active users (all members, not just loyal)
+        
+        Usage: $ su stats active [guild_id]
+        """
+        active = bot_module.ACTIVE_USERS.summary(guild_id)
+        
+        if guild_id is not None:
+            guild_data = bot_module.DATA.get("guilds", {}).get(str(guild_id), {})
+            scope = guild_data.get("name") or f"`{guild_id}`"
+        else:
+            scope = "Network-wide"
+        
+        stickiness = (active["dau"] / active["mau"] * 100) if active["mau"] else 0
+        
+        embed = discord.Embed(
+            title="👥 Active Users",
+            description=f"**{scope}** (HyperLogLog estimates, ±3%)\n\n"
+                       f"**DAU (today):** {active['dau']:,}\n"
+                       f"**WAU (7 days):** {active['wau']:,}\n"
+                       f"**MAU (30 days):** {active['mau']:,}\n"
+                       f"**DAU/MAU:** {stickiness:.1f}%",
+            color=BRAND_COLOR
+        )
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed)
+    
+    @stats.command(name='cohorts', aliases=['retention'])
+    @is_owner_check()
+    async def stats_cohorts(self, ctx, cohorts: int = 8, weeks: int = 8):
+        """
+        Weekly opt-in cohort retention matrix
+        
+        Usage: $ su stats cohorts [cohorts] [weeks]
+        """
+        cohorts = max(1, min(cohorts, 12))
+        weeks = max(1, min(weeks, 12))
+        rows = bot_module.cohorts().matrix(cohorts, weeks)
+        
+        if not rows:
+            embed = create_info_embed(
+                title="📅 Cohort Retention",
+                description="No opt-in cohorts recorded yet.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        # Active share of each cohort N weeks after opting in
+        lines = ["Cohort     Size " + "".join(f"W{week:<4}" for week in range(weeks))]
+        for key, size, fractions in rows:
+            cells = "".join("  -  " if value is None else f"{value * 100:>3.0f}% " for value in fractions)
+            lines.append(f"{key} {size:>5} {cells}")
+        
+        embed = discord.Embed(
+            title="📅 Cohort Retention",
+            description="Active share of each weekly opt-in cohort, by weeks since opting in\n"
+                       "```\n" + "\n".join(lines) + "\n```",
             color=BRAND_COLOR
         )
         
@@ -467,6 +838,22 @@ class Sudo(commands.Cog):
             {
                 "name": "Command Count",
                 "syntax": f"{ctx.prefix}su bot cmds"
+            },
+            {
+                "name": "Runtime Metrics",
+                "syntax": f"{ctx.prefix}su bot metrics"
+            },
+            {
+                "name": "Dashboard Interval",
+                "syntax": f"{ctx.prefix}su bot dashboard <seconds>"
+            },
+            {
+                "name": "Streak Model",
+                "syntax": f"{ctx.prefix}su bot streaks <messages|days>"
+            },
+            {
+                "name": "Streak Threshold",
+                "syntax": f"{ctx.prefix}su bot threshold <messages>"
             }
         ]
         
@@ -613,6 +1000,165 @@ class Sudo(commands.Cog):
         
         await ctx.send(embed=embed)
 
+    @bot_control.command(name='metrics', aliases=['cache'])
+    @is_owner_check()
+    async def bot_metrics(self, ctx):
+        """
+        Display runtime cache metrics
+        
+        Usage: $ su bot metrics
+        """
+        cache = bot_module.USER_CACHE.stats()
+        dashboards = bot_module.DASHBOARD_SCHEDULER.stats()
+        roles = bot_module.ROLE_QUEUE.stats()
+        outbox = bot_module.OUTBOX.stats()
+        analytics = bot_module.ANALYTICS.stats()
+        
+        embed = discord.Embed(
+            title="📟 Runtime Metrics",
+            color=BRAND_COLOR
+        )
+        embed.add_field(
+            name="User Resolver",
+            value=f"**Hit Rate:** {cache['hit_rate']:.1f}% of {cache['lookups']} lookups\n"
+                  f"**Gateway Hits:** {cache['gateway_hits']}\n"
+                  f"**LRU Hits:** {cache['cache_hits']}\n"
+                  f"**Coalesced:** {cache['coalesced']}\n"
+                  f"**HTTP Fetches:** {cache['misses']} ({cache['failures']} failed)\n"
+                  f"**Cached:** {cache['size']}/{cache['max_size']} (TTL {int(cache['ttl'])}s)",
+            inline=False
+        )
+        embed.add_field(
+            name="Dashboards",
+            value=f"**Pending Edits:** {dashboards['pending']}\n"
+                  f"**Edits:** {dashboards['edits']}\n"
+                  f"**Coalesced:** {dashboards['coalesced']}\n"
+                  f"**Interval:** {int(dashboards['interval'])}s",
+            inline=False
+        )
+        embed.add_field(
+            name="Role Queue",
+            value=f"**Pending:** {roles['pending']}\n"
+                  f"**Applied:** {roles['applied']}\n"
+                  f"**Skipped (no-op):** {roles['skipped']}\n"
+                  f"**Deduplicated:** {roles['deduplicated']}\n"
+                  f"**Retried:** {roles['retried']}\n"
+                  f"**Failed:** {roles['failed']}",
+            inline=False
+        )
+        embed.add_field(
+            name="Outbox",
+            value=f"**Pending:** {outbox['pending']}/{outbox['maxsize']} (drops {outbox['drop_policy']})\n"
+                  f"**Sent:** {outbox['sent']}\n"
+                  f"**Failed:** {outbox['failed']}\n"
+                  f"**Dropped:** {outbox['dropped']}",
+            inline=False
+        )
+        embed.add_field(
+            name="Analytics",
+            value=f"**Users Indexed:** {analytics['users']}\n"
+                  f"**Array Builds:** {analytics['builds']}\n"
+                  f"**Cached Answers:** {analytics['hits']}\n"
+                  f"**Charts Cached:** {cache_info()['size']}/{cache_info()['max_size']}",
+            inline=False
+        )
+        
+        snapshot = bot_module.STATS_SNAPSHOT.current
+        embed.add_field(
+            name="Stats Snapshot",
+            value=(f"**Age:** {snapshot.age():.0f}s\n" if snapshot else "**Age:** not computed yet\n")
+                  + f"**Refreshes:** {bot_module.STATS_SNAPSHOT.refreshes}\n"
+                  f"**Last Build:** {bot_module.STATS_SNAPSHOT.last_duration * 1000:.1f}ms",
+            inline=False
+        )
+        
+        if ctx.guild and ctx.guild.icon:
+            embed.set_footer(text=f"{ctx.guild.name} • Prime Network", icon_url=ctx.guild.icon.url)
+        else:
+            embed.set_footer(text="Prime Network")
+        
+        await ctx.send(embed=embed)
+
+    @bot_control.command(name='dashboard', aliases=['dash'])
+    @is_owner_check()
+    async def bot_dashboard(self, ctx, seconds: int):
+        """
+        Set minimum seconds between edits of one leaderboard dashboard
+        
+        Usage: $ su bot dashboard 300
+        """
+        if seconds < 30 or seconds > 86400:
+            embed = create_error_embed(
+                title="Invalid Interval",
+                description="Interval must be between 30 and 86400 seconds.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        bot_module.DATA["network_config"]["dashboard_interval"] = seconds
+        save_data()
+        
+        embed = create_success_embed(
+            title="Dashboard Interval Updated",
+            description=f"Each leaderboard dashboard is now edited at most once every **{seconds}s**.",
+            guild=ctx.guild
+        )
+        await ctx.send(embed=embed)
+
+    @bot_control.command(name='streaks', aliases=['streakmodel'])
+    @is_owner_check()
+    async def bot_streaks(self, ctx, model: Literal['messages', 'days']):
+        """
+        Choose the streak model leaderboards rank by
+        
+        Usage: $ su bot streaks <messages|days>
+        """
+        bot_module.DATA["network_config"]["streak_model"] = model
+        save_data()
+        bot_module.DASHBOARD_SCHEDULER.refresh_all()
+        
+        description = (
+            f"Leaderboards now rank by **1 streak day per {bot_module.get_streak_threshold()} messages**."
+            if model == "messages" else
+            "Leaderboards now rank by **consecutive days with at least one message**."
+        )
+        embed = create_success_embed(
+            title="Streak Model Updated",
+            description=description,
+            guild=ctx.guild
+        )
+        await ctx.send(embed=embed)
+
+    @bot_control.command(name='threshold')
+    @is_owner_check()
+    async def bot_threshold(self, ctx, messages: int):
+        """
+        Set the network-wide messages per streak day and rebuild all streaks
+        
+        Usage: $ su bot threshold 100
+        """
+        if messages < 1 or messages > 10000:
+            embed = create_error_embed(
+                title="Invalid Threshold",
+                description="Threshold must be between 1 and 10000 messages.",
+                guild=ctx.guild
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        bot_module.DATA["network_config"]["streak_threshold"] = messages
+        changed = await bot_module.recompute_streaks()
+        
+        embed = create_success_embed(
+            title="Streak Threshold Updated",
+            description=f"Network default is now **1 streak day per {messages} messages** "
+                       f"(gateways with their own threshold keep it).\n\n"
+                       f"**Streaks Rebuilt:** {changed:,} changed",
+            guild=ctx.guild
+        )
+        await ctx.send(embed=embed)
+
 # ==================== COG SETUP ====================
 
 async def setup(bot):
@@ -0,0 +1,116 @@
+"""Weekly opt-in cohort retention tracking for the Prime Network bot"""
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from timeseries import week_key
+
+MAX_WEEKS = 52  # Retention columns kept per cohort
+
+
+def week_start(key: str) -> date:
+    """Monday of an ISO week label"""
+    year, week = key.split("-W")
+    return date.fromisocalendar(int(year), int(week), 1)
+
+def cohort_of(opt_in_date: Optional[str]) -> Optional[str]:
+    """Cohort (ISO week) for a YYYY-MM-DD opt-in date"""
+    if not opt_in_date:
+        return None
+    try:
+        return week_key(date.fromisoformat(opt_in_date))
+    except ValueError:
+        return None
+
+
+class CohortTable:
+    """
+    Weekly opt-in cohorts maintained from loyalty events
+
+    Wraps (and mutates in place) a persisted dict of the form
+    {"YYYY-Www": {"size": n, "active": n, "retained": [n or null, ...]}}.
+    size counts opt-ins, active is updated on every leave, inactivity
+    and reactivation, and snapshot() copies active into the column for
+    the cohort's current age, so the matrix never needs a user scan.
+    """
+
+    def __init__(self, store: Dict[str, Any]):
+        self.store = store
+
+    def _cohort(self, key: str) -> Dict[str, Any]:
+        cohort = self.store.get(key)
+        if cohort is None:
+            cohort = self.store[key] = {"size": 0, "active": 0, "retained": []}
+        return cohort
+
+    def _adjust(self, opt_in_date: Optional[str], active: int, size: int = 0):
+        key = cohort_of(opt_in_date)
+        if key is None:
+            return
+        cohort = self._cohort(key)
+        cohort["size"] += size
+        cohort["active"] = max(0, cohort["active"] + active)
+
+    # ==================== EVENTS ====================
+
+    def joined(self, opt_in_date: str):
+        """A user opted in"""
+        self._adjust(opt_in_date, 1, size=1)
+
+    def left(self, opt_in_date: Optional[str], was_active: bool):
+        """A loyal user left the network"""
+        if was_active:
+            self._adjust(opt_in_date, -1)
+
+    def deactivated(self, opt_in_date: Optional[str]):
+        """A loyal user was marked inactive"""
+        self._adjust(opt_in_date, -1)
+
+    def reactivated(self, opt_in_date: Optional[str]):
+        """An inactive loyal user became active again"""
+        self._adjust(opt_in_date, 1)
+
+    # ==================== SNAPSHOTS ====================
+
+    def snapshot(self, today: Optional[date] = None):
+        """Record each cohort's active count in its current week-since-opt-in column"""
+        today = today or datetime.now(timezone.utc).date()
+        for key, cohort in self.store.items():
+            age = (today - week_start(key)).days // 7
+            if not 0 <= age < MAX_WEEKS:
+                continue
+            retained = cohort["retained"]
+            if len(retained) <= age:
+                # Weeks missed while offline carry the last value; weeks before
+                # tracking began (seeded cohorts) stay unknown
+                retained.extend([retained[-1] if retained else None] * (age + 1 - len(retained)))
+            retained[age] = cohort["active"]
+
+    def matrix(self, cohorts: int = 8, weeks: int = 8) -> List[Tuple[str, int, List[Optional[float]]]]:
+        """
+        Retention matrix for the most recent cohorts
+
+        Returns:
+            List of (cohort, size, [retention fraction per week or None])
+        """
+        self.snapshot()
+        rows = []
+        for key in sorted(self.store)[-cohorts:]:
+            cohort = self.store[key]
+            size = cohort["size"]
+            retained = cohort["retained"][:weeks]
+            fractions = [None if value is None else value / size if size else 0.0 for value in retained]
+            rows.append((key, size, fractions + [None] * (weeks - len(fractions))))
+        return rows
+
+
+def get_cohorts(stats: Dict[str, Any]) -> CohortTable:
+    """Wrap (creating if needed) the cohort table in a stats table"""
+    return CohortTable(stats.setdefault("cohorts", {}))
+
+def seed_cohorts(stats: Dict[str, Any], users: Iterable[Dict[str, Any]]):
+    """One-time build from current loyal users (no history before this point)"""
+    table = get_cohorts(stats)
+    for user_data in users:
+        if user_data.get("is_loyal"):
+            table._adjust(user_data.get("opt_in_date"), 0 if user_data.get("is_inactive") else 1, size=1)
+    table.snapshot()
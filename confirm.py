@@ -0,0 +1,84 @@
+"""Confirmation prompt dispatcher for the Prime Network bot"""
+import asyncio
+from typing import Dict, Tuple, Optional, Sequence
+
+CONFIRM = "✅"
+CANCEL = "❌"
+
+
+class ConfirmationRegistry:
+    """
+    Central registry of open confirmation prompts
+
+    Reaction prompts are keyed by message ID and typed prompts by
+    (channel ID, author ID), so each incoming event resolves its prompt
+    with one dict lookup instead of running every pending wait_for check.
+    """
+
+    def __init__(self):
+        self._reactions: Dict[int, Tuple[int, Sequence[str], asyncio.Future]] = {}
+        self._messages: Dict[Tuple[int, int], Tuple[str, asyncio.Future]] = {}
+
+    async def _wait(self, future: asyncio.Future, timeout: float):
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def wait_reaction(self, message_id: int, author_id: int,
+                            choices: Sequence[str] = (CONFIRM, CANCEL),
+                            timeout: float = 30.0) -> Optional[str]:
+        """
+        Wait for the author to react to a prompt message
+
+        Returns:
+            The chosen emoji, or None on timeout
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._reactions[message_id] = (author_id, choices, future)
+        try:
+            return await self._wait(future, timeout)
+        finally:
+            self._reactions.pop(message_id, None)
+
+    async def wait_message(self, channel_id: int, author_id: int,
+                           expected: str, timeout: float = 30.0) -> bool:
+        """
+        Wait for the author to type an exact confirmation phrase
+
+        Returns:
+            bool: True if confirmed, False on timeout
+        """
+        key = (channel_id, author_id)
+        future = asyncio.get_running_loop().create_future()
+        self._messages[key] = (expected, future)
+        try:
+            return bool(await self._wait(future, timeout))
+        finally:
+            self._messages.pop(key, None)
+
+    def dispatch_reaction(self, message_id: int, user_id: int, emoji: str) -> bool:
+        """Resolve a reaction prompt; returns True if the event was consumed"""
+        entry = self._reactions.get(message_id)
+        if not entry:
+            return False
+        author_id, choices, future = entry
+        if user_id != author_id or emoji not in choices or future.done():
+            return False
+        future.set_result(emoji)
+        return True
+
+    def dispatch_message(self, channel_id: int, author_id: int, content: str) -> bool:
+        """Resolve a typed prompt; returns True if the event was consumed"""
+        entry = self._messages.get((channel_id, author_id))
+        if not entry:
+            return False
+        expected, future = entry
+        if content != expected or future.done():
+            return False
+        future.set_result(True)
+        return True
+
+    def pending(self) -> int:
+        """Number of open prompts"""
+        return len(self._reactions) + len(self._messages)
@@ -0,0 +1,160 @@
+"""Event-driven leaderboard dashboard scheduling for the Prime Network bot"""
+import asyncio
+import time
+from typing import Callable, Awaitable, Dict, List, Any, Optional, Tuple
+
+RankKey = Tuple[int, int]
+
+
+class DashboardScheduler:
+    """
+    Schedule leaderboard edits only when a guild's visible top-K changes
+
+    Edits are debounced and coalesced per guild: while an edit is pending
+    further changes fold into it, and a guild is never edited more than
+    once per interval.
+    """
+
+    def __init__(
+        self,
+        rank: Callable[[], List[Dict[str, Any]]],
+        targets: Callable[[], Dict[int, int]],
+        edit: Callable[[int], Awaitable[bool]],
+        interval: Callable[[], float]
+    ):
+        """
+        Args:
+            rank: Returns the current network top-K (entries with user_id, streak, messages)
+            targets: Returns {guild_id: visible_size} for guilds with a dashboard
+            edit: Coroutine that writes one guild's dashboard
+            interval: Returns the minimum seconds between edits of one guild
+        """
+        self._rank = rank
+        self._targets = targets
+        self._edit = edit
+        self._interval = interval
+
+        self.top: List[Dict[str, Any]] = []
+        self._ranked = False
+        self._visible: Dict[int, Tuple[Tuple[int, int, int], ...]] = {}
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._last_edit: Dict[int, float] = {}
+
+        # Metrics
+        self.edits = 0
+        self.coalesced = 0
+
+    # ==================== RANKING ====================
+
+    def _key(self, entry: Dict[str, Any]) -> RankKey:
+        return (entry.get("streak", 0), entry.get("messages", 0))
+
+    def _signature(self, size: int) -> Tuple[Tuple[int, int, int], ...]:
+        """What a dashboard of `size` rows shows: who, and their streak and messages"""
+        return tuple((entry["user_id"], entry["streak"], entry.get("messages", 0)) for entry in self.top[:size])
+
+    def rerank(self) -> List[Dict[str, Any]]:
+        """Recompute the network top-K"""
+        self.top = self._rank()
+        self._ranked = True
+        return self.top
+
+    def get_top(self) -> List[Dict[str, Any]]:
+        """Get the cached ranking, computing it on first use"""
+        if not self._ranked:
+            self.rerank()
+        return self.top
+
+    def _could_affect_top(self, user_id: int, key: Optional[RankKey]) -> bool:
+        """Cheap check whether a user's change can move the cached top-K"""
+        if not self._ranked:
+            return True
+        if any(entry["user_id"] == user_id for entry in self.top):
+            return True
+        if key is None:
+            return False
+        targets = self._targets()
+        size = max(targets.values(), default=0)
+        if len(self.top) < size:
+            return True
+        return bool(self.top) and key > self._key(self.top[-1])
+
+    def ranking_changed(self, user_id: int, key: Optional[RankKey] = None):
+        """
+        Notify that a user's rank inputs changed
+
+        Args:
+            user_id: User whose streak or loyalty status changed
+            key: New (streak, messages) if the user is still ranked, else None
+        """
+        if not self._could_affect_top(user_id, key):
+            return
+        self.rerank()
+        self._schedule_changed()
+
+    def _schedule_changed(self):
+        """Schedule edits for guilds whose visible slice of the ranking changed"""
+        for guild_id, size in self._targets().items():
+            signature = self._signature(size)
+            if self._visible.get(guild_id) != signature:
+                self._visible[guild_id] = signature
+                self.schedule(guild_id)
+
+    # ==================== EDIT SCHEDULING ====================
+
+    def schedule(self, guild_id: int) -> float:
+        """
+        Schedule a debounced edit for one guild
+
+        Returns:
+            float: Seconds until the edit runs
+        """
+        pending = self._pending.get(guild_id)
+        if pending and not pending.done():
+            self.coalesced += 1
+            return max(0.0, self._last_edit.get(guild_id, 0.0) + self._interval() - time.monotonic())
+
+        delay = max(0.0, self._last_edit.get(guild_id, 0.0) + self._interval() - time.monotonic())
+        self._pending[guild_id] = asyncio.create_task(self._run(guild_id, delay))
+        return delay
+
+    async def _run(self, guild_id: int, delay: float):
+        """Wait out the debounce window, then edit"""
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            # forget() may have cancelled this task and a newer one taken its slot
+            if self._pending.get(guild_id) is asyncio.current_task():
+                del self._pending[guild_id]
+
+        self._last_edit[guild_id] = time.monotonic()
+        try:
+            if await self._edit(guild_id):
+                self.edits += 1
+        except Exception as e:
+            print(f"Dashboard edit failed for guild {guild_id}: {e}")
+
+    def refresh_all(self):
+        """Rerank and schedule every dashboard (unchanged embeds are skipped by the editor)"""
+        self.rerank()
+        for guild_id, size in self._targets().items():
+            self._visible[guild_id] = self._signature(size)
+            self.schedule(guild_id)
+
+    def forget(self, guild_id: int):
+        """Drop all scheduling state for a guild"""
+        task = self._pending.pop(guild_id, None)
+        if task:
+            task.cancel()
+        self._visible.pop(guild_id, None)
+        self._last_edit.pop(guild_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduler metrics"""
+        return {
+            "pending": sum(1 for task in self._pending.values() if not task.done()),
+            "edits": self.edits,
+            "coalesced": self.coalesced,
+            "interval": self._interval()
+        }
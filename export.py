@@ -0,0 +1,291 @@
+"""Streaming data export (gzip JSONL/CSV) for the Prime Network bot"""
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+
+from timeseries import SERIES_MODES, get_series
+
+EXPORT_DIR = "exports"
+CHUNK_SIZE = 500  # Records serialized per event-loop slice
+FORMATS = ("jsonl", "csv")
+EXTRA_COLUMN = "_extra"  # CSV: JSON of fields that first appeared mid-export
+TABLES = ("users", "guilds", "stats")
+
+# gzip compression and file writes happen here, off the event loop
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
+
+Record = Dict[str, Any]
+Predicate = Callable[[Record], bool]
+
+
+# ==================== FILTER EXPRESSIONS ====================
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|>=|<=|>|<|~)
+      | (?P<paren>[()])
+      | (?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+    )""", re.VERBOSE)
+
+_COMPARE = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    "~": lambda a, b: a is not None and str(b).lower() in str(a).lower()
+}
+_KEYWORDS = {"true": True, "false": False, "null": None, "none": None}
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected input at position {position}: `{expression[position:position + 10]}`")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+def _field(record: Record, path: str) -> Any:
+    """Look up a (dotted) field, e.g. gate_snapshot.123"""
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def parse_filter(expression: Optional[str]) -> Predicate:
+    """
+    Compile a filter expression into a record predicate
+
+    Grammar: comparisons `field OP value` (OP is ==, !=, >, >=, <, <= or
+    ~ for case-insensitive contains), bare `field` for truthiness, joined
+    with and/or/not and parentheses. Values are numbers, quoted strings,
+    true/false or null.
+
+    Example: is_loyal and streak >= 10 and not (main_server_name ~ "test")
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    if not expression or not expression.strip():
+        return lambda record: True
+
+    tokens = _tokenize(expression)
+    position = 0
+
+    def peek() -> Tuple[Optional[str], Optional[str]]:
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def at_keyword(word: str) -> bool:
+        kind, text = peek()
+        return kind == "word" and text.lower() == word
+
+    def take() -> Tuple[str, str]:
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError("Unexpected end of expression")
+        position += 1
+        return tokens[position - 1]
+
+    def literal() -> Any:
+        kind, text = take()
+        if kind == "number":
+            return float(text) if "." in text else int(text)
+        if kind == "string":
+            return re.sub(r"\\(.)", r"\1", text[1:-1])
+        if kind == "word" and text.lower() in _KEYWORDS:
+            return _KEYWORDS[text.lower()]
+        raise ValueError(f"Expected a value, got `{text}`")
+
+    def factor() -> Predicate:
+        kind, text = take()
+        if kind == "word" and text.lower() == "not":
+            inner = factor()
+            return lambda record: not inner(record)
+        if kind == "paren" and text == "(":
+            inner = disjunction()
+            if take() != ("paren", ")"):
+                raise ValueError("Missing `)`")
+            return inner
+        if kind != "word" or text.lower() in ("and", "or"):
+            raise ValueError(f"Expected a field name, got `{text}`")
+
+        path = text
+        if peek()[0] == "op":
+            compare = _COMPARE[take()[1]]
+            value = literal()
+
+            def predicate(record):
+                try:
+                    return compare(_field(record, path), value)
+                except TypeError:
+                    return False
+            return predicate
+        return lambda record: bool(_field(record, path))
+
+    def conjunction() -> Predicate:
+        parts = [factor()]
+        while at_keyword("and"):
+            take()
+            parts.append(factor())
+        return parts[0] if len(parts) == 1 else lambda record: all(part(record) for part in parts)
+
+    def disjunction() -> Predicate:
+        parts = [conjunction()]
+        while at_keyword("or"):
+            take()
+            parts.append(conjunction())
+        return parts[0] if len(parts) == 1 else lambda record: any(part(record) for part in parts)
+
+    result = disjunction()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected `{tokens[position][1]}`")
+    return result
+
+
+# ==================== RECORD SOURCES ====================
+
+def iter_records(data: Dict[str, Any], table: str) -> Iterator[Record]:
+    """
+    Yield flat records for an export table
+
+    Keys are captured up front; records deleted mid-export are skipped.
+    """
+    if table == "users":
+        users = data.get("global_users", {})
+        for user_id_str in list(users):
+            user_data = users.get(user_id_str)
+            if user_data is not None:
+                yield {"user_id": int(user_id_str), **user_data}
+    elif table == "guilds":
+        guilds = data.get("guilds", {})
+        for guild_id_str in list(guilds):
+            guild_data = guilds.get(guild_id_str)
+            if guild_data is not None:
+                yield {"guild_id": int(guild_id_str), **guild_data}
+    elif table == "stats":
+        stats = data.setdefault("stats", {})
+        for name in SERIES_MODES:
+            series = get_series(stats, name)
+            first_day, values = series.last(len(series.store["days"]))
+            for offset, value in enumerate(values):
+                day = (first_day + timedelta(days=offset)).isoformat()
+                yield {"series": name, "granularity": "day", "period": day, "value": value}
+            for granularity, buckets in (("week", series.weekly()), ("month", series.monthly())):
+                for period in sorted(buckets):
+                    yield {"series": name, "granularity": granularity, "period": period, "value": buckets[period]}
+    else:
+        raise ValueError(f"Unknown table `{table}`")
+
+
+# ==================== WRITER ====================
+
+def _csv_value(value: Any) -> Any:
+    """Scalars as-is, nested values as compact JSON"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+async def _columns(data: Dict[str, Any], table: str) -> List[str]:
+    """
+    Union of record keys across a table, in first-seen order
+
+    Records don't share one schema (fields are added lazily), so the CSV
+    header can't come from any single record. Only keys are read; the loop
+    yields every CHUNK_SIZE records. A trailing EXTRA_COLUMN catches fields
+    added to a record after this pass, so nothing is dropped.
+    """
+    columns: Dict[str, None] = {}
+    for count, record in enumerate(iter_records(data, table), 1):
+        columns.update(dict.fromkeys(record))
+        if count % CHUNK_SIZE == 0:
+            await asyncio.sleep(0)
+    columns.pop(EXTRA_COLUMN, None)
+    return list(columns) + [EXTRA_COLUMN]
+
+def _serialize(records: List[Record], fmt: str, columns: Optional[List[str]]) -> str:
+    if fmt == "jsonl":
+        return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    known = set(columns)
+    for record in records:
+        row = {key: _csv_value(value) for key, value in record.items() if key in known}
+        extra = {key: value for key, value in record.items() if key not in known}
+        row[EXTRA_COLUMN] = json.dumps(extra, separators=(",", ":")) if extra else None
+        writer.writerow(row)
+    return buffer.getvalue()
+
+async def export_table(data: Dict[str, Any], table: str, fmt: str = "jsonl",
+                       expression: Optional[str] = None,
+                       directory: str = EXPORT_DIR) -> Dict[str, Any]:
+    """
+    Stream a table to a gzip-compressed JSONL or CSV file
+
+    Records are filtered and serialized on the event loop CHUNK_SIZE at a
+    time (DATA is only ever touched there); each chunk's text is handed to
+    the thread pool for compression and writing, so at most one chunk is
+    held in memory. The loop yields every CHUNK_SIZE records scanned.
+
+    Returns:
+        Dict with path, rows and bytes written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of {', '.join(FORMATS)}")
+    predicate = parse_filter(expression)
+
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{table}-{stamp}.{fmt}.gz")
+
+    loop = asyncio.get_running_loop()
+    handle = await loop.run_in_executor(_executor, lambda: gzip.open(path, "wt", encoding="utf-8", newline=""))
+    rows = 0
+    columns = await _columns(data, table) if fmt == "csv" else None
+    header_written = False
+
+    async def write(chunk: List[Record]):
+        nonlocal rows, header_written
+        text = _serialize(chunk, fmt, columns)
+        if fmt == "csv" and not header_written:
+            header_written = True
+            header = io.StringIO()
+            csv.writer(header).writerow(columns)
+            text = header.getvalue() + text
+        rows += len(chunk)
+        await loop.run_in_executor(_executor, handle.write, text)
+
+    try:
+        chunk: List[Record] = []
+        for scanned, record in enumerate(iter_records(data, table), 1):
+            if predicate(record):
+                chunk.append(record)
+                if len(chunk) >= CHUNK_SIZE:
+                    await write(chunk)
+                    chunk = []
+            # Yield on records scanned, not matched, so a selective filter
+            # can't hold the loop for a whole table
+            if scanned % CHUNK_SIZE == 0:
+                await asyncio.sleep(0)
+        if chunk:
+            await write(chunk)
+    finally:
+        await loop.run_in_executor(_executor, handle.close)
+
+    return {"path": path, "rows": rows, "bytes": os.path.getsize(path)}
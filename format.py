@@ -2,6 +2,8 @@ import discord
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
+from streaks import day_streak, active_days, longest_streak
+
 # ==================== COLOR SCHEME ====================
 
 BRAND_COLOR = 0x8acaf5  # Prime Network blue - ONLY COLOR USED
@@ -357,7 +359,8 @@ def create_leaderboard_embed(
 def create_user_stats_embed(
     user: discord.Member,
     user_data: Dict[str, Any],
-    guild: discord.Guild
+    guild: discord.Guild,
+    streak_threshold: int = 100
 ) -> discord.Embed:
     """
     Create a user statistics embed
@@ -366,6 +369,7 @@ def create_user_stats_embed(
         user: Discord member object
         user_data: User's loyalty data
         guild: Guild object
+        streak_threshold: Messages per streak day for this user
     
     Returns:
         discord.Embed: User stats embed
@@ -402,6 +406,19 @@ def create_user_stats_embed(
         inline=True
     )
     
+    # Daily activity bitmap
+    embed.add_field(
+        name="Day Streak",
+        value=f"{day_streak(user_data)} days (best {longest_streak(user_data)})",
+        inline=True
+    )
+    
+    embed.add_field(
+        name="Active Days",
+        value=f"{active_days(user_data, 30)}/30",
+        inline=True
+    )
+    
     # Messages
     embed.add_field(
         name="Total Messages",
@@ -411,7 +428,7 @@ def create_user_stats_embed(
     
     # Progress to next streak
     messages_since = user_data.get('messages_since_last_streak', 0)
-    progress = f"{messages_since}/100"
+    progress = f"{messages_since}/{streak_threshold}"
     embed.add_field(
         name="Next Streak Progress",
         value=progress,
@@ -468,7 +485,8 @@ def create_network_stats_embed(
     active_loyal: int,
     blacklisted: int,
     trusted_count: int,
-    guild: Optional[discord.Guild] = None
+    guild: Optional[discord.Guild] = None,
+    updated_at: Optional[datetime] = None
 ) -> discord.Embed:
     """
     Create network overview statistics embed
@@ -481,13 +499,18 @@ def create_network_stats_embed(
         blacklisted: Blacklisted users count
         trusted_count: Trusted admins count
         guild: Guild object for footer
+        updated_at: When the numbers were computed
     
     Returns:
         discord.Embed: Network stats embed
     """
+    description = "Network-wide statistics"
+    if updated_at:
+        description += f" • updated <t:{int(updated_at.timestamp())}:R>"
+    
     embed = discord.Embed(
         title="🌐 Prime Network Overview",
-        description="Network-wide statistics",
+        description=description,
         color=BRAND_COLOR
     )
     
@@ -538,7 +561,8 @@ def create_network_stats_embed(
 
 def create_guild_config_embed(
     guild: discord.Guild,
-    guild_data: Dict[str, Any]
+    guild_data: Dict[str, Any],
+    streak_threshold: int = 100
 ) -> discord.Embed:
     """
     Create guild configuration display embed
@@ -546,6 +570,7 @@ def create_guild_config_embed(
     Args:
         guild: Guild object
         guild_data: Guild's configuration data
+        streak_threshold: Effective messages per streak day for this guild
     
     Returns:
         discord.Embed: Guild config embed
@@ -637,6 +662,13 @@ def create_guild_config_embed(
         inline=True
     )
     
+    # Streak threshold (override or network default)
+    embed.add_field(
+        name="Streak Threshold",
+        value=f"{streak_threshold} msgs/day" + ("" if guild_data.get('streak_threshold') else " (default)"),
+        inline=True
+    )
+    
     if guild.icon:
         embed.set_thumbnail(url=guild.icon.url)
         embed.set_footer(text=f"{guild.name} • Prime Network", icon_url=guild.icon.url)
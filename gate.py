@@ -0,0 +1,270 @@
+"""Gate control execution (lock/unlock/nuke) for the Prime Network bot"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Awaitable, Dict, Any, List, Optional, Iterable
+
+import discord
+
+GATE_CONCURRENCY = 5  # Channel edits in flight at once
+PROGRESS_INTERVAL = 2.0  # Min seconds between progress callbacks
+
+ProgressCallback = Callable[[int, int, int], Awaitable[None]]
+
+
+async def run_batch(items: Iterable[Any], worker: Callable[[Any], Awaitable[None]],
+                    progress: Optional[ProgressCallback] = None,
+                    concurrency: int = GATE_CONCURRENCY) -> Dict[str, List[Any]]:
+    """
+    Run a worker over items concurrently, reporting progress
+
+    discord.py waits out per-route 429s itself; the semaphore keeps us from
+    queueing more requests than the route buckets can drain.
+
+    Args:
+        items: Items to process
+        worker: Coroutine function raising on failure
+        progress: Called with (done, failed, total), throttled
+        concurrency: Max workers in flight
+
+    Returns:
+        Dict with "done" and "failed" item lists
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(concurrency)
+    result: Dict[str, List[Any]] = {"done": [], "failed": []}
+    last_report = 0.0
+
+    async def run_one(item):
+        nonlocal last_report
+        async with semaphore:
+            try:
+                await worker(item)
+                result["done"].append(item)
+            except Exception as e:
+                result["failed"].append(item)
+                print(f"Gate operation failed for {item}: {e}")
+
+        now = time.monotonic()
+        if progress and now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            await report()
+
+    async def report():
+        # A failing progress sink must not abort the batch
+        try:
+            await progress(len(result["done"]), len(result["failed"]), len(items))
+        except Exception as e:
+            print(f"Gate progress report failed: {e}")
+
+    await asyncio.gather(*(run_one(item) for item in items))
+    if progress:
+        await report()
+    return result
+
+
+# ==================== LOCK / UNLOCK ====================
+
+def lockable_channels(guild: discord.Guild) -> List[discord.abc.GuildChannel]:
+    """Channels the gate lock applies to"""
+    return [
+        channel for channel in guild.channels
+        if isinstance(channel, (discord.TextChannel, discord.VoiceChannel))
+    ]
+
+def snapshot_overwrite(channel: discord.abc.GuildChannel, target: discord.Role) -> Optional[List[int]]:
+    """Serialize a channel's overwrite for a role as [allow, deny] (None if unset)"""
+    if target not in channel.overwrites:
+        return None
+    allow, deny = channel.overwrites[target].pair()
+    return [allow.value, deny.value]
+
+def restore_overwrite(pair: Optional[List[int]]) -> Optional[discord.PermissionOverwrite]:
+    """Rebuild an overwrite from its [allow, deny] snapshot"""
+    if pair is None:
+        return None
+    return discord.PermissionOverwrite.from_pair(discord.Permissions(pair[0]), discord.Permissions(pair[1]))
+
+async def lock_guild(guild: discord.Guild, guild_data: Dict[str, Any], save: Callable[[], None],
+                     reason: str, progress: Optional[ProgressCallback] = None) -> Dict[str, List[Any]]:
+    """
+    Deny @everyone send_messages in every text/voice channel
+
+    Each channel's prior @everyone overwrite is written to
+    guild_data["gate_snapshot"] and saved before anything is changed.
+    Channels already in the snapshot (a repeated lock) keep their
+    original entry so unlock still restores the pre-lock state.
+    """
+    everyone = guild.default_role
+    channels = lockable_channels(guild)
+
+    snapshot = guild_data.setdefault("gate_snapshot", {})
+    for channel in channels:
+        if str(channel.id) not in snapshot:
+            snapshot[str(channel.id)] = snapshot_overwrite(channel, everyone)
+    save()
+
+    async def lock_one(channel):
+        overwrite = channel.overwrites_for(everyone)
+        overwrite.send_messages = False
+        await channel.set_permissions(everyone, overwrite=overwrite, reason=reason)
+
+    return await run_batch(channels, lock_one, progress)
+
+async def unlock_guild(guild: discord.Guild, guild_data: Dict[str, Any], save: Callable[[], None],
+                       reason: str, progress: Optional[ProgressCallback] = None) -> Dict[str, List[Any]]:
+    """
+    Restore every snapshotted @everyone overwrite in parallel
+
+    Restored (or since-deleted) channels are dropped from the snapshot;
+    failed ones stay so the unlock can be retried.
+    """
+    everyone = guild.default_role
+    snapshot = guild_data.get("gate_snapshot", {})
+
+    channels = []
+    for channel_id_str in list(snapshot):
+        channel = guild.get_channel(int(channel_id_str))
+        if channel:
+            channels.append(channel)
+        else:
+            del snapshot[channel_id_str]
+
+    async def unlock_one(channel):
+        overwrite = restore_overwrite(snapshot.get(str(channel.id)))
+        await channel.set_permissions(everyone, overwrite=overwrite, reason=reason)
+
+    result = await run_batch(channels, unlock_one, progress)
+
+    for channel in result["done"]:
+        snapshot.pop(str(channel.id), None)
+    if not snapshot:
+        guild_data.pop("gate_snapshot", None)
+    save()
+    return result
+
+
+# ==================== NUKE ====================
+
+NUKE_STAGES = ("channels", "roles", "command_channel")  # Run in this order
+NUKE_CHANNEL_NAME = "hub-invite"
+
+Announce = Callable[[discord.TextChannel], Awaitable[None]]
+
+
+def plan_nuke(guild: discord.Guild, author_id: int, reason: str,
+              command_channel_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build the full deletion plan for a guild
+
+    Channels go first (categories after their children), then roles from
+    the top down, then the channel the command was run in so progress
+    stays visible until the end.
+
+    Returns:
+        Job dict to store as guild_data["nuke_job"]
+    """
+    channels = sorted(
+        (channel for channel in guild.channels if channel.id != command_channel_id),
+        key=lambda channel: isinstance(channel, discord.CategoryChannel)
+    )
+    roles = sorted(
+        (role for role in guild.roles if role != guild.default_role and not role.managed),
+        key=lambda role: role.position,
+        reverse=True
+    )
+
+    return {
+        "author_id": author_id,
+        "reason": reason,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "pending": {
+            "channels": [channel.id for channel in channels],
+            "roles": [role.id for role in roles],
+            "command_channel": [command_channel_id] if guild.get_channel(command_channel_id or 0) else []
+        },
+        "deleted": 0,
+        "failed": [],
+        "hub_channel_id": None,
+        "announced": False
+    }
+
+async def run_nuke(guild: discord.Guild, job: Dict[str, Any], save: Callable[[], None],
+                   announce: Announce, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Execute (or resume) a nuke job
+
+    Each stage deletes concurrently; the job is checkpointed with every
+    progress report and after every stage, so a restart resumes from the
+    remaining IDs. Objects that are already gone count as deleted.
+
+    Args:
+        guild: Guild being nuked
+        job: Plan from plan_nuke(), mutated in place as work completes
+        save: Persists the job
+        announce: Posts the hub invite into the final channel
+        progress: Called with (done, failed, total) across all stages
+
+    Returns:
+        The finished job
+    """
+    total = job["deleted"] + len(job["failed"]) + sum(len(ids) for ids in job["pending"].values())
+
+    for stage in NUKE_STAGES:
+        ids = job["pending"].get(stage, [])
+        if not ids:
+            continue
+
+        lookup = guild.get_role if stage == "roles" else guild.get_channel
+        targets = []
+        for target_id in ids:
+            target = lookup(target_id)
+            if target:
+                targets.append(target)
+            else:
+                job["deleted"] += 1
+        remaining = {target.id for target in targets}
+
+        async def delete_one(target):
+            try:
+                await target.delete(reason=job["reason"])
+            except discord.NotFound:
+                pass
+            remaining.discard(target.id)
+            job["deleted"] += 1
+
+        async def checkpoint(done, failed, _stage_total):
+            job["pending"][stage] = [target_id for target_id in ids if target_id in remaining]
+            save()
+            if progress:
+                await progress(job["deleted"], len(job["failed"]) + failed, total)
+
+        result = await run_batch(targets, delete_one, checkpoint)
+
+        for target in result["failed"]:
+            job["failed"].append(f"{'@' if stage == 'roles' else '#'}{target.name}")
+        job["pending"][stage] = []
+        save()
+
+    channel = guild.get_channel(job.get("hub_channel_id") or 0)
+    if not channel:
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(
+                send_messages=False,
+                read_messages=True
+            )
+        }
+        channel = await guild.create_text_channel(
+            name=NUKE_CHANNEL_NAME,
+            overwrites=overwrites,
+            reason=job["reason"]
+        )
+        job["hub_channel_id"] = channel.id
+        job["announced"] = False
+        save()
+
+    if not job.get("announced"):
+        await announce(channel)
+        job["announced"] = True
+
+    return job
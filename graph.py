@@ -1,196 +1,259 @@
-"""Statistics and analytics utilities for the Prime Network bot"""
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Tuple, Any
-import json
-import os
-
-DATA_FILE = 'loyalty_data.json'
-
-def load_data() -> Dict[str, Any]:
-    """Load data from JSON file"""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-def get_network_overview() -> Dict[str, int]:
-    """Get overall network statistics"""
-    data = load_data()
-    
-    total_guilds = len(data.get("guilds", {}))
-    total_users = len(data.get("global_users", {}))
-    loyal_users = sum(1 for u in data.get("global_users", {}).values() if u.get("is_loyal", False))
-    blacklisted_users = len(data.get("global_blacklist", []))
-    
-    return {
-        "total_guilds": total_guilds,
-        "total_users": total_users,
-        "loyal_users": loyal_users,
-        "blacklisted_users": blacklisted_users,
-        "trusted_users": len(data.get("network_config", {}).get("trusted_users", []))
-    }
-
-def get_activity_stats() -> Dict[str, Any]:
-    """Get activity statistics"""
-    data = load_data()
-    
-    loyal_users = [u for u in data.get("global_users", {}).values() if u.get("is_loyal", False)]
-    
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    active_today = sum(1 for u in loyal_users if u.get("last_activity") == today)
-    
-    average_messages = int(sum(u.get("total_messages", 0) for u in loyal_users) / len(loyal_users)) if loyal_users else 0
-    average_streak = int(sum(u.get("streak", 0) for u in loyal_users) / len(loyal_users)) if loyal_users else 0
-    
-    return {
-        "total_loyal": len(loyal_users),
-        "active_today": active_today,
-        "activity_percentage": int((active_today / len(loyal_users) * 100) if loyal_users else 0),
-        "average_messages": average_messages,
-        "average_streak": average_streak
-    }
-
-def get_network_trends(days: int = 7) -> Dict[str, Any]:
-    """Get network join/leave trends over past N days"""
-    data = load_data()
-    stats = data.get("stats", {})
-    
-    daily_joins = stats.get("daily_joins", {})
-    daily_leaves = stats.get("daily_leaves", {})
-    
-    today = datetime.now(timezone.utc)
-    trend_data = []
-    
-    for i in range(days):
-        date_str = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-        joins = daily_joins.get(date_str, 0)
-        leaves = daily_leaves.get(date_str, 0)
-        trend_data.append({
-            "date": date_str,
-            "joins": joins,
-            "leaves": leaves,
-            "net": joins - leaves
-        })
-    
-    trend_data.reverse()
-    
-    return {
-        "period_days": days,
-        "trends": trend_data,
-        "total_joins": sum(t["joins"] for t in trend_data),
-        "total_leaves": sum(t["leaves"] for t in trend_data)
-    }
-
-def record_join(user_id: int):
-    """Record a user joining the network"""
-    data = load_data()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    daily_joins = data.get("stats", {}).get("daily_joins", {})
-    daily_joins[today] = daily_joins.get(today, 0) + 1
-    
-    if "stats" not in data:
-        data["stats"] = {}
-    data["stats"]["daily_joins"] = daily_joins
-    
-    save_data(data)
-
-def record_leave(user_id: int):
-    """Record a user leaving the network"""
-    data = load_data()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    daily_leaves = data.get("stats", {}).get("daily_leaves", {})
-    daily_leaves[today] = daily_leaves.get(today, 0) + 1
-    
-    if "stats" not in data:
-        data["stats"] = {}
-    data["stats"]["daily_leaves"] = daily_leaves
-    
-    save_data(data)
-
-def record_activity_snapshot():
-    """Record daily activity snapshot"""
-    data = load_data()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    loyal_users = [u for u in data.get("global_users", {}).values() if u.get("is_loyal", False)]
-    activity_snapshots = data.get("stats", {}).get("activity_snapshots", {})
-    activity_snapshots[today] = len(loyal_users)
-    
-    if "stats" not in data:
-        data["stats"] = {}
-    data["stats"]["activity_snapshots"] = activity_snapshots
-    
-    save_data(data)
-
-def save_data(data: Dict[str, Any]):
-    """Save data to JSON file"""
-    try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"Error saving stats data: {e}")
-
-def validate_schema() -> Tuple[bool, List[str]]:
-    """Validate data schema integrity"""
-    data = load_data()
-    errors = []
-    
-    # Check network_config
-    if "network_config" not in data:
-        errors.append("Missing network_config table")
-    else:
-        required_fields = ["main_hub_id", "main_hub_invite", "system_active", "trusted_users"]
-        for field in required_fields:
-            if field not in data["network_config"]:
-                errors.append(f"Missing network_config.{field}")
-    
-    # Check other tables exist
-    required_tables = ["global_blacklist", "global_users", "guilds", "stats"]
-    for table in required_tables:
-        if table not in data:
-            errors.append(f"Missing {table} table")
-    
-    # Check stats structure
-    if "stats" in data:
-        required_stats = ["daily_joins", "daily_leaves", "activity_snapshots"]
-        for stat in required_stats:
-            if stat not in data["stats"]:
-                errors.append(f"Missing stats.{stat}")
-    
-    return len(errors) == 0, errors
-
-def get_top_users(limit: int = 10) -> List[Tuple[int, Dict[str, Any]]]:
-    """Get top users by streak"""
-    data = load_data()
-    
-    users = [
-        (int(uid), u) for uid, u in data.get("global_users", {}).items()
-        if u.get("is_loyal", False)
+"""PNG chart rendering for the Prime Network bot (standard library only)"""
+import hashlib
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+WIDTH = 640
+HEIGHT = 300
+MARGIN_LEFT = 52
+MARGIN_RIGHT = 16
+MARGIN_TOP = 16
+MARGIN_BOTTOM = 30
+CACHE_SIZE = 32  # Rendered PNGs kept, keyed by a hash of their inputs
+
+Color = Tuple[int, int, int]
+
+BACKGROUND: Color = (0x2b, 0x2d, 0x31)  # Discord embed dark
+GRID: Color = (0x3f, 0x41, 0x47)
+LABEL: Color = (0xb5, 0xba, 0xc1)
+BRAND: Color = (0x8a, 0xca, 0xf5)  # BRAND_COLOR
+BRAND_DARK: Color = (0x3f, 0x7f, 0xae)
+
+# 3x5 pixel glyphs, one string of 3 bits per row
+FONT = {
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"),
+    "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"),
+    "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"),
+    "7": ("111", "001", "010", "010", "010"),
+    "8": ("111", "101", "111", "101", "111"),
+    "9": ("111", "101", "111", "001", "111"),
+    "-": ("000", "000", "111", "000", "000"),
+    "+": ("000", "010", "111", "010", "000"),
+    ".": ("000", "000", "000", "000", "010"),
+    "k": ("100", "101", "110", "101", "101"),
+    "m": ("000", "111", "111", "101", "101"),
+    " ": ("000", "000", "000", "000", "000")
+}
+
+_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+
+# ==================== CANVAS ====================
+
+class Canvas:
+    """Minimal RGB raster with rectangle, line and digit drawing"""
+
+    def __init__(self, width: int = WIDTH, height: int = HEIGHT, background: Color = BACKGROUND):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(background) * (width * height))
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, color: Color):
+        """Fill [x0, x1) x [y0, y1), clipped to the canvas"""
+        x0, x1 = max(0, min(x0, x1)), min(self.width, max(x0, x1))
+        y0, y1 = max(0, min(y0, y1)), min(self.height, max(y0, y1))
+        if x0 >= x1:
+            return
+        row = bytes(color) * (x1 - x0)
+        for y in range(y0, y1):
+            start = (y * self.width + x0) * 3
+            self.pixels[start:start + len(row)] = row
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color: Color, thickness: int = 2):
+        """Bresenham line drawn with square pens"""
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+        error = dx + dy
+        while True:
+            self.fill_rect(x0, y0, x0 + thickness, y0 + thickness, color)
+            if x0 == x1 and y0 == y1:
+                return
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x0 += sx
+            if doubled <= dx:
+                error += dx
+                y0 += sy
+
+    def text(self, x: int, y: int, text: str, color: Color = LABEL, scale: int = 2):
+        """Draw text in the built-in 3x5 font (digits and a few symbols)"""
+        for char in text:
+            glyph = FONT.get(char, FONT[" "])
+            for row, bits in enumerate(glyph):
+                for column, bit in enumerate(bits):
+                    if bit == "1":
+                        self.fill_rect(x + column * scale, y + row * scale,
+                                       x + (column + 1) * scale, y + (row + 1) * scale, color)
+            x += 4 * scale
+
+    def png(self) -> bytes:
+        """Encode as an 8-bit RGB PNG"""
+        stride = self.width * 3
+        raw = b"".join(
+            b"\x00" + bytes(self.pixels[y * stride:(y + 1) * stride])
+            for y in range(self.height)
+        )
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+                + chunk(b"IDAT", zlib.compress(raw, 9)) + chunk(b"IEND", b""))
+
+
+def text_width(text: str, scale: int = 2) -> int:
+    return len(text) * 4 * scale - scale
+
+
+# ==================== CACHE ====================
+
+def _cached(kind: str, *inputs) -> Tuple[str, bytes]:
+    key = hashlib.sha1(repr((kind, inputs)).encode()).hexdigest()
+    return key, _cache.get(key)
+
+def _store(key: str, png: bytes) -> bytes:
+    _cache[key] = png
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return png
+
+def cache_info() -> dict:
+    """Rendered chart cache size"""
+    return {"size": len(_cache), "max_size": CACHE_SIZE}
+
+
+# ==================== AXES ====================
+
+def short_number(value: float) -> str:
+    """Compact axis label (1.2k, 3m)"""
+    if abs(value) >= 1_000_000:
+        return f"{value / 1_000_000:.1f}".rstrip("0").rstrip(".") + "m"
+    if abs(value) >= 1000:
+        return f"{value / 1000:.1f}".rstrip("0").rstrip(".") + "k"
+    return str(int(value))
+
+def nice_ceiling(value: float) -> int:
+    """Round an axis maximum up to 1/2/5 x 10^n (at least 5)"""
+    if value <= 5:
+        return 5
+    magnitude = 10 ** (len(str(int(value))) - 1)
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+def _axes(canvas: Canvas, top: int, labels: Sequence[str]) -> Tuple[int, int, int, int]:
+    """Draw gridlines, y labels and x labels; returns the plot box"""
+    left, right = MARGIN_LEFT, canvas.width - MARGIN_RIGHT
+    upper, lower = MARGIN_TOP, canvas.height - MARGIN_BOTTOM
+
+    # 2 x 10^n splits evenly into quarters, 1 and 5 x 10^n into fifths
+    divisions = 4 if str(top)[0] == "2" else 5
+    for i in range(divisions + 1):
+        value = top * i / divisions
+        y = lower - (lower - upper) * i // divisions
+        canvas.fill_rect(left, y, right, y + 1, GRID)
+        label = short_number(value)
+        canvas.text(left - 8 - text_width(label), y - 5, label)
+
+    if labels:
+        slot = (right - left) / len(labels)
+        every = max(1, -(-text_width(max(labels, key=len)) * len(labels) // ((right - left) * 4 // 5)))
+        for i, label in enumerate(labels):
+            if i % every == 0:
+                x = left + int(slot * (i + 0.5)) - text_width(label) // 2
+                canvas.text(x, lower + 10, label)
+
+    return left, upper, right, lower
+
+
+# ==================== CHARTS ====================
+
+def render_trends(dates: Sequence[str], joins: Sequence[int], leaves: Sequence[int]) -> bytes:
+    """
+    Grouped join (light) / leave (dark) bars per day
+
+    Args:
+        dates: YYYY-MM-DD labels
+        joins: Joins per day
+        leaves: Leaves per day
+
+    Returns:
+        bytes: PNG image
+    """
+    key, png = _cached("trends", tuple(dates), tuple(joins), tuple(leaves))
+    if png:
+        return png
+
+    canvas = Canvas()
+    top = nice_ceiling(max(list(joins) + list(leaves) + [1]))
+    left, upper, right, lower = _axes(canvas, top, [date[5:] for date in dates])
+
+    slot = (right - left) / max(1, len(dates))
+    bar = max(1, int(slot * 0.35))
+    for i, (joined, left_count) in enumerate(zip(joins, leaves)):
+        center = left + int(slot * (i + 0.5))
+        for x, value, color in ((center - bar, joined, BRAND), (center, left_count, BRAND_DARK)):
+            height = (lower - upper) * value // top
+            canvas.fill_rect(x, lower - height, x + bar - 1, lower, color)
+
+    return _store(key, canvas.png())
+
+def render_line(labels: Sequence[str], values: Sequence[int]) -> bytes:
+    """
+    Line chart with point markers (e.g. loyal members per day)
+
+    Returns:
+        bytes: PNG image
+    """
+    key, png = _cached("line", tuple(labels), tuple(values))
+    if png:
+        return png
+
+    canvas = Canvas()
+    top = nice_ceiling(max(list(values) + [1]))
+    left, upper, right, lower = _axes(canvas, top, labels)
+
+    slot = (right - left) / max(1, len(values))
+    points = [
+        (left + int(slot * (i + 0.5)), lower - (lower - upper) * value // top)
+        for i, value in enumerate(values)
     ]
-    users.sort(key=lambda x: x[1].get("streak", 0), reverse=True)
-    
-    return users[:limit]
-
-def get_guild_stats(guild_id: int) -> Dict[str, Any]:
-    """Get statistics for a specific guild"""
-    data = load_data()
-    guild_data = data.get("guilds", {}).get(str(guild_id), {})
-    
-    loyal_in_guild = sum(
-        1 for u in data.get("global_users", {}).values()
-        if u.get("is_loyal", False) and u.get("active_location_id") == guild_id
-    )
-    
-    return {
-        "guild_id": guild_id,
-        "guild_name": guild_data.get("name", "Unknown"),
-        "is_hub": guild_data.get("is_hub", False),
-        "loyal_members": loyal_in_guild,
-        "has_creed": guild_data.get("creed_message_id") is not None,
-        "trusted_local": len(guild_data.get("trusted_local", []))
-    }
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        canvas.line(x0, y0, x1, y1, BRAND)
+    for x, y in points:
+        canvas.fill_rect(x - 2, y - 2, x + 4, y + 4, BRAND)
+
+    return _store(key, canvas.png())
+
+def render_histogram(buckets: Sequence[Tuple[int, int, int]]) -> bytes:
+    """
+    Histogram bars from (low, high, count) buckets
+
+    Returns:
+        bytes: PNG image
+    """
+    key, png = _cached("histogram", tuple(buckets))
+    if png:
+        return png
+
+    canvas = Canvas()
+    top = nice_ceiling(max([count for _, _, count in buckets] + [1]))
+    labels = [short_number(low) for low, _, _ in buckets]
+    left, upper, right, lower = _axes(canvas, top, labels)
+
+    slot = (right - left) / max(1, len(buckets))
+    for i, (_, _, count) in enumerate(buckets):
+        height = (lower - upper) * count // top
+        canvas.fill_rect(left + int(slot * i) + 2, lower - height, left + int(slot * (i + 1)) - 2, lower, BRAND)
+
+    return _store(key, canvas.png())
@@ -0,0 +1,85 @@
+"""Background outbox for non-critical sends (welcome DMs, courtesy messages)"""
+from collections import deque
+from typing import Callable, Awaitable, Dict, Any, Tuple
+
+import discord
+
+from workers import WorkerPool
+
+DROP_OLDEST = "oldest"
+DROP_NEWEST = "newest"
+
+SendJob = Callable[[], Awaitable[Any]]
+
+
+class Outbox(WorkerPool):
+    """
+    Bounded queue of fire-and-forget sends with its own worker pool
+
+    Callers hand over a zero-argument coroutine function and return
+    immediately. When the queue is full the drop policy decides whether
+    the oldest pending send or the new one is discarded.
+    """
+
+    def __init__(self, maxsize: int = 1000, concurrency: int = 2,
+                 delay: float = 1.0, drop_policy: str = DROP_OLDEST):
+        super().__init__(concurrency, delay)
+        self.maxsize = maxsize
+        self.drop_policy = drop_policy
+
+        self._queue: "deque[Tuple[str, SendJob]]" = deque()
+
+        # Metrics
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def post(self, job: SendJob, label: str = "message") -> bool:
+        """
+        Queue a send
+
+        Args:
+            job: Coroutine function performing the send
+            label: Short description for logs
+
+        Returns:
+            bool: False if the job was dropped
+        """
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            if self.drop_policy == DROP_NEWEST:
+                return False
+            self._queue.popleft()
+
+        self._queue.append((label, job))
+        self.queued += 1
+        self.wake()
+        return True
+
+    def _has_work(self) -> bool:
+        return bool(self._queue)
+
+    async def _process_one(self):
+        label, job = self._queue.popleft()
+        try:
+            await job()
+            self.sent += 1
+        except discord.Forbidden:
+            # DMs closed - expected, not worth logging
+            self.failed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Outbox send failed ({label}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get outbox metrics"""
+        return {
+            "pending": len(self._queue),
+            "maxsize": self.maxsize,
+            "drop_policy": self.drop_policy,
+            "queued": self.queued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped
+        }
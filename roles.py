@@ -0,0 +1,111 @@
+"""Batched loyal role grant/revoke queue for the Prime Network bot"""
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+import discord
+
+from workers import WorkerPool
+
+GRANT = "grant"
+REVOKE = "revoke"
+
+
+class RoleQueue(WorkerPool):
+    """
+    Deduplicated queue of role grants and revokes
+
+    At most one operation is pending per (guild, user): a later request
+    replaces an earlier one, so a grant followed by a revoke collapses to
+    the revoke. Transient failures (rate limits, 5xx) are retried with
+    backoff; permanent ones (missing member/role, Forbidden) are dropped.
+    """
+
+    def __init__(self, bot, concurrency: int = 2, delay: float = 0.25,
+                 max_retries: int = 3, backoff: float = 2.0):
+        super().__init__(concurrency, delay)
+        self.bot = bot
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._pending: "OrderedDict[Tuple[int, int], Tuple[str, int, int]]" = OrderedDict()
+
+        # Metrics
+        self.applied = 0
+        self.skipped = 0
+        self.deduplicated = 0
+        self.retried = 0
+        self.failed = 0
+
+    # ==================== ENQUEUE ====================
+
+    def _enqueue(self, action: str, guild_id: int, user_id: int, role_id: int, attempts: int = 0):
+        key = (guild_id, user_id)
+        if key in self._pending:
+            self.deduplicated += 1
+            del self._pending[key]
+        self._pending[key] = (action, role_id, attempts)
+        self.wake()
+
+    def grant(self, guild_id: int, user_id: int, role_id: int):
+        """Queue a role grant"""
+        self._enqueue(GRANT, guild_id, user_id, role_id)
+
+    def revoke(self, guild_id: int, user_id: int, role_id: int):
+        """Queue a role revoke"""
+        self._enqueue(REVOKE, guild_id, user_id, role_id)
+
+    # ==================== WORKERS ====================
+
+    def _has_work(self) -> bool:
+        return bool(self._pending)
+
+    async def _process_one(self):
+        (guild_id, user_id), (action, role_id, attempts) = self._pending.popitem(last=False)
+        try:
+            await self._apply(guild_id, user_id, action, role_id, attempts)
+        except Exception as e:
+            self.failed += 1
+            print(f"Role {action} error for {user_id} in {guild_id}: {e}")
+
+    async def _apply(self, guild_id: int, user_id: int, action: str, role_id: int, attempts: int):
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(user_id) if guild else None
+        role = guild.get_role(role_id) if guild else None
+        if not member or not role:
+            self.skipped += 1
+            return
+
+        has_role = role in member.roles
+        if (action == GRANT and has_role) or (action == REVOKE and not has_role):
+            self.skipped += 1
+            return
+
+        try:
+            if action == GRANT:
+                await member.add_roles(role, reason="Prime Network loyalty")
+            else:
+                await member.remove_roles(role, reason="Prime Network loyalty")
+            self.applied += 1
+        except discord.HTTPException as e:
+            transient = e.status == 429 or e.status >= 500
+            if transient and attempts < self.max_retries:
+                self.retried += 1
+                await asyncio.sleep(self.backoff * (2 ** attempts))
+                # Don't clobber a newer request for the same member
+                if (guild_id, user_id) not in self._pending:
+                    self._enqueue(action, guild_id, user_id, role_id, attempts + 1)
+            else:
+                self.failed += 1
+                print(f"Role {action} failed for {user_id} in {guild.name}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue metrics"""
+        return {
+            "pending": len(self._pending),
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "deduplicated": self.deduplicated,
+            "retried": self.retried,
+            "failed": self.failed
+        }
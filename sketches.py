@@ -0,0 +1,204 @@
+"""Streaming sketches for the Prime Network bot (HyperLogLog active users, Misra-Gries top guilds)"""
+import base64
+import math
+import zlib
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Any, Optional, Set, Tuple
+
+PRECISION = 10  # 2^10 one-byte registers per sketch (~3.3% standard error)
+RETENTION_DAYS = 31  # Daily sketches kept; enough for a rolling MAU
+GUILD_SLOTS = 4  # Misra-Gries counters kept per user
+
+MASK64 = (1 << 64) - 1
+
+
+def hash64(value: int) -> int:
+    """SplitMix64 finalizer: spreads sequential snowflakes over 64 bits"""
+    x = (value + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class HyperLogLog:
+    """Mergeable cardinality estimator over 64-bit hashes"""
+
+    def __init__(self, precision: int = PRECISION, registers: Optional[bytearray] = None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.size)
+
+    def add_hash(self, hashed: int) -> bool:
+        """
+        Add a pre-hashed value
+
+        Returns:
+            bool: True if a register changed
+        """
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other: "HyperLogLog"):
+        """Fold another sketch of the same precision into this one"""
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimated number of distinct values"""
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], precision: int = PRECISION) -> "HyperLogLog":
+        """Merge sketches into a new one"""
+        result = cls(precision)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def encode(self) -> str:
+        """Compact base64(zlib) form for persistence"""
+        return base64.b64encode(zlib.compress(bytes(self.registers))).decode("ascii")
+
+    @classmethod
+    def decode(cls, text: str, precision: int = PRECISION) -> "HyperLogLog":
+        registers = bytearray(zlib.decompress(base64.b64decode(text)))
+        if len(registers) != 1 << precision:
+            raise ValueError("bad register count")
+        return cls(precision, registers)
+
+
+class ActiveUserSketches:
+    """
+    Daily HyperLogLog sketches per guild and for the whole network
+
+    Each message costs one hash and two register updates; sketches are
+    only re-encoded for persistence when a register actually changed.
+    DAU/WAU/MAU are unions of the last 1/7/30 daily sketches.
+    """
+
+    def __init__(self, retention: int = RETENTION_DAYS):
+        self.retention = retention
+        self._days: Dict[Optional[int], Dict[int, HyperLogLog]] = {}  # guild_id (None = network) -> day -> sketch
+        self._dirty: Set[Tuple[Optional[int], int]] = set()
+        self._today = 0
+
+    def _sketch(self, scope: Optional[int], day: int) -> HyperLogLog:
+        days = self._days.setdefault(scope, {})
+        sketch = days.get(day)
+        if sketch is None:
+            sketch = days[day] = HyperLogLog()
+        return sketch
+
+    def _roll(self, today: int):
+        """Evict daily sketches past retention when the UTC day changes"""
+        if today == self._today:
+            return
+        self._today = today
+        cutoff = today - self.retention
+        for scope, days in self._days.items():
+            for day in [day for day in days if day <= cutoff]:
+                del days[day]
+                self._dirty.add((scope, day))
+
+    def record(self, guild_id: int, user_id: int):
+        """Count a user as active today in a guild and network-wide"""
+        today = datetime.now(timezone.utc).date().toordinal()
+        self._roll(today)
+        hashed = hash64(user_id)
+        for scope in (guild_id, None):
+            if self._sketch(scope, today).add_hash(hashed):
+                self._dirty.add((scope, today))
+
+    def forget(self, guild_id: int):
+        """Drop a guild's sketches"""
+        for day in self._days.pop(guild_id, {}):
+            self._dirty.add((guild_id, day))
+
+    # ==================== QUERIES ====================
+
+    def active(self, days: int, guild_id: Optional[int] = None) -> int:
+        """Estimated distinct users active in the last N days (including today)"""
+        today = datetime.now(timezone.utc).date().toordinal()
+        scope_days = self._days.get(guild_id, {})
+        return HyperLogLog.union(
+            sketch for day, sketch in scope_days.items() if today - days < day <= today
+        ).count()
+
+    def summary(self, guild_id: Optional[int] = None) -> Dict[str, int]:
+        """DAU, WAU and MAU estimates"""
+        return {
+            "dau": self.active(1, guild_id),
+            "wau": self.active(7, guild_id),
+            "mau": self.active(30, guild_id)
+        }
+
+    # ==================== PERSISTENCE ====================
+
+    def load(self, table: Dict[str, Any]):
+        """Load sketches from {"network": {day: b64}, "guilds": {guild_id_str: {day: b64}}}"""
+        self._days.clear()
+        self._dirty.clear()
+        scopes = [(None, table.get("network", {}))]
+        scopes += [(int(guild_id_str), days) for guild_id_str, days in table.get("guilds", {}).items()]
+        for scope, days in scopes:
+            for day_str, encoded in days.items():
+                try:
+                    self._days.setdefault(scope, {})[date.fromisoformat(day_str).toordinal()] = HyperLogLog.decode(encoded)
+                except (ValueError, TypeError, zlib.error):
+                    continue
+
+    def flush(self, table: Dict[str, Any]):
+        """Write sketches changed since the last flush into a persisted table"""
+        for scope, day in self._dirty:
+            if scope is None:
+                days = table.setdefault("network", {})
+            else:
+                days = table.setdefault("guilds", {}).setdefault(str(scope), {})
+            day_str = date.fromordinal(day).isoformat()
+            sketch = self._days.get(scope, {}).get(day)
+            if sketch is not None:
+                days[day_str] = sketch.encode()
+            else:
+                days.pop(day_str, None)
+                if scope is not None and not days:
+                    table["guilds"].pop(str(scope), None)
+        self._dirty.clear()
+
+
+# ==================== TOP GUILDS ====================
+
+def count_guild(counts: Dict[str, int], guild_id: int, slots: int = GUILD_SLOTS):
+    """
+    Misra-Gries update of a user's per-guild message counters
+
+    At most `slots` guilds are tracked. A message from an untracked guild
+    when every slot is taken decrements all counters instead (dropping any
+    that reach zero), so any guild with more than 1/(slots+1) of the
+    user's messages is always tracked. O(slots) per message.
+    """
+    key = str(guild_id)
+    if key in counts:
+        counts[key] += 1
+    elif len(counts) < slots:
+        counts[key] = 1
+    else:
+        for other in list(counts):
+            counts[other] -= 1
+            if counts[other] <= 0:
+                del counts[other]
+
+def overtakes(counts: Dict[str, int], guild_id: int, current_id: Optional[int]) -> bool:
+    """True if a guild's counter is strictly ahead of the current main guild's"""
+    if current_id == guild_id:
+        return False
+    return counts.get(str(guild_id), 0) > counts.get(str(current_id), 0)
@@ -0,0 +1,69 @@
+"""Periodically materialized network stats snapshot for the Prime Network bot"""
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, NamedTuple, Optional, Tuple
+
+
+class StatsSnapshot(NamedTuple):
+    """Immutable network stats computed in one pass on the event loop"""
+    computed_at: datetime
+    guilds: int
+    connected_guilds: int
+    total_users: int
+    loyal_members: int
+    active_loyal: int
+    blacklisted: int
+    trusted_users: int
+    active_today: int
+    activity_percentage: float
+    average_messages: float
+    average_streak: float
+    network_dau: int
+    system_active: bool
+    trends: Tuple[Tuple[str, int, int], ...]  # (date, joins, leaves), oldest first
+    activity_history: Tuple[Tuple[str, int], ...]  # (date, loyal members), oldest first
+
+    def age(self) -> float:
+        """Seconds since the snapshot was computed"""
+        return (datetime.now(timezone.utc) - self.computed_at).total_seconds()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-safe form for HTTP endpoints"""
+        data = self._asdict()
+        data["computed_at"] = self.computed_at.isoformat()
+        data["age_seconds"] = round(self.age(), 1)
+        data["trends"] = [list(point) for point in self.trends]
+        data["activity_history"] = [list(point) for point in self.activity_history]
+        return data
+
+
+class StatsMaterializer:
+    """
+    Holds the latest StatsSnapshot
+
+    refresh() runs on the event loop (the only writer of DATA) and swaps
+    in a new snapshot with a single reference assignment, so readers on
+    any thread - commands or the Flask keep-alive server - get a complete,
+    consistent snapshot without locking.
+    """
+
+    def __init__(self, compute: Callable[[], StatsSnapshot]):
+        self._compute = compute
+        self.current: Optional[StatsSnapshot] = None
+
+        # Metrics
+        self.refreshes = 0
+        self.last_duration = 0.0
+
+    def refresh(self) -> StatsSnapshot:
+        """Recompute and publish a new snapshot (event loop only)"""
+        started = time.perf_counter()
+        snapshot = self._compute()
+        self.last_duration = time.perf_counter() - started
+        self.refreshes += 1
+        self.current = snapshot
+        return snapshot
+
+    def get(self) -> StatsSnapshot:
+        """Latest snapshot, computing the first one on demand (event loop only)"""
+        return self.current or self.refresh()
@@ -1,20 +1,58 @@
 """Statistics and analytics utilities for the Prime Network bot"""
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
+import heapq
 import json
 import os
 
+from timeseries import get_series
+
 DATA_FILE = 'loyalty_data.json'
 
+# Live store registered by the running bot (see bind)
+_live_data: Optional[Callable[[], Dict[str, Any]]] = None
+_live_save: Optional[Callable[[], None]] = None
+
+# Standalone snapshot of DATA_FILE, reloaded only when its mtime changes
+_snapshot: Dict[str, Any] = {}
+_snapshot_mtime: Optional[float] = None
+
+def bind(data: Callable[[], Dict[str, Any]], save: Callable[[], None]):
+    """
+    Serve stats from the bot's in-memory store
+    
+    Args:
+        data: Returns the live DATA dict
+        save: The bot's persistence function
+    """
+    global _live_data, _live_save
+    _live_data = data
+    _live_save = save
+
+def unbind():
+    """Fall back to the on-disk snapshot"""
+    global _live_data, _live_save
+    _live_data = None
+    _live_save = None
+
 def load_data() -> Dict[str, Any]:
-    """Load data from JSON file"""
-    if os.path.exists(DATA_FILE):
+    """Get the live store, or the file snapshot when running standalone"""
+    global _snapshot, _snapshot_mtime
+    if _live_data is not None:
+        return _live_data()
+    
+    try:
+        mtime = os.path.getmtime(DATA_FILE)
+    except OSError:
+        return {}
+    if mtime != _snapshot_mtime:
         try:
             with open(DATA_FILE, 'r') as f:
-                return json.load(f)
+                _snapshot = json.load(f)
         except:
-            return {}
-    return {}
+            _snapshot = {}
+        _snapshot_mtime = mtime
+    return _snapshot
 
 def get_network_overview() -> Dict[str, int]:
     """Get overall network statistics"""
@@ -56,82 +94,72 @@ def get_activity_stats() -> Dict[str, Any]:
 def get_network_trends(days: int = 7) -> Dict[str, Any]:
     """Get network join/leave trends over past N days"""
     data = load_data()
-    stats = data.get("stats", {})
-    
-    daily_joins = stats.get("daily_joins", {})
-    daily_leaves = stats.get("daily_leaves", {})
-    
-    today = datetime.now(timezone.utc)
-    trend_data = []
-    
-    for i in range(days):
-        date_str = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-        joins = daily_joins.get(date_str, 0)
-        leaves = daily_leaves.get(date_str, 0)
-        trend_data.append({
-            "date": date_str,
-            "joins": joins,
-            "leaves": leaves,
-            "net": joins - leaves
-        })
-    
-    trend_data.reverse()
+    stats = data.setdefault("stats", {})
+    
+    first_day, joins = get_series(stats, "daily_joins").last(days)
+    _, leaves = get_series(stats, "daily_leaves").last(days)
+    
+    trend_data = [
+        {
+            "date": (first_day + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "joins": joined,
+            "leaves": left,
+            "net": joined - left
+        }
+        for i, (joined, left) in enumerate(zip(joins, leaves))
+    ]
     
     return {
-        "period_days": days,
+        "period_days": len(trend_data),
         "trends": trend_data,
-        "total_joins": sum(t["joins"] for t in trend_data),
-        "total_leaves": sum(t["leaves"] for t in trend_data)
+        "total_joins": sum(joins),
+        "total_leaves": sum(leaves)
     }
 
-def record_join(user_id: int):
-    """Record a user joining the network"""
+def get_activity_history(days: int = 30) -> Dict[str, Any]:
+    """Get loyal member snapshots over past N days"""
     data = load_data()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    daily_joins = data.get("stats", {}).get("daily_joins", {})
-    daily_joins[today] = daily_joins.get(today, 0) + 1
-    
-    if "stats" not in data:
-        data["stats"] = {}
-    data["stats"]["daily_joins"] = daily_joins
+    first_day, values = get_series(data.setdefault("stats", {}), "activity_snapshots").last(days)
     
+    return {
+        "dates": [(first_day + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(len(values))],
+        "loyal_members": values
+    }
+
+def _increment(stat: str):
+    """Add one to today's slot in a stats series (90-day day-offset window plus weekly/monthly rollups)"""
+    data = load_data()
+    get_series(data.setdefault("stats", {}), stat).add()
     save_data(data)
 
+def record_join(user_id: int):
+    """Record a user joining the network"""
+    _increment("daily_joins")
+
 def record_leave(user_id: int):
     """Record a user leaving the network"""
-    data = load_data()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    daily_leaves = data.get("stats", {}).get("daily_leaves", {})
-    daily_leaves[today] = daily_leaves.get(today, 0) + 1
-    
-    if "stats" not in data:
-        data["stats"] = {}
-    data["stats"]["daily_leaves"] = daily_leaves
-    
-    save_data(data)
+    _increment("daily_leaves")
 
 def record_activity_snapshot():
     """Record daily activity snapshot"""
     data = load_data()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    loyal_users = [u for u in data.get("global_users", {}).values() if u.get("is_loyal", False)]
-    activity_snapshots = data.get("stats", {}).get("activity_snapshots", {})
-    activity_snapshots[today] = len(loyal_users)
-    
-    if "stats" not in data:
-        data["stats"] = {}
-    data["stats"]["activity_snapshots"] = activity_snapshots
-    
+    loyal_count = sum(1 for u in data.get("global_users", {}).values() if u.get("is_loyal", False))
+    get_series(data.setdefault("stats", {}), "activity_snapshots").set(loyal_count)
     save_data(data)
 
 def save_data(data: Dict[str, Any]):
-    """Save data to JSON file"""
+    """Persist through the bot when bound, otherwise write the file"""
+    global _snapshot_mtime
+    if _live_save is not None:
+        _live_save()
+        return
+    
     try:
-        with open(DATA_FILE, 'w') as f:
+        temp_file = f"{DATA_FILE}.tmp"
+        with open(temp_file, 'w') as f:
             json.dump(data, f, indent=4)
+        os.replace(temp_file, DATA_FILE)
+        _snapshot_mtime = os.path.getmtime(DATA_FILE)
     except Exception as e:
         print(f"Error saving stats data: {e}")
 
@@ -168,13 +196,11 @@ def get_top_users(limit: int = 10) -> List[Tuple[int, Dict[str, Any]]]:
     """Get top users by streak"""
     data = load_data()
     
-    users = [
+    users = (
         (int(uid), u) for uid, u in data.get("global_users", {}).items()
         if u.get("is_loyal", False)
-    ]
-    users.sort(key=lambda x: x[1].get("streak", 0), reverse=True)
-    
-    return users[:limit]
+    )
+    return heapq.nlargest(limit, users, key=lambda x: x[1].get("streak", 0))
 
 def get_guild_stats(guild_id: int) -> Dict[str, Any]:
     """Get statistics for a specific guild"""
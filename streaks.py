@@ -0,0 +1,185 @@
+"""Per-user daily activity bitmaps and streak models for the Prime Network bot"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, Any, Optional, Set
+
+import numpy as np
+
+from timeseries import today_utc
+
+WINDOW_DAYS = 366  # Days of history kept per user
+MASK = (1 << WINDOW_DAYS) - 1
+
+MESSAGES = "messages"  # One streak day per streak-threshold messages
+DAYS = "days"  # Consecutive UTC days with at least one message
+STREAK_MODELS = (MESSAGES, DAYS)
+
+# Vectorized streak recomputation runs here, off the event loop
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="streaks")
+
+
+# ==================== BITMAP ====================
+# user_data["activity_bits"] is a hex string; bit 0 is user_data["activity_day"]
+# (YYYY-MM-DD) and bit n is n days earlier.
+
+def record_day(user_data: Dict[str, Any], today: str) -> bool:
+    """
+    Mark today active
+
+    Only the first message of a day touches the bitmap; later ones are a
+    single string comparison. Returns True if today was newly marked.
+    """
+    last = user_data.get("activity_day")
+    if last == today:
+        return False
+
+    bits = int(user_data.get("activity_bits") or "0", 16)
+    if last:
+        gap = (date.fromisoformat(today) - date.fromisoformat(last)).days
+        bits = (bits << gap) & MASK if gap < WINDOW_DAYS else 0
+    bits |= 1
+
+    user_data["activity_bits"] = format(bits, "x")
+    user_data["activity_day"] = today
+    user_data["longest_streak"] = max(user_data.get("longest_streak", 0), _trailing_ones(bits))
+    return True
+
+def activity_bits(user_data: Dict[str, Any], today: Optional[date] = None) -> int:
+    """Bitmap aligned so bit 0 is today"""
+    last = user_data.get("activity_day")
+    if not last:
+        return 0
+    today = today or today_utc()
+    gap = (today - date.fromisoformat(last)).days
+    if gap >= WINDOW_DAYS:
+        return 0
+    bits = int(user_data.get("activity_bits") or "0", 16)
+    return (bits << gap) & MASK if gap >= 0 else bits >> -gap
+
+def _trailing_ones(bits: int) -> int:
+    return (~bits & (bits + 1)).bit_length() - 1
+
+
+# ==================== QUERIES ====================
+
+def day_streak(user_data: Dict[str, Any], today: Optional[date] = None) -> int:
+    """Consecutive active days ending today (or yesterday, if not active yet today)"""
+    bits = activity_bits(user_data, today)
+    if not bits & 1:
+        bits >>= 1
+    return _trailing_ones(bits)
+
+def active_days(user_data: Dict[str, Any], days: int = 30, today: Optional[date] = None) -> int:
+    """Active days among the last `days` (including today)"""
+    bits = activity_bits(user_data, today) & ((1 << min(days, WINDOW_DAYS)) - 1)
+    return bin(bits).count("1")
+
+def longest_streak(user_data: Dict[str, Any]) -> int:
+    """Longest run of consecutive active days since tracking began"""
+    bits = int(user_data.get("activity_bits") or "0", 16)
+    # Each AND with the shifted map shortens every run by one
+    longest = 0
+    while bits:
+        bits &= bits >> 1
+        longest += 1
+    return max(longest, user_data.get("longest_streak", 0))
+
+def ranking_streak(user_data: Dict[str, Any], model: str, today: Optional[date] = None) -> int:
+    """Streak value the leaderboard ranks by under a streak model"""
+    if model == DAYS:
+        return day_streak(user_data, today)
+    return user_data.get("streak", 0)
+
+
+# ==================== RECOMPUTATION ====================
+
+async def recompute_streaks(users: Dict[str, Dict[str, Any]],
+                            threshold: Callable[[Dict[str, Any]], int],
+                            include: Optional[Callable[[Dict[str, Any]], bool]] = None) -> int:
+    """
+    Rebuild loyal users' message streaks from total_messages
+
+    Totals and per-user thresholds are captured on the event loop, divided
+    in one vectorized pass on the thread pool, then swapped in with a
+    single loop pass that never yields, so no reader sees a half-applied
+    result. Users who messaged or left while the pass ran are redone
+    individually from their current totals.
+
+    Args:
+        users: global_users table
+        threshold: Returns the messages-per-streak-day threshold for a user
+        include: Optional filter limiting which loyal users are rebuilt
+
+    Returns:
+        int: Users whose streak changed
+    """
+    ids = [
+        user_id_str for user_id_str, user_data in users.items()
+        if user_data.get("is_loyal") and (include is None or include(user_data))
+    ]
+    totals = np.fromiter((users[i].get("total_messages", 0) for i in ids), dtype=np.int64, count=len(ids))
+    thresholds = np.fromiter((threshold(users[i]) for i in ids), dtype=np.int64, count=len(ids))
+
+    loop = asyncio.get_running_loop()
+    streaks, remainders = await loop.run_in_executor(_executor, np.divmod, totals, thresholds)
+
+    changed = 0
+    for index, user_id_str in enumerate(ids):
+        user_data = users.get(user_id_str)
+        if user_data is None or not user_data.get("is_loyal"):
+            continue
+        total = user_data.get("total_messages", 0)
+        if total == totals[index]:
+            streak, since = int(streaks[index]), int(remainders[index])
+        else:
+            streak, since = divmod(total, threshold(user_data))
+        if user_data.get("streak", 0) != streak:
+            changed += 1
+        user_data["streak"] = streak
+        user_data["messages_since_last_streak"] = since
+    return changed
+
+
+class StreakRecomputer:
+    """
+    Serializes streak rebuilds after threshold changes
+
+    Requests name a scope: one guild (users whose main server it is) or
+    None for the whole network. A request made while a pass is running is
+    queued and picked up by a follow-up pass, which captures thresholds
+    afresh, so a change made mid-pass is never lost. Every caller waits
+    until a pass that started after its request has finished.
+    """
+
+    def __init__(self, users: Callable[[], Dict[str, Dict[str, Any]]],
+                 threshold: Callable[[Dict[str, Any]], int]):
+        self._users = users
+        self._threshold = threshold
+        self._scopes: Set[Optional[int]] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.passes = 0
+
+    async def request(self, guild_id: Optional[int] = None) -> int:
+        """
+        Queue a rebuild and wait for it
+
+        Returns:
+            int: Users whose streak changed across the passes awaited
+        """
+        self._scopes.add(guild_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        # Shielded: one caller giving up must not cancel the shared pass
+        return await asyncio.shield(self._task)
+
+    async def _run(self) -> int:
+        changed = 0
+        while self._scopes:
+            scopes, self._scopes = self._scopes, set()
+            include = None if None in scopes else (lambda user_data: user_data.get("main_server_id") in scopes)
+            changed += await recompute_streaks(self._users(), self._threshold, include)
+            self.passes += 1
+        return changed
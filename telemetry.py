@@ -0,0 +1,126 @@
+"""Per-guild hour-of-week message rate telemetry for the Prime Network bot"""
+import base64
+import sys
+import time
+from array import array
+from typing import Dict, List, Any, Optional, Set
+
+HOURS_PER_WEEK = 7 * 24
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday (Monday = 0)
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def current_hour() -> int:
+    """Hours since the Unix epoch (UTC)"""
+    return int(time.time() // 3600)
+
+def slot_for(hour: int) -> int:
+    """Hour-of-week slot (Monday 00:00 UTC = 0) for an epoch hour"""
+    weekday = (hour // 24 + EPOCH_WEEKDAY) % 7
+    return weekday * 24 + hour % 24
+
+def _encode(values: array) -> str:
+    values = array(values.typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+def _decode(text: str) -> array:
+    values = array("I")
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        values.byteswap()
+    if len(values) != HOURS_PER_WEEK:
+        raise ValueError("bad slot count")
+    return values
+
+
+class ActivityHeatmap:
+    """
+    Rolling 7x24 message counters per guild
+
+    Each guild has one counter per hour-of-week slot plus the epoch hour the
+    slot was last written. Recording is O(1): a slot whose stamp is not the
+    current hour is reset before counting, so the buffer always holds the
+    last week. Buffers are persisted as little-endian base64 blobs.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, array] = {}
+        self._hours: Dict[int, array] = {}
+        self._dirty: Set[int] = set()
+
+    def record(self, guild_id: int, amount: int = 1):
+        """Count messages in a guild for the current hour"""
+        counts = self._counts.get(guild_id)
+        if counts is None:
+            counts = self._counts[guild_id] = array("I", bytes(4 * HOURS_PER_WEEK))
+            self._hours[guild_id] = array("I", bytes(4 * HOURS_PER_WEEK))
+        hours = self._hours[guild_id]
+
+        hour = current_hour()
+        slot = slot_for(hour)
+        if hours[slot] != hour:
+            hours[slot] = hour
+            counts[slot] = 0
+        counts[slot] += amount
+        self._dirty.add(guild_id)
+
+    def forget(self, guild_id: int):
+        """Drop a guild's buffer"""
+        self._counts.pop(guild_id, None)
+        self._hours.pop(guild_id, None)
+        self._dirty.add(guild_id)
+
+    # ==================== QUERIES ====================
+
+    def grid(self, guild_id: Optional[int] = None) -> List[List[int]]:
+        """
+        Message counts for the last week as 7 rows (Mon..Sun) of 24 hours
+
+        Args:
+            guild_id: Guild to read, or None for the whole network
+        """
+        now = current_hour()
+        totals = [0] * HOURS_PER_WEEK
+        guild_ids = [guild_id] if guild_id is not None else list(self._counts)
+        for gid in guild_ids:
+            counts = self._counts.get(gid)
+            if counts is None:
+                continue
+            hours = self._hours[gid]
+            for slot in range(HOURS_PER_WEEK):
+                if now - hours[slot] < HOURS_PER_WEEK:
+                    totals[slot] += counts[slot]
+        return [totals[day * 24:(day + 1) * 24] for day in range(7)]
+
+    def guilds(self) -> List[int]:
+        """Guild IDs with a buffer"""
+        return list(self._counts)
+
+    # ==================== PERSISTENCE ====================
+
+    def load(self, table: Dict[str, Any]):
+        """Load buffers from {guild_id_str: {"counts": b64, "hours": b64}}"""
+        self._counts.clear()
+        self._hours.clear()
+        self._dirty.clear()
+        for guild_id_str, entry in table.items():
+            try:
+                counts, hours = _decode(entry["counts"]), _decode(entry["hours"])
+            except (KeyError, ValueError, TypeError):
+                continue
+            self._counts[int(guild_id_str)] = counts
+            self._hours[int(guild_id_str)] = hours
+
+    def flush(self, table: Dict[str, Any]):
+        """Write buffers changed since the last flush into a persisted table"""
+        for guild_id in self._dirty:
+            if guild_id in self._counts:
+                table[str(guild_id)] = {
+                    "counts": _encode(self._counts[guild_id]),
+                    "hours": _encode(self._hours[guild_id])
+                }
+            else:
+                table.pop(str(guild_id), None)
+        self._dirty.clear()
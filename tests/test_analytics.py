@@ -0,0 +1,82 @@
+import pytest
+
+from analytics import Analytics
+
+
+def make_data():
+    return {
+        "global_users": {
+            "1": {"is_loyal": True, "streak": 2, "total_messages": 10},
+            "2": {"is_loyal": True, "streak": 5, "total_messages": 40}
+        }
+    }
+
+
+def test_cache_holds_until_version_changes():
+    data = make_data()
+    version = [0]
+    analytics = Analytics(lambda: data, lambda: version[0])
+
+    analytics.summary()
+    data["global_users"]["1"]["total_messages"] += 1
+    analytics.summary()
+    assert analytics.builds == 1
+    assert analytics.hits == 1
+
+    version[0] += 1
+    analytics.summary()
+    assert analytics.builds == 2
+
+
+def test_ttl_refreshes_stale_counts():
+    data = make_data()
+    analytics = Analytics(lambda: data, lambda: 0, ttl=0)
+
+    analytics.summary()
+    data["global_users"]["1"]["total_messages"] += 1
+    analytics.summary()
+    assert analytics.builds == 2
+
+
+class FakeGuild:
+    id = 100
+    name = "Gateway"
+
+
+@pytest.fixture
+def bot_module(monkeypatch, tmp_path):
+    pytest.importorskip("discord")
+    import bot as bot_module
+
+    monkeypatch.setattr(bot_module, "DATA", {
+        "network_config": {},
+        "global_users": {},
+        "guilds": {},
+        "stats": {}
+    })
+    monkeypatch.setattr(bot_module, "DATA_FILE", str(tmp_path / "loyalty_data.json"))
+    monkeypatch.setattr(bot_module, "notify_ranking_change", lambda user_id, user_data: None)
+    monkeypatch.setattr(bot_module.bot, "get_guild", lambda guild_id: FakeGuild() if guild_id == FakeGuild.id else None)
+    monkeypatch.setattr(bot_module, "ANALYTICS", Analytics(
+        lambda: bot_module.DATA, lambda: bot_module.ANALYTICS_VERSION
+    ))
+    return bot_module
+
+
+def test_plain_activity_save_hits_cache(bot_module):
+    user_data = bot_module.get_user_data(1, persist=False)
+    bot_module.grant_loyalty(user_data, FakeGuild())
+    bot_module.update_user_activity(1, FakeGuild.id)  # First message today: columns change
+
+    bot_module.ANALYTICS.summary()
+    builds = bot_module.ANALYTICS.builds
+    data_version = bot_module.DATA_VERSION
+
+    bot_module.update_user_activity(1, FakeGuild.id)  # Plain message: saved, nothing relevant changed
+    bot_module.ANALYTICS.summary()
+
+    assert bot_module.DATA_VERSION > data_version
+    assert bot_module.ANALYTICS.builds == builds
+
+    bot_module.revoke_loyalty(user_data)
+    assert bot_module.ANALYTICS.summary()["total_loyal"] == 0
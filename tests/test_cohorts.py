@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from cohorts import CohortTable, cohort_of, seed_cohorts, week_start
+from timeseries import today_utc
+
+OPT_IN = "2026-03-02"  # A Monday
+
+
+def test_events_update_active_without_scanning_users():
+    table = CohortTable({})
+    for _ in range(4):
+        table.joined(OPT_IN)
+    table.left(OPT_IN, was_active=True)
+    table.deactivated(OPT_IN)
+    table.reactivated(OPT_IN)
+    table.left(OPT_IN, was_active=False)
+
+    assert week_start(cohort_of(OPT_IN)) == date.fromisoformat(OPT_IN)
+    cohort = table.store[cohort_of(OPT_IN)]
+    assert cohort["size"] == 4
+    assert cohort["active"] == 3
+
+
+def test_snapshot_fills_missed_weeks_with_last_value():
+    table = CohortTable({})
+    start = date.fromisoformat(OPT_IN)
+    for _ in range(2):
+        table.joined(OPT_IN)
+    table.snapshot(start)
+    table.left(OPT_IN, was_active=True)
+    table.snapshot(start + timedelta(weeks=3))
+
+    assert table.store[cohort_of(OPT_IN)]["retained"] == [2, 2, 2, 1]
+
+
+def test_seeded_cohorts_leave_earlier_weeks_unknown():
+    opt_in = (today_utc() - timedelta(weeks=3)).isoformat()
+    stats = {}
+    users = [
+        {"is_loyal": True, "opt_in_date": opt_in},
+        {"is_loyal": True, "opt_in_date": opt_in, "is_inactive": True},
+        {"is_loyal": False, "opt_in_date": opt_in}
+    ]
+    seed_cohorts(stats, users)
+
+    key = cohort_of(opt_in)
+    cohort = stats["cohorts"][key]
+    assert cohort["size"] == 2
+    assert cohort["active"] == 1
+    assert len(cohort["retained"]) == 4
+    assert all(value is None for value in cohort["retained"][:-1])
+    assert cohort["retained"][-1] == 1
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from dashboard import DashboardScheduler
+
+GUILD_ID = 100
+
+
+def make_scheduler(edits, interval=0.0):
+    async def edit(guild_id):
+        edits.append(guild_id)
+        return True
+
+    return DashboardScheduler(
+        rank=lambda: [],
+        targets=lambda: {GUILD_ID: 10},
+        edit=edit,
+        interval=lambda: interval
+    )
+
+
+def test_cancelled_edit_does_not_drop_newer_pending_edit():
+    async def scenario():
+        edits = []
+        scheduler = make_scheduler(edits, interval=0.05)
+        scheduler._last_edit[GUILD_ID] = time.monotonic()
+
+        scheduler.schedule(GUILD_ID)
+        await asyncio.sleep(0)
+        scheduler.forget(GUILD_ID)
+        scheduler._last_edit[GUILD_ID] = time.monotonic()
+        scheduler.schedule(GUILD_ID)
+        newer = scheduler._pending[GUILD_ID]
+
+        await asyncio.sleep(0)  # Cancelled task unwinds its finally block
+        assert scheduler._pending.get(GUILD_ID) is newer
+
+        await newer
+        return edits
+
+    assert asyncio.run(scenario()) == [GUILD_ID]
+
+
+def test_pending_slot_cleared_after_edit():
+    async def scenario():
+        edits = []
+        scheduler = make_scheduler(edits)
+        scheduler.schedule(GUILD_ID)
+        await scheduler._pending[GUILD_ID]
+        return scheduler, edits
+
+    scheduler, edits = asyncio.run(scenario())
+    assert edits == [GUILD_ID]
+    assert GUILD_ID not in scheduler._pending
+
+
+def test_message_count_change_reschedules_edit():
+    async def scenario():
+        edits = []
+        top = [{"user_id": 1, "streak": 3, "messages": 300}]
+        scheduler = make_scheduler(edits)
+        scheduler._rank = lambda: [dict(entry) for entry in top]
+        scheduler.refresh_all()
+        await scheduler._pending[GUILD_ID]
+
+        top[0]["messages"] = 301
+        scheduler.ranking_changed(1, (3, 301))
+        await scheduler._pending[GUILD_ID]
+        return edits
+
+    assert asyncio.run(scenario()) == [GUILD_ID, GUILD_ID]
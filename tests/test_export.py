@@ -0,0 +1,69 @@
+import asyncio
+import csv
+import gzip
+import json
+
+from export import export_table
+
+
+def read_csv(path):
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_keeps_fields_missing_from_first_record(tmp_path):
+    data = {
+        "global_users": {
+            "1": {"is_loyal": True, "streak": 3},
+            "2": {"is_loyal": True, "streak": 5, "guild_counts": {"100": 7}, "activity_bits": "1f"},
+            "3": {"is_loyal": False, "left_at": "2026-01-01T00:00:00+00:00"}
+        }
+    }
+
+    result = asyncio.run(export_table(data, "users", "csv", directory=str(tmp_path)))
+    rows = read_csv(result["path"])
+
+    assert result["rows"] == 3
+    assert {"user_id", "is_loyal", "streak", "guild_counts", "activity_bits", "left_at"} <= set(rows[0])
+    by_id = {row["user_id"]: row for row in rows}
+    assert json.loads(by_id["2"]["guild_counts"]) == {"100": 7}
+    assert by_id["2"]["activity_bits"] == "1f"
+    assert by_id["1"]["guild_counts"] == ""
+    assert by_id["3"]["left_at"] == "2026-01-01T00:00:00+00:00"
+
+
+def test_csv_filter_still_uses_full_header(tmp_path):
+    data = {
+        "guilds": {
+            "10": {"name": "Hub", "is_hub": True},
+            "20": {"name": "Gateway", "dashboard_size": 5, "gate_snapshot": {"1": [0, 2048]}}
+        }
+    }
+
+    result = asyncio.run(export_table(data, "guilds", "csv", "not is_hub", directory=str(tmp_path)))
+    rows = read_csv(result["path"])
+
+    assert len(rows) == 1
+    assert rows[0]["dashboard_size"] == "5"
+    assert json.loads(rows[0]["gate_snapshot"]) == {"1": [0, 2048]}
+    assert rows[0]["is_hub"] == ""
+
+
+def test_selective_filter_still_yields_while_scanning(tmp_path, monkeypatch):
+    import export
+
+    monkeypatch.setattr(export, "CHUNK_SIZE", 2)
+    real_sleep = asyncio.sleep
+    yields = []
+
+    async def counting_sleep(delay):
+        yields.append(delay)
+        await real_sleep(delay)
+
+    monkeypatch.setattr(export.asyncio, "sleep", counting_sleep)
+    data = {"global_users": {str(i): {"streak": i} for i in range(10)}}
+
+    result = asyncio.run(export_table(data, "users", "jsonl", "streak >= 7", directory=str(tmp_path)))
+
+    assert result["rows"] == 3
+    assert len(yields) == 5
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+import bot as bot_module
+
+REMOVED_ID = 100
+QUIET_ID = 101
+BUSY_ID = 102
+
+MOVER_ID = 1
+LEAVER_ID = 2
+
+
+class FakeMember:
+    def __init__(self, user_id, guild):
+        self.id = user_id
+        self.guild = guild
+        self.bot = False
+
+
+class FakeGuild:
+    def __init__(self, guild_id, member_ids):
+        self.id = guild_id
+        self.name = f"Guild {guild_id}"
+        self.members = [FakeMember(user_id, self) for user_id in member_ids]
+
+    def get_member(self, user_id):
+        return next((member for member in self.members if member.id == user_id), None)
+
+
+@pytest.fixture
+def network(monkeypatch):
+    guilds = {
+        REMOVED_ID: FakeGuild(REMOVED_ID, [MOVER_ID, LEAVER_ID]),
+        QUIET_ID: FakeGuild(QUIET_ID, [MOVER_ID]),
+        BUSY_ID: FakeGuild(BUSY_ID, [MOVER_ID]),
+    }
+    monkeypatch.setattr(bot_module, "DATA", {"network_config": {}, "global_users": {}, "guilds": {}, "stats": {}})
+    monkeypatch.setattr(bot_module, "save_data", lambda: None)
+    notified = []
+    monkeypatch.setattr(bot_module, "notify_ranking_change", lambda user_id, user_data: notified.append(user_id))
+    monkeypatch.setattr(bot_module.bot, "get_guild", guilds.get)
+    monkeypatch.setattr(type(bot_module.bot), "guilds", property(lambda self: list(guilds.values())))
+
+    for user_id in (MOVER_ID, LEAVER_ID):
+        user_data = bot_module.get_user_data(user_id, persist=False)
+        bot_module.grant_loyalty(user_data, guilds[REMOVED_ID])
+        user_data["guild_counts"] = {str(REMOVED_ID): 50}
+    bot_module.DATA["global_users"][str(MOVER_ID)]["guild_counts"].update({str(QUIET_ID): 5, str(BUSY_ID): 20})
+    return guilds, notified
+
+
+def users():
+    return bot_module.DATA["global_users"]
+
+
+def test_member_remove_moves_to_most_active_guild(network):
+    guilds, notified = network
+    asyncio.run(bot_module.on_member_remove(guilds[REMOVED_ID].get_member(MOVER_ID)))
+
+    mover = users()[str(MOVER_ID)]
+    assert mover["is_loyal"]
+    assert mover["main_server_id"] == BUSY_ID
+    assert str(REMOVED_ID) not in mover["guild_counts"]
+    assert notified == [MOVER_ID]
+
+
+def test_member_remove_from_last_guild_leaves_network(network):
+    guilds, notified = network
+    asyncio.run(bot_module.on_member_remove(guilds[REMOVED_ID].get_member(LEAVER_ID)))
+
+    assert not users()[str(LEAVER_ID)]["is_loyal"]
+    assert notified == [LEAVER_ID]
+
+
+def test_guild_remove_matches_member_remove(network):
+    guilds, notified = network
+    removed = guilds.pop(REMOVED_ID)
+    asyncio.run(bot_module.on_guild_remove(removed))
+
+    mover, leaver = users()[str(MOVER_ID)], users()[str(LEAVER_ID)]
+    assert mover["main_server_id"] == BUSY_ID
+    assert str(REMOVED_ID) not in mover["guild_counts"]
+    assert not leaver["is_loyal"]
+    assert sorted(notified) == [MOVER_ID, LEAVER_ID]
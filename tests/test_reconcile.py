@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+import bot as bot_module
+
+GUILD_ID = 100
+CHANNEL_ID = 200
+MESSAGE_ID = 300
+LEAVER_ID = 1
+NEWCOMER_ID = 2
+
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.bot = False
+
+
+class FakeReaction:
+    emoji = "✅"
+
+    def __init__(self, user_ids):
+        self._user_ids = user_ids
+
+    async def users(self, limit=None):
+        for user_id in self._user_ids:
+            yield FakeUser(user_id)
+
+
+class FakeMessage:
+    def __init__(self, user_ids):
+        self.reactions = [FakeReaction(user_ids)]
+
+
+class FakeChannel:
+    def __init__(self, user_ids):
+        self._message = FakeMessage(user_ids)
+
+    async def fetch_message(self, message_id):
+        return self._message
+
+
+class FakeGuild:
+    id = GUILD_ID
+    name = "Gateway"
+
+    def __init__(self, user_ids):
+        self._channel = FakeChannel(user_ids)
+        self._members = set(user_ids)
+
+    def get_channel(self, channel_id):
+        return self._channel if channel_id == CHANNEL_ID else None
+
+    def get_member(self, user_id):
+        return object() if user_id in self._members else None
+
+
+@pytest.fixture
+def network(monkeypatch):
+    guild = FakeGuild([LEAVER_ID, NEWCOMER_ID])
+    monkeypatch.setattr(bot_module, "DATA", {
+        "network_config": {},
+        "global_users": {},
+        "guilds": {str(GUILD_ID): {"creed_message_id": MESSAGE_ID, "creed_channel_id": CHANNEL_ID}},
+        "stats": {}
+    })
+    monkeypatch.setattr(bot_module, "save_data", lambda: None)
+    monkeypatch.setattr(bot_module, "notify_ranking_change", lambda user_id, user_data: None)
+    monkeypatch.setattr(bot_module, "RECONCILE_GUILD_DELAY", 0)
+    monkeypatch.setattr(bot_module, "_reconcile_lock", None)
+    monkeypatch.setattr(bot_module.bot, "get_guild", lambda guild_id: guild if guild_id == GUILD_ID else None)
+    return guild
+
+
+def test_user_who_left_is_not_re_enrolled(network):
+    leaver = bot_module.get_user_data(LEAVER_ID, persist=False)
+    bot_module.grant_loyalty(leaver, network)
+    bot_module.revoke_loyalty(leaver, opt_out=True)
+
+    result = asyncio.run(bot_module.reconcile_creed_optins())
+
+    assert not leaver["is_loyal"]
+    assert leaver["left_at"]
+    # Opt-ins missed while offline are still recovered
+    assert result["recovered"] == 1
+    assert bot_module.DATA["global_users"][str(NEWCOMER_ID)]["is_loyal"]
+
+
+def test_opting_in_again_clears_opt_out(network):
+    leaver = bot_module.get_user_data(LEAVER_ID, persist=False)
+    bot_module.revoke_loyalty(leaver, opt_out=True)
+    bot_module.grant_loyalty(leaver, network)
+
+    assert leaver["is_loyal"]
+    assert "left_at" not in leaver
@@ -0,0 +1,86 @@
+import pytest
+
+from sketches import ActiveUserSketches, GUILD_SLOTS, HyperLogLog, count_guild, hash64, overtakes
+
+
+def test_hyperloglog_estimates_within_three_percent_on_average():
+    # One sketch has ~3.3% standard error at PRECISION 10, so a single
+    # estimate is only bounded at 3 standard errors; the mean over
+    # independent snowflake ranges must land within 3%
+    distinct, trials = 20_000, 16
+    estimates = []
+    for trial in range(trials):
+        sketch = HyperLogLog()
+        base = 10**17 + trial * 10**12
+        for user_id in range(base, base + distinct):
+            sketch.add_hash(hash64(user_id))
+        estimates.append(sketch.count())
+        assert estimates[-1] == pytest.approx(distinct, rel=0.10)
+
+    assert sum(estimates) / trials == pytest.approx(distinct, rel=0.03)
+
+
+def test_hyperloglog_small_counts_use_linear_counting():
+    sketch = HyperLogLog()
+    for user_id in range(200):
+        sketch.add_hash(hash64(user_id))
+
+    assert sketch.count() == pytest.approx(200, rel=0.10)
+
+
+def test_hyperloglog_union_counts_overlap_once():
+    first, second = HyperLogLog(), HyperLogLog()
+    for user_id in range(10_000):
+        first.add_hash(hash64(user_id))
+        second.add_hash(hash64(user_id + 5_000))
+
+    assert HyperLogLog.union([first, second]).count() == pytest.approx(15_000, rel=0.03)
+
+
+def test_sketches_round_trip_through_persistence():
+    sketches = ActiveUserSketches()
+    for user_id in range(1_000):
+        sketches.record(100, user_id)
+    table = {}
+    sketches.flush(table)
+
+    restored = ActiveUserSketches()
+    restored.load(table)
+
+    assert restored.summary() == sketches.summary()
+    assert restored.active(1, 100) == sketches.active(1, 100)
+
+
+def replay(counts, current, guild_ids):
+    """Apply messages the way update_user_activity does, returning the main guild"""
+    for guild_id in guild_ids:
+        count_guild(counts, guild_id)
+        if overtakes(counts, guild_id, current):
+            current = guild_id
+    return current
+
+
+def test_main_guild_switches_only_when_overtaken():
+    counts = {}
+    current = replay(counts, None, [1] * 10)
+    assert current == 1
+
+    current = replay(counts, current, [2] * 10)
+    assert current == 1  # Tied, not ahead
+
+    current = replay(counts, current, [2])
+    assert current == 2
+
+
+def test_counters_stay_bounded_and_keep_heavy_guild():
+    counts = {}
+    # Guild 1 sends a third of the messages among many one-off guilds
+    messages = []
+    for other in range(100, 400):
+        messages += [1, other, other + 1000]
+
+    current = replay(counts, None, messages)
+
+    assert len(counts) <= GUILD_SLOTS
+    assert current == 1
+    assert counts["1"] > 0
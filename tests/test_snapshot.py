@@ -0,0 +1,41 @@
+import json
+from datetime import datetime, timezone
+
+from snapshot import StatsMaterializer, StatsSnapshot
+
+
+def make_snapshot(loyal_members):
+    return StatsSnapshot(
+        computed_at=datetime.now(timezone.utc),
+        guilds=2, connected_guilds=2, total_users=10,
+        loyal_members=loyal_members, active_loyal=loyal_members, blacklisted=0, trusted_users=1,
+        active_today=3, activity_percentage=30.0, average_messages=12.5, average_streak=1.5,
+        network_dau=3, system_active=True,
+        trends=(("2026-10-18", 1, 0), ("2026-10-19", 2, 1)),
+        activity_history=(("2026-10-19", loyal_members),)
+    )
+
+
+def test_get_computes_once_and_refresh_swaps_snapshot():
+    computed = []
+
+    def compute():
+        computed.append(None)
+        return make_snapshot(len(computed))
+
+    materializer = StatsMaterializer(compute)
+    first = materializer.get()
+    assert materializer.get() is first
+
+    second = materializer.refresh()
+    assert second is not first
+    assert materializer.current is second
+    assert first.loyal_members == 1  # Published snapshots are never mutated
+    assert materializer.refreshes == 2
+
+
+def test_as_dict_is_json_safe():
+    data = make_snapshot(5).as_dict()
+
+    assert json.loads(json.dumps(data))["trends"] == [["2026-10-18", 1, 0], ["2026-10-19", 2, 1]]
+    assert data["age_seconds"] >= 0
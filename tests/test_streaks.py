@@ -0,0 +1,97 @@
+import asyncio
+from datetime import date, timedelta
+
+from streaks import (
+    DAYS, MESSAGES, WINDOW_DAYS, StreakRecomputer, active_days, day_streak, longest_streak,
+    ranking_streak, recompute_streaks, record_day
+)
+
+START = date(2026, 1, 1)
+
+
+def record_days(user_data, offsets):
+    for offset in offsets:
+        record_day(user_data, (START + timedelta(days=offset)).isoformat())
+
+
+def make_users():
+    return {
+        "1": {"is_loyal": True, "total_messages": 250, "streak": 0, "main_server_id": 10},
+        "2": {"is_loyal": True, "total_messages": 99, "streak": 0, "main_server_id": 20},
+        "3": {"is_loyal": False, "total_messages": 500, "streak": 0, "main_server_id": 10}
+    }
+
+
+def test_recompute_divides_totals_by_threshold():
+    users = make_users()
+    changed = asyncio.run(recompute_streaks(users, lambda user_data: 100))
+
+    assert changed == 1
+    assert (users["1"]["streak"], users["1"]["messages_since_last_streak"]) == (2, 50)
+    assert (users["2"]["streak"], users["2"]["messages_since_last_streak"]) == (0, 99)
+    assert users["3"]["streak"] == 0  # Not loyal
+
+
+def test_threshold_change_mid_pass_gets_follow_up_pass():
+    users = make_users()
+    thresholds = {10: 100, 20: 100}
+    recomputer = StreakRecomputer(lambda: users, lambda user_data: thresholds[user_data["main_server_id"]])
+
+    async def scenario():
+        first = asyncio.create_task(recomputer.request())
+        await asyncio.sleep(0)  # First pass has captured thresholds and is dividing
+        thresholds[10] = 50
+        second = asyncio.create_task(recomputer.request(10))
+        return await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+
+    assert recomputer.passes == 2
+    assert (users["1"]["streak"], users["1"]["messages_since_last_streak"]) == (5, 0)
+
+
+def test_guild_scope_only_rebuilds_members_based_there():
+    users = make_users()
+    users["2"]["streak"] = 7  # Earned incrementally; must survive another guild's change
+    recomputer = StreakRecomputer(lambda: users, lambda user_data: 50)
+
+    asyncio.run(recomputer.request(10))
+
+    assert users["1"]["streak"] == 5
+    assert users["2"]["streak"] == 7
+
+
+def test_record_day_marks_each_day_once():
+    user_data = {}
+    assert record_day(user_data, START.isoformat())
+    assert not record_day(user_data, START.isoformat())
+    assert active_days(user_data, today=START) == 1
+
+
+def test_day_streak_counts_through_yesterday_until_today_is_active():
+    user_data = {}
+    record_days(user_data, [0, 1, 2, 4, 5, 6])
+
+    assert day_streak(user_data, START + timedelta(days=6)) == 3
+    assert day_streak(user_data, START + timedelta(days=7)) == 3
+    assert day_streak(user_data, START + timedelta(days=8)) == 0
+    assert active_days(user_data, 7, START + timedelta(days=6)) == 6
+    assert longest_streak(user_data) == 3
+
+
+def test_longest_streak_outlives_the_window():
+    user_data = {}
+    record_days(user_data, range(10))
+    record_days(user_data, [10 + WINDOW_DAYS])
+
+    assert day_streak(user_data, START + timedelta(days=10 + WINDOW_DAYS)) == 1
+    assert longest_streak(user_data) == 10
+
+
+def test_ranking_streak_follows_model():
+    user_data = {"streak": 7}
+    record_days(user_data, [0, 1])
+    today = START + timedelta(days=1)
+
+    assert ranking_streak(user_data, MESSAGES, today) == 7
+    assert ranking_streak(user_data, DAYS, today) == 2
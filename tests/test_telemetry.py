@@ -0,0 +1,44 @@
+import telemetry
+from telemetry import ActivityHeatmap, HOURS_PER_WEEK, slot_for
+
+MONDAY_MIDNIGHT = 96  # 1970-01-05 00:00 UTC, in epoch hours
+
+
+def test_slot_for_maps_epoch_hours_to_hour_of_week():
+    assert slot_for(0) == 3 * 24  # Thursday 00:00
+    assert slot_for(MONDAY_MIDNIGHT) == 0
+    assert slot_for(MONDAY_MIDNIGHT + HOURS_PER_WEEK - 1) == HOURS_PER_WEEK - 1
+
+
+def test_slot_is_reset_after_a_week(monkeypatch):
+    heatmap = ActivityHeatmap()
+    hour = MONDAY_MIDNIGHT + 1000 * HOURS_PER_WEEK + 5
+    monkeypatch.setattr(telemetry, "current_hour", lambda: hour)
+    heatmap.record(1, 3)
+
+    assert heatmap.grid(1)[0][5] == 3
+
+    # Same slot a week later starts from zero
+    monkeypatch.setattr(telemetry, "current_hour", lambda: hour + HOURS_PER_WEEK)
+    assert heatmap.grid(1)[0][5] == 0
+    heatmap.record(1)
+    assert heatmap.grid(1)[0][5] == 1
+
+
+def test_network_grid_sums_guilds_and_survives_persistence(monkeypatch):
+    monkeypatch.setattr(telemetry, "current_hour", lambda: MONDAY_MIDNIGHT + 500 * HOURS_PER_WEEK + 30)
+    heatmap = ActivityHeatmap()
+    heatmap.record(1, 2)
+    heatmap.record(2, 5)
+    table = {}
+    heatmap.flush(table)
+
+    restored = ActivityHeatmap()
+    restored.load(table)
+
+    assert restored.grid()[1][6] == 7
+    assert restored.grid() == heatmap.grid()
+
+    heatmap.forget(2)
+    heatmap.flush(table)
+    assert set(table) == {"1"}
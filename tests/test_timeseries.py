@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from timeseries import DailySeries, LAST, RETENTION_DAYS, month_key, today_utc, week_key
+
+
+def test_legacy_dict_is_migrated_in_place():
+    today = today_utc()
+    yesterday = today - timedelta(days=1)
+    store = {today.isoformat(): 3, yesterday.isoformat(): 2, "not-a-date": 9}
+
+    series = DailySeries(store)
+
+    assert isinstance(store["days"], list)
+    assert len(store["days"]) == RETENTION_DAYS
+    first_day, values = series.last(2)
+    assert first_day == yesterday
+    assert values == [2, 3]
+    assert sum(series.weekly().values()) == 5
+
+
+def test_days_past_retention_are_evicted_but_rolled_up():
+    today = today_utc()
+    old = today - timedelta(days=RETENTION_DAYS + 10)
+    series = DailySeries({})
+
+    series.add(4, day=old)
+    series.add(1)
+
+    assert series.start > old
+    assert sum(series.store["days"]) == 1
+    assert series.weekly()[week_key(old)] == 4
+    assert series.monthly()[month_key(old)] >= 4
+
+    series.advance(today + timedelta(days=RETENTION_DAYS))
+    assert sum(series.store["days"]) == 0
+    assert series.weekly()[week_key(today)] >= 1
+
+
+def test_gauge_rollups_keep_latest_value():
+    series = DailySeries({}, mode=LAST)
+    today = today_utc()
+
+    series.set(10, day=today - timedelta(days=1))
+    series.set(7)
+
+    assert series.last(1)[1] == [7]
+    assert series.monthly()[month_key(today)] == 7
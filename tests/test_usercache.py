@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+from usercache import UserCache
+
+
+class FakeBot:
+    guilds = []
+
+    def __init__(self):
+        self.calls = 0
+        self.release = None
+
+    def get_user(self, user_id):
+        return None
+
+    async def fetch_user(self, user_id):
+        self.calls += 1
+        await self.release.wait()
+        return f"user-{user_id}"
+
+
+def test_cancelling_first_caller_does_not_cancel_coalesced_waiters():
+    async def scenario():
+        bot = FakeBot()
+        bot.release = asyncio.Event()
+        cache = UserCache()
+
+        first = asyncio.create_task(cache.resolve(bot, 1))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.resolve(bot, 1))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        bot.release.set()
+        return bot, cache, first, await second
+
+    bot, cache, first, user = asyncio.run(scenario())
+    assert first.cancelled()
+    assert user == "user-1"
+    assert bot.calls == 1
+    assert cache.stats()["coalesced"] == 1
+    assert not cache._inflight
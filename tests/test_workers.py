@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+from outbox import Outbox
+from roles import RoleQueue
+
+
+def test_outbox_drains_jobs_posted_before_and_after_start():
+    async def scenario():
+        sent = []
+        outbox = Outbox(concurrency=2, delay=0)
+
+        async def send(value):
+            sent.append(value)
+
+        outbox.post(lambda: send(1))
+        outbox.start()
+        outbox.start()  # Idempotent
+        outbox.post(lambda: send(2))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return outbox, sent
+
+    outbox, sent = asyncio.run(scenario())
+    assert sorted(sent) == [1, 2]
+    assert outbox.stats()["sent"] == 2
+    assert outbox.stats()["pending"] == 0
+
+
+def test_role_queue_worker_survives_unknown_guild():
+    class NoGuilds:
+        def get_guild(self, guild_id):
+            return None
+
+    async def scenario():
+        queue = RoleQueue(NoGuilds(), concurrency=1, delay=0)
+        queue.start()
+        queue.grant(1, 2, 3)
+        queue.revoke(4, 5, 6)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.stats()["skipped"] == 2
+    assert queue.stats()["pending"] == 0
+
+
+def test_worker_pool_requires_both_hooks():
+    from workers import WorkerPool
+
+    class Incomplete(WorkerPool):
+        def _has_work(self):
+            return False
+
+    with pytest.raises(TypeError):
+        Incomplete(concurrency=1, delay=0)
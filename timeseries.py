@@ -0,0 +1,141 @@
+"""Daily stats time series with rollups and retention for the Prime Network bot"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+RETENTION_DAYS = 90  # Raw daily points kept per series
+WEEKLY_RETENTION = 104  # Weekly aggregates kept per series
+
+SUM = "sum"  # Counters: rollups add up the days
+LAST = "last"  # Gauges: rollups keep the latest day's value
+
+SERIES_MODES = {
+    "daily_joins": SUM,
+    "daily_leaves": SUM,
+    "activity_snapshots": LAST
+}
+
+
+def today_utc() -> date:
+    """Current UTC date"""
+    return datetime.now(timezone.utc).date()
+
+def week_key(day: date) -> str:
+    """ISO week label, e.g. 2026-W07"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def month_key(day: date) -> str:
+    """Month label, e.g. 2026-02"""
+    return day.strftime("%Y-%m")
+
+
+class DailySeries:
+    """
+    Fixed window of daily values indexed by day offset
+
+    Wraps (and mutates in place) a persisted dict of the form
+    {"start": "YYYY-MM-DD", "days": [...], "weekly": {...}, "monthly": {...}}
+    where days[i] is the value for start + i. Rollups are updated on every
+    write, so evicting raw days from the window loses nothing but detail.
+    Legacy {"YYYY-MM-DD": n} dicts are migrated on first use.
+    """
+
+    def __init__(self, store: Dict[str, Any], mode: str = SUM, retention: int = RETENTION_DAYS):
+        self.store = store
+        self.mode = mode
+        self.retention = retention
+        if not isinstance(store.get("days"), list):
+            self._migrate()
+
+    def _migrate(self):
+        legacy = {key: value for key, value in self.store.items() if isinstance(value, int)}
+        today = today_utc()
+        self.store.clear()
+        self.store.update({
+            "start": (today - timedelta(days=self.retention - 1)).isoformat(),
+            "days": [0] * self.retention,
+            "weekly": {},
+            "monthly": {}
+        })
+        for date_str in sorted(legacy):
+            try:
+                day = date.fromisoformat(date_str)
+            except ValueError:
+                continue
+            self._write(day, legacy[date_str], self.mode == SUM)
+
+    # ==================== WINDOW ====================
+
+    @property
+    def start(self) -> date:
+        return date.fromisoformat(self.store["start"])
+
+    def advance(self, today: Optional[date] = None):
+        """Slide the window so it ends on today, evicting older raw days"""
+        today = today or today_utc()
+        days = self.store["days"]
+        shift = (today - self.start).days - (len(days) - 1)
+        if shift <= 0:
+            return
+        if shift >= len(days):
+            days[:] = [0] * len(days)
+        else:
+            del days[:shift]
+            days.extend([0] * shift)
+        self.store["start"] = (self.start + timedelta(days=shift)).isoformat()
+
+    def _write(self, day: date, value: int, accumulate: bool):
+        self.advance(max(day, today_utc()))
+        offset = (day - self.start).days
+        days = self.store["days"]
+        if 0 <= offset < len(days):
+            days[offset] = days[offset] + value if accumulate else value
+
+        for rollup, key in (("weekly", week_key(day)), ("monthly", month_key(day))):
+            buckets = self.store.setdefault(rollup, {})
+            buckets[key] = buckets.get(key, 0) + value if accumulate else value
+
+        weekly = self.store["weekly"]
+        while len(weekly) > WEEKLY_RETENTION:
+            del weekly[min(weekly)]
+
+    def add(self, amount: int = 1, day: Optional[date] = None):
+        """Add to a day's counter (defaults to today)"""
+        self._write(day or today_utc(), amount, True)
+
+    def set(self, value: int, day: Optional[date] = None):
+        """Set a day's gauge value (defaults to today)"""
+        self._write(day or today_utc(), value, False)
+
+    # ==================== QUERIES ====================
+
+    def last(self, n: int) -> Tuple[date, List[int]]:
+        """
+        Values for the last n days, oldest first
+
+        Returns:
+            Tuple of (first day in the slice, values)
+        """
+        today = today_utc()
+        self.advance(today)
+        end = (today - self.start).days + 1
+        n = max(1, min(n, end))
+        return today - timedelta(days=n - 1), self.store["days"][end - n:end]
+
+    def weekly(self) -> Dict[str, int]:
+        """Weekly aggregates keyed by ISO week"""
+        return self.store.get("weekly", {})
+
+    def monthly(self) -> Dict[str, int]:
+        """Monthly aggregates keyed by YYYY-MM"""
+        return self.store.get("monthly", {})
+
+
+def get_series(stats: Dict[str, Any], name: str) -> DailySeries:
+    """Wrap (creating if needed) a named series in a stats table"""
+    return DailySeries(stats.setdefault(name, {}), SERIES_MODES.get(name, SUM))
+
+def advance_all(stats: Dict[str, Any], today: Optional[date] = None):
+    """Slide every known series' window, evicting raw days past retention"""
+    for name in SERIES_MODES:
+        get_series(stats, name).advance(today)
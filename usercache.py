@@ -0,0 +1,133 @@
+"""User resolution cache for the Prime Network bot"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+import discord
+
+
+class UserCache:
+    """
+    Resolve user IDs to user objects with as few HTTP calls as possible
+
+    Lookup order:
+        1. Gateway cache (bot.get_user, then guild members)
+        2. Bounded LRU with per-entry TTL
+        3. bot.fetch_user (concurrent lookups for one ID share a single request)
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[float, discord.User]]" = OrderedDict()
+        self._inflight: Dict[int, asyncio.Task] = {}
+
+        # Metrics
+        self.gateway_hits = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.failures = 0
+
+    def _from_gateway(self, bot, user_id: int) -> Optional[discord.abc.User]:
+        """Check the gateway caches without touching the network"""
+        user = bot.get_user(user_id)
+        if user:
+            return user
+        for guild in bot.guilds:
+            member = guild.get_member(user_id)
+            if member:
+                return member
+        return None
+
+    def _from_cache(self, user_id: int) -> Optional[discord.User]:
+        """Return a fresh cached entry, evicting it if expired"""
+        entry = self._entries.get(user_id)
+        if not entry:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    def _store(self, user_id: int, user: discord.User):
+        """Insert into the LRU, evicting the least recently used entry when full"""
+        self._entries[user_id] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, bot, user_id: int) -> Optional[discord.User]:
+        """Fetch a user over HTTP and cache the result"""
+        self.fetches += 1
+        try:
+            user = await bot.fetch_user(user_id)
+        except (discord.NotFound, discord.HTTPException):
+            self.failures += 1
+            return None
+        self._store(user_id, user)
+        return user
+
+    async def resolve(self, bot, user_id: int) -> Optional[discord.abc.User]:
+        """
+        Resolve a user ID
+
+        Args:
+            bot: Bot instance used for gateway lookups and HTTP fallback
+            user_id: Discord user ID
+
+        Returns:
+            User or Member object, or None if the user could not be fetched
+        """
+        user = self._from_gateway(bot, user_id)
+        if user:
+            self.gateway_hits += 1
+            return user
+
+        user = self._from_cache(user_id)
+        if user:
+            self.cache_hits += 1
+            return user
+
+        # Coalesce concurrent lookups for the same ID. The fetch runs as its
+        # own task so no single caller owns it: a cancelled caller stops
+        # waiting without cancelling the others.
+        task = self._inflight.get(user_id)
+        if task:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(self._fetch(bot, user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda done: self._finished(user_id, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, user_id: int, task: asyncio.Task):
+        if self._inflight.get(user_id) is task:
+            del self._inflight[user_id]
+        if not task.cancelled():
+            # Mark retrieved so a fetch every caller abandoned doesn't log a warning
+            task.exception()
+
+    def invalidate(self, user_id: int):
+        """Drop a cached user"""
+        self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss metrics"""
+        lookups = self.gateway_hits + self.cache_hits + self.coalesced + self.fetches
+        hits = lookups - self.fetches
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "lookups": lookups,
+            "gateway_hits": self.gateway_hits,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "misses": self.fetches,
+            "failures": self.failures,
+            "hit_rate": (hits / lookups * 100) if lookups else 0.0
+        }
@@ -0,0 +1,58 @@
+"""Shared wake-on-demand worker pool for the Prime Network bot's background queues"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class WorkerPool(ABC):
+    """
+    Base for in-memory queues drained by a fixed pool of worker tasks
+
+    Workers sleep on a single event while the queue is empty and pause
+    `delay` seconds between items. Subclasses call wake() after enqueueing
+    and implement _has_work() and _process_one(), which pops and handles
+    exactly one item.
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.concurrency = concurrency
+        self.delay = delay
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    @abstractmethod
+    def _has_work(self) -> bool:
+        """Whether any item is waiting"""
+
+    @abstractmethod
+    async def _process_one(self):
+        """Pop and handle exactly one item"""
+
+    def wake(self):
+        """Wake idle workers (no-op before start())"""
+        if self._wakeup:
+            self._wakeup.set()
+
+    def start(self):
+        """Start worker tasks (safe to call more than once)"""
+        if self._workers and not all(worker.done() for worker in self._workers):
+            return
+        self._wakeup = asyncio.Event()
+        if self._has_work():
+            self._wakeup.set()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def _worker(self):
+        while True:
+            if not self._has_work():
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                await self._process_one()
+            except Exception as e:
+                # Subclasses handle expected failures; never let a worker die
+                print(f"{type(self).__name__} worker error: {e}")
+            await asyncio.sleep(self.delay)